@@ -1,6 +1,10 @@
 import google.generativeai as genai
+from google.ai import generativelanguage as glm
 from AI.api_load import load_api
-from AI.api_key_manager import get_api_key_manager
+from AI.api_key_manager import PRIORITY_BATCH, get_api_key_manager
+from AI.extraction_cache import extraction_cache_key, get_extraction_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
 import time
 import streamlit as st
 import logging
@@ -11,6 +15,40 @@ logger = logging.getLogger('api_operation')
 
 # Define o modelo de IA como uma constante para garantir consistência
 GEMINI_MODEL = 'gemini-1.5-pro-latest'
+# O Gemini cobra 258 tokens por página de PDF; texto conta ~4 caracteres por token
+PDF_PAGE_TOKENS = 258
+PDF_PAGE_PATTERN = re.compile(rb"/Type\s*/Page(?!s)")
+
+# Um modelo por chave: genai.configure é global ao processo, então as extrações
+# paralelas não podem depender dele para escolher a chave de cada requisição
+_key_models = {}
+_key_models_lock = threading.Lock()
+
+
+def _model_for_key(api_key: str):
+    """Retorna o GenerativeModel da chave, criado no primeiro uso e reaproveitado depois."""
+    with _key_models_lock:
+        model = _key_models.get(api_key)
+        if model is None:
+            model = genai.GenerativeModel(GEMINI_MODEL)
+            # _client é privado no SDK: o GenerativeModel só cria o cliente padrão se for None.
+            # Conferido no google-generativeai 0.8.x, versão fixada no requirements.txt
+            model._client = glm.GenerativeServiceClient(client_options={"api_key": api_key})
+            _key_models[api_key] = model
+        return model
+
+
+def _estimate_tokens(pdf_bytes_list, text):
+    """Estimativa de tokens da requisição, descontada do TPM da chave antes do envio."""
+    pages = sum(max(1, len(PDF_PAGE_PATTERN.findall(pdf_bytes))) for pdf_bytes in pdf_bytes_list)
+    return pages * PDF_PAGE_TOKENS + len(text) // 4
+
+
+def _response_tokens(response):
+    """Tokens efetivamente usados, quando a resposta informa (usage_metadata)."""
+    usage = getattr(response, "usage_metadata", None)
+    return getattr(usage, "total_token_count", 0) or 0
+
 
 class PDFQA:
     def __init__(self):
@@ -31,26 +69,29 @@ class PDFQA:
         max_retries = self.key_manager.max_retries
         retry_delay = self.key_manager.retry_delay
 
+        pdf_bytes_list = []
+        for pdf_file in pdf_files:
+            pdf_bytes_list.append(pdf_file.read())
+            pdf_file.seek(0)
+        estimated_tokens = _estimate_tokens(pdf_bytes_list, question)
+
         for attempt in range(max_retries):
             current_key = None
             try:
-                # 1. Obter a chave ANTES de usar
-                current_key = self.key_manager.get_next_key()
+                # 1. Obter a chave ANTES de usar (respeitando os limites de RPM/TPM)
+                current_key = self.key_manager.acquire_key(estimated_tokens)
                 if not current_key:
                     st.error("❌ Nenhuma chave de API disponível para a tentativa.")
                     break # Sai do loop se não houver chaves
 
-                # 2. Configurar a API com a chave específica
-                load_api(specific_key=current_key)
-                self.model = genai.GenerativeModel(GEMINI_MODEL)
+                # 2. Modelo da chave específica (criado uma vez por chave)
+                self.model = _model_for_key(current_key)
 
                 # Lógica da requisição (mantida)
                 progress_bar = st.progress(0, text=f"Tentativa {attempt + 1}/{max_retries}...")
                 inputs = []
                 progress_bar.progress(20, text="Processando arquivos...")
-                for pdf_file in pdf_files:
-                    pdf_bytes = pdf_file.read()
-                    pdf_file.seek(0)
+                for pdf_bytes in pdf_bytes_list:
                     part = {"mime_type": "application/pdf", "data": pdf_bytes}
                     inputs.append(part)
                 progress_bar.progress(40, text="Preparando a pergunta...")
@@ -62,6 +103,7 @@ class PDFQA:
 
                 # 3. Sucesso! Reportar na chave correta
                 self.key_manager.report_key_success(current_key)
+                self.key_manager.record_token_usage(current_key, estimated_tokens, _response_tokens(response))
                 st.success("✅ Resposta gerada com sucesso!")
                 return response.text
 
@@ -85,36 +127,43 @@ class PDFQA:
 
     def extract_structured_data(self, pdf_file, prompt):
         """Extrai dados estruturados com a mesma lógica de retry e rotação de chaves."""
+        pdf_bytes = pdf_file.read()
+        pdf_file.seek(0)
+
+        # Mesmo PDF + mesmo prompt já analisado: devolve o resultado sem chamar a IA
+        cache_key = extraction_cache_key(pdf_bytes, prompt, GEMINI_MODEL)
+        cached_data = get_extraction_cache().get(cache_key)
+        if cached_data is not None:
+            st.success(f"✅ Dados de '{pdf_file.name}' recuperados de uma análise anterior!")
+            return cached_data
+
         max_retries = self.key_manager.max_retries
         retry_delay = self.key_manager.retry_delay
+        estimated_tokens = _estimate_tokens([pdf_bytes], prompt)
 
         for attempt in range(max_retries):
             current_key = None
             try:
                 with st.spinner(f"🤖 Analisando '{pdf_file.name}' com IA (tentativa {attempt + 1})..."):
-                    # 1. Obter a chave ANTES de usar
-                    current_key = self.key_manager.get_next_key()
+                    # 1. Obter a chave ANTES de usar (respeitando os limites de RPM/TPM)
+                    current_key = self.key_manager.acquire_key(estimated_tokens)
                     if not current_key:
                         st.error("❌ Nenhuma chave de API disponível.")
                         break
 
-                    # 2. Configurar a API com a chave específica
-                    load_api(specific_key=current_key)
-                    self.model = genai.GenerativeModel(GEMINI_MODEL)
+                    # 2. Modelo da chave específica (criado uma vez por chave)
+                    self.model = _model_for_key(current_key)
 
                     # Lógica da requisição
-                    pdf_bytes = pdf_file.read()
-                    pdf_file.seek(0)
-                    part_pdf = {"mime_type": "application/pdf", "data": pdf_bytes}
-                    generation_config = genai.types.GenerationConfig(response_mime_type="application/json")
-                    
-                    response = self.model.generate_content([prompt, part_pdf], generation_config=generation_config)
+                    response = self._generate_json(self.model, pdf_bytes, prompt)
                     
                     cleaned_response = self._clean_json_string(response.text)
                     extracted_data = json.loads(cleaned_response)
 
                     # 3. Sucesso! Reportar na chave correta
                     self.key_manager.report_key_success(current_key)
+                    self.key_manager.record_token_usage(current_key, estimated_tokens, _response_tokens(response))
+                    get_extraction_cache().set(cache_key, extracted_data)
                     st.success(f"✅ Dados extraídos com sucesso de '{pdf_file.name}'!")
                     return extracted_data
 
@@ -144,6 +193,111 @@ class PDFQA:
                     return None
         return None
 
+    def _generate_json(self, model, pdf_bytes, prompt):
+        """Envia o PDF e o prompt ao modelo pedindo resposta em JSON."""
+        part_pdf = {"mime_type": "application/pdf", "data": pdf_bytes}
+        generation_config = genai.types.GenerationConfig(response_mime_type="application/json")
+        return model.generate_content([prompt, part_pdf], generation_config=generation_config)
+
+    def _extract_one(self, file_name, pdf_bytes, prompt):
+        """
+        Extração de um PDF dentro de uma thread do lote (sem chamadas ao Streamlit).
+
+        Returns:
+            Tupla (dados extraídos ou None, mensagem de erro ou None)
+        """
+        cache_key = extraction_cache_key(pdf_bytes, prompt, GEMINI_MODEL)
+        cached_data = get_extraction_cache().get(cache_key)
+        if cached_data is not None:
+            return cached_data, None
+
+        max_retries = self.key_manager.max_retries
+        estimated_tokens = _estimate_tokens([pdf_bytes], prompt)
+        error_msg = None
+
+        for attempt in range(max_retries):
+            # Lote entra na fila atrás das análises pedidas na tela
+            current_key = self.key_manager.acquire_key(estimated_tokens, priority=PRIORITY_BATCH)
+            if not current_key:
+                return None, "Nenhuma chave de API disponível"
+
+            try:
+                response = self._generate_json(_model_for_key(current_key), pdf_bytes, prompt)
+            except Exception as e:
+                error_msg = str(e)
+                logger.error(f"'{file_name}': tentativa {attempt + 1}/{max_retries} com a chave {self.key_manager._mask_key(current_key)} falhou: {error_msg}")
+                # Sem espera: a próxima tentativa já sai com outra chave (as com rate limit ficam em cooldown)
+                self.key_manager.report_key_failure(current_key, error_msg)
+                continue
+
+            self.key_manager.report_key_success(current_key)
+            self.key_manager.record_token_usage(current_key, estimated_tokens, _response_tokens(response))
+            try:
+                extracted_data = json.loads(self._clean_json_string(response.text))
+            except json.JSONDecodeError as je:
+                # A requisição funcionou; repetir não muda a resposta
+                return None, f"A IA não retornou um JSON válido: {je}"
+            get_extraction_cache().set(cache_key, extracted_data)
+            return extracted_data, None
+
+        return None, f"Falha após {max_retries} tentativas: {error_msg}"
+
+    def extract_structured_data_many(self, pdf_files, prompt, on_result=None):
+        """
+        Extrai dados estruturados de vários PDFs em paralelo, com uma thread por
+        chave de API disponível (o lote leva aproximadamente o tempo do PDF mais lento).
+
+        Args:
+            pdf_files: Lista de arquivos PDF (UploadedFile do Streamlit)
+            prompt: Prompt de extração aplicado a todos os arquivos
+            on_result: Função opcional chamada com (arquivo, dados, erro) à medida
+                que cada PDF termina, na thread de quem chamou
+
+        Returns:
+            Lista com os dados extraídos (ou None) na mesma ordem de pdf_files
+        """
+        if not pdf_files:
+            return []
+        if not self.api_available or not self.key_manager:
+            st.error("❌ API de IA não disponível.")
+            return [None] * len(pdf_files)
+
+        # Os uploads são lidos aqui: UploadedFile não deve ser compartilhado entre threads
+        contents = []
+        for pdf_file in pdf_files:
+            contents.append(pdf_file.read())
+            pdf_file.seek(0)
+
+        stats = self.key_manager.get_statistics()
+        max_workers = max(1, min(len(pdf_files), stats['available_keys']))
+        results = [None] * len(pdf_files)
+        failures = 0
+
+        progress_bar = st.progress(0, text=f"🤖 Analisando {len(pdf_files)} arquivos com IA ({max_workers} em paralelo)...")
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pdfqa") as executor:
+            futures = {
+                executor.submit(self._extract_one, pdf_file.name, content, prompt): index
+                for index, (pdf_file, content) in enumerate(zip(pdf_files, contents))
+            }
+            for completed, future in enumerate(as_completed(futures), start=1):
+                index = futures[future]
+                data, error = future.result()
+                results[index] = data
+                if error:
+                    failures += 1
+                    logger.error(f"❌ Extração de '{pdf_files[index].name}' falhou: {error}")
+                if on_result:
+                    on_result(pdf_files[index], data, error)
+                progress_bar.progress(completed / len(pdf_files),
+                                      text=f"🤖 {completed}/{len(pdf_files)} arquivos analisados...")
+
+        progress_bar.empty()
+        if failures:
+            st.warning(f"⚠️ {failures} de {len(pdf_files)} arquivos não puderam ser analisados.")
+        else:
+            st.success(f"✅ Dados extraídos com sucesso de {len(pdf_files)} arquivos!")
+        return results
+
     def _clean_json_string(self, text):
         """Limpa o texto da resposta da IA para extrair apenas o JSON."""
         # Procura por um bloco de código JSON, com ou sem a tag 'json'
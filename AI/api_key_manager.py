@@ -1,13 +1,64 @@
 import streamlit as st
+import asyncio
+import heapq
+import itertools
 import logging
 import time
 import random
+import threading
 from typing import List
 from datetime import datetime, timedelta
 from collections import defaultdict
 
+from AI.key_state import create_key_state_backend, key_state_id
+
 logger = logging.getLogger(__name__)
 
+# Prioridade na fila de espera por chave (menor é atendido primeiro): análises
+# pedidas na tela passam à frente das extrações em lote
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 1
+# Limites padrão por chave quando gemini_config não define requests/tokens_per_minute
+DEFAULT_REQUESTS_PER_MINUTE = 15
+DEFAULT_TOKENS_PER_MINUTE = 1_000_000
+MAX_KEY_WAIT_SECONDS = 60
+ASYNC_POLL_SECONDS = 0.5
+# Intervalo mínimo entre leituras do estado compartilhado (cooldowns vistos por outros processos)
+STATE_SYNC_INTERVAL_SECONDS = 5
+
+
+class TokenBucket:
+    """Balde de tokens: capacidade de um minuto de uso, reabastecido continuamente."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.refill_per_second = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_per_second)
+        self.updated_at = now
+
+    def available(self, now: float) -> float:
+        """Saldo atual do balde."""
+        self._refill(now)
+        return self.tokens
+
+    def seconds_until(self, amount: float, now: float) -> float:
+        """Tempo até haver amount tokens (pedidos maiores que a capacidade esperam o balde cheio)."""
+        self._refill(now)
+        missing = min(amount, self.capacity) - self.tokens
+        return max(0.0, missing / self.refill_per_second)
+
+    def consume(self, amount: float, now: float):
+        self._refill(now)
+        self.tokens -= min(amount, self.capacity)
+
+    def adjust(self, amount: float):
+        """Corrige o consumo estimado pelo real (pode deixar o saldo negativo)."""
+        self.tokens = min(self.capacity, self.tokens - amount)
+
 
 class APIKeyManager:
     """Gerenciador inteligente de múltiplas chaves API do Gemini"""
@@ -19,6 +70,12 @@ class APIKeyManager:
         self.key_failures = defaultdict(int)
         self.key_last_used = {}
         self.key_cooldown = {}  # Chaves em cooldown por rate limit
+        self.key_tokens_used = defaultdict(int)
+        # Extrações em lote (PDFQA.extract_structured_data_many) usam o gerenciador em várias threads
+        self._lock = threading.RLock()
+        self._condition = threading.Condition(self._lock)
+        self._queue = []  # heap de (prioridade, ordem de chegada) aguardando chave
+        self._queue_counter = itertools.count()
 
         self.max_retries = st.secrets.get(
             "gemini_config", {}).get("max_retries", 3)
@@ -26,9 +83,26 @@ class APIKeyManager:
             "gemini_config", {}).get("retry_delay_seconds", 2)
         self.rotation_strategy = st.secrets.get(
             "gemini_config", {}).get("rotation_strategy", "round_robin")
-
-        logger.info(f"APIKeyManager inicializado com {len(self.keys)} chaves")
-        logger.info(f"Estratégia de rotação: {self.rotation_strategy}")
+        self.requests_per_minute = st.secrets.get(
+            "gemini_config", {}).get("requests_per_minute", DEFAULT_REQUESTS_PER_MINUTE)
+        self.tokens_per_minute = st.secrets.get(
+            "gemini_config", {}).get("tokens_per_minute", DEFAULT_TOKENS_PER_MINUTE)
+
+        # Usos, falhas e cooldowns compartilhados com os outros processos/réplicas
+        self.state_backend = create_key_state_backend(st.secrets.get(
+            "gemini_config", {}).get("state_backend", "sqlite"))
+        self._key_ids = {key: key_state_id(key) for key in self.keys}
+        self._last_state_sync = 0.0
+        self._sync_shared_state(force=True)
+
+        # Limites aplicados antes de cada requisição, para não chegar ao 429
+        self.request_buckets = {key: TokenBucket(self.requests_per_minute) for key in self.keys}
+        self.token_buckets = {key: TokenBucket(self.tokens_per_minute) for key in self.keys}
+
+        logger.info(f"APIKeyManager inicializado com {len(self.keys)} chaves "
+                    f"(estado compartilhado: {self.state_backend.name})")
+        logger.info(f"Estratégia de rotação: {self.rotation_strategy} "
+                    f"({self.requests_per_minute} RPM / {self.tokens_per_minute} TPM por chave)")
 
     def _load_api_keys(self) -> List[str]:
         """Carrega todas as chaves API disponíveis"""
@@ -64,12 +138,142 @@ class APIKeyManager:
 
     def get_next_key(self) -> str:
         """Obtém a próxima chave disponível baseada na estratégia"""
-        
-        # Se não há chaves configuradas, retorna None
+        return self.acquire_key()
+
+    def acquire_key(self, estimated_tokens: int = 0, priority: int = PRIORITY_INTERACTIVE,
+                    timeout: float = MAX_KEY_WAIT_SECONDS) -> str:
+        """
+        Obtém uma chave com cota para a requisição, aguardando na fila de prioridade
+        se todas estiverem no limite ou em cooldown.
+
+        Args:
+            estimated_tokens: Tokens estimados da requisição (descontados do TPM da chave)
+            priority: PRIORITY_INTERACTIVE ou PRIORITY_BATCH
+            timeout: Espera máxima em segundos
+
+        Returns:
+            A chave, ou None se nenhuma ficar disponível dentro do timeout
+        """
         if not self.keys:
             return None
 
-        # Remove chaves em cooldown que já expiraram
+        self._sync_shared_state()
+        key = self._wait_for_key(estimated_tokens, priority, timeout)
+        if key:
+            self._record_usage(key, requests=1, tokens=estimated_tokens)
+        return key
+
+    def _wait_for_key(self, estimated_tokens: int, priority: int, timeout: float) -> str:
+        """Aguarda a vez na fila de prioridade e seleciona a chave"""
+        ticket = (priority, next(self._queue_counter))
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            heapq.heappush(self._queue, ticket)
+            try:
+                while True:
+                    wait_time = None
+                    if self._queue[0] == ticket:
+                        key = self._select_key(estimated_tokens)
+                        if key:
+                            return key
+                        wait_time = self._seconds_until_available(estimated_tokens)
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        logger.warning("Nenhuma chave com cota disponível dentro do tempo de espera")
+                        return None
+                    # Só o primeiro da fila espera pelo reabastecimento; os demais aguardam a vez
+                    self._condition.wait(min(remaining, wait_time) if wait_time is not None else remaining)
+            finally:
+                self._leave_queue(ticket)
+
+    def try_acquire_key(self, estimated_tokens: int = 0) -> str:
+        """Obtém uma chave sem esperar; None se não houver cota agora ou se houver fila."""
+        self._sync_shared_state()
+        with self._lock:
+            if self._queue:
+                return None
+            key = self._select_key(estimated_tokens)
+        if key:
+            self._record_usage(key, requests=1, tokens=estimated_tokens)
+        return key
+
+    async def acquire_key_async(self, estimated_tokens: int = 0, priority: int = PRIORITY_INTERACTIVE,
+                                timeout: float = MAX_KEY_WAIT_SECONDS) -> str:
+        """Versão assíncrona de acquire_key: aguarda a vez sem bloquear o event loop."""
+        if not self.keys:
+            return None
+
+        await asyncio.to_thread(self._sync_shared_state)
+        key = await self._wait_for_key_async(estimated_tokens, priority, timeout)
+        if key:
+            await asyncio.to_thread(self._record_usage, key, 1, estimated_tokens)
+        return key
+
+    async def _wait_for_key_async(self, estimated_tokens: int, priority: int, timeout: float) -> str:
+        """Aguarda a vez na fila de prioridade sem bloquear o event loop e seleciona a chave"""
+        ticket = (priority, next(self._queue_counter))
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            heapq.heappush(self._queue, ticket)
+        try:
+            while True:
+                wait_time = ASYNC_POLL_SECONDS
+                with self._lock:
+                    if self._queue[0] == ticket:
+                        key = self._select_key(estimated_tokens)
+                        if key:
+                            return key
+                        wait_time = min(wait_time, self._seconds_until_available(estimated_tokens))
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning("Nenhuma chave com cota disponível dentro do tempo de espera")
+                    return None
+                await asyncio.sleep(max(0.01, min(remaining, wait_time)))
+        finally:
+            with self._condition:
+                self._leave_queue(ticket)
+
+    def _leave_queue(self, ticket: tuple):
+        """Remove o pedido da fila e acorda os demais (chamado com o lock adquirido)"""
+        self._queue.remove(ticket)
+        heapq.heapify(self._queue)
+        self._condition.notify_all()
+
+    def _sync_shared_state(self, force: bool = False):
+        """Atualiza contadores e cooldowns com o estado gravado pelos outros processos"""
+        if not force and time.monotonic() - self._last_state_sync < STATE_SYNC_INTERVAL_SECONDS:
+            return
+        self._last_state_sync = time.monotonic()
+        shared_state = self.state_backend.load()
+
+        now = time.time()
+        with self._lock:
+            for key, key_id in self._key_ids.items():
+                state = shared_state.get(key_id)
+                if not state:
+                    continue
+                self.key_usage_count[key] = state["usage_count"]
+                self.key_failures[key] = state["failure_count"]
+                self.key_tokens_used[key] = state["tokens_used"]
+                if state["cooldown_until"] > now:
+                    cooldown_until = datetime.fromtimestamp(state["cooldown_until"])
+                    if key not in self.key_cooldown or self.key_cooldown[key] < cooldown_until:
+                        self.key_cooldown[key] = cooldown_until
+                        logger.info(f"Chave em cooldown registrado por outro processo: {self._mask_key(key)}")
+                elif key in self.key_cooldown and self.key_cooldown[key].timestamp() > now:
+                    # Cooldown local ainda ativo, mas removido do estado compartilhado (clear_cooldowns)
+                    del self.key_cooldown[key]
+                    self._condition.notify_all()
+                    logger.info(f"Cooldown removido por outro processo: {self._mask_key(key)}")
+
+    def _record_usage(self, key: str, requests: int = 0, tokens: int = 0, failures: int = 0):
+        """Grava a alteração no estado compartilhado (fora do lock: o backend pode ser remoto)"""
+        self.state_backend.record_usage(self._key_ids[key], requests=requests, tokens=tokens, failures=failures)
+
+    def _release_expired_cooldowns(self):
+        """Remove chaves em cooldown que já expiraram"""
         current_time = datetime.now()
         expired_cooldowns = [
             key for key, cooldown_until in self.key_cooldown.items()
@@ -79,17 +283,32 @@ class APIKeyManager:
             del self.key_cooldown[key]
             logger.info(f"Chave saiu do cooldown: {self._mask_key(key)}")
 
-        # Filtra chaves disponíveis (não em cooldown)
-        available_keys = [k for k in self.keys if k not in self.key_cooldown]
-
+    def _seconds_until_available(self, estimated_tokens: int) -> float:
+        """Tempo até alguma chave ter cota para a requisição (chamado com o lock adquirido)"""
+        now = time.monotonic()
+        waits = []
+        for key in self.keys:
+            if key in self.key_cooldown:
+                waits.append((self.key_cooldown[key] - datetime.now()).total_seconds())
+            else:
+                waits.append(max(self.request_buckets[key].seconds_until(1, now),
+                                 self.token_buckets[key].seconds_until(estimated_tokens, now)))
+        return max(0.01, min(waits))
+
+    def _select_key(self, estimated_tokens: int = 0) -> str:
+        """Seleção da chave com cota disponível; chamado com o lock adquirido"""
+        self._release_expired_cooldowns()
+
+        # Filtra chaves disponíveis (fora de cooldown e com cota de RPM/TPM)
+        now = time.monotonic()
+        available_keys = [
+            k for k in self.keys
+            if k not in self.key_cooldown
+            and self.request_buckets[k].seconds_until(1, now) == 0
+            and self.token_buckets[k].seconds_until(estimated_tokens, now) == 0
+        ]
         if not available_keys:
-            logger.warning("Todas as chaves estão em cooldown! Aguardando...")
-            # Aguarda a chave mais próxima de sair do cooldown
-            next_available = min(self.key_cooldown.values())
-            wait_time = (next_available - current_time).total_seconds()
-            if wait_time > 0:
-                time.sleep(min(wait_time, 60))  # Max 60s de espera
-            return self.get_next_key()  # Tenta novamente
+            return None
 
         # Seleciona chave baseada na estratégia
         if self.rotation_strategy == "round_robin":
@@ -102,7 +321,10 @@ class APIKeyManager:
             key = available_keys[0]
 
         # Registra uso
+        self.request_buckets[key].consume(1, now)
+        self.token_buckets[key].consume(estimated_tokens, now)
         self.key_usage_count[key] += 1
+        self.key_tokens_used[key] += estimated_tokens
         self.key_last_used[key] = datetime.now()
 
         logger.debug(
@@ -126,7 +348,9 @@ class APIKeyManager:
 
     def report_key_failure(self, key: str, error_message: str):
         """Registra falha de uma chave e coloca em cooldown se necessário"""
-        self.key_failures[key] += 1
+        with self._lock:
+            self.key_failures[key] += 1
+        self._record_usage(key, failures=1)
 
         # Detecta rate limit e coloca em cooldown
         if any(phrase in str(error_message).lower() for phrase in [
@@ -134,7 +358,11 @@ class APIKeyManager:
         ]):
             cooldown_minutes = 5  # Cooldown de 5 minutos
             cooldown_until = datetime.now() + timedelta(minutes=cooldown_minutes)
-            self.key_cooldown[key] = cooldown_until
+            # Outras réplicas deixam de usar a chave no próximo sincronismo. Gravado antes da
+            # cópia local: um sincronismo no meio removeria o cooldown ausente do backend
+            self.state_backend.set_cooldown(self._key_ids[key], cooldown_until.timestamp())
+            with self._lock:
+                self.key_cooldown[key] = cooldown_until
 
             logger.warning(
                 f"⚠️ Chave em cooldown por {cooldown_minutes}min devido a rate limit: "
@@ -145,8 +373,39 @@ class APIKeyManager:
 
     def report_key_success(self, key: str):
         """Registra sucesso de uma chave (limpa contador de falhas)"""
-        if key in self.key_failures:
-            self.key_failures[key] = max(0, self.key_failures[key] - 1)
+        with self._lock:
+            had_failures = self.key_failures.get(key, 0) > 0
+            if key in self.key_failures:
+                self.key_failures[key] = max(0, self.key_failures[key] - 1)
+        if had_failures:
+            self._record_usage(key, failures=-1)
+
+    def record_token_usage(self, key: str, estimated_tokens: int, actual_tokens: int):
+        """Corrige o TPM da chave com os tokens informados na resposta da IA."""
+        if not actual_tokens or key not in self.token_buckets:
+            return
+        with self._lock:
+            self.token_buckets[key].adjust(actual_tokens - estimated_tokens)
+            self.key_tokens_used[key] += actual_tokens - estimated_tokens
+        self._record_usage(key, tokens=actual_tokens - estimated_tokens)
+
+    def reset_statistics(self):
+        """Zera usos, falhas e tokens (local e no estado compartilhado); cooldowns continuam valendo."""
+        with self._lock:
+            self.key_usage_count.clear()
+            self.key_failures.clear()
+            self.key_last_used.clear()
+            self.key_tokens_used.clear()
+        self.state_backend.reset()
+
+    def clear_cooldowns(self):
+        """Remove os cooldowns de todas as chaves (no estado compartilhado e local)."""
+        # Primeiro no backend: senão o próximo sincronismo traria os cooldowns de volta
+        self.state_backend.clear_cooldowns()
+        with self._condition:
+            self.key_cooldown.clear()
+            # Requisições aguardando uma chave podem seguir
+            self._condition.notify_all()
 
     def _mask_key(self, key: str) -> str:
         """Mascara a chave para logs (mostra apenas primeiros e últimos 4 caracteres)"""
@@ -156,14 +415,23 @@ class APIKeyManager:
 
     def get_statistics(self) -> dict:
         """Retorna estatísticas de uso das chaves"""
-        return {
-            "total_keys": len(self.keys),
-            "available_keys": len([k for k in self.keys if k not in self.key_cooldown]),
-            "keys_in_cooldown": len(self.key_cooldown),
-            "usage_count": dict(self.key_usage_count),
-            "failure_count": dict(self.key_failures),
-            "strategy": self.rotation_strategy
-        }
+        with self._lock:
+            now = time.monotonic()
+            return {
+                "total_keys": len(self.keys),
+                "available_keys": len([k for k in self.keys if k not in self.key_cooldown]),
+                "keys_in_cooldown": len(self.key_cooldown),
+                "usage_count": dict(self.key_usage_count),
+                "failure_count": dict(self.key_failures),
+                "tokens_used": dict(self.key_tokens_used),
+                "requests_remaining": {k: int(max(0, b.available(now))) for k, b in self.request_buckets.items()},
+                "tokens_remaining": {k: int(max(0, b.available(now))) for k, b in self.token_buckets.items()},
+                "requests_per_minute": self.requests_per_minute,
+                "tokens_per_minute": self.tokens_per_minute,
+                "pending_requests": len(self._queue),
+                "state_backend": self.state_backend.name,
+                "strategy": self.rotation_strategy
+            }
 
 
 # Instância global (singleton)
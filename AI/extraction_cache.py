@@ -0,0 +1,110 @@
+# AI/extraction_cache.py
+
+"""
+Cache persistente dos dados extraídos dos PDFs pela IA.
+
+A chave é o SHA-256 do PDF + o hash do prompt + o nome do modelo: reenviar o
+mesmo arquivo (ou clicar em "Analisar" de novo após um rerun) devolve o
+resultado anterior sem chamar o Gemini nem consumir cota. Os resultados ficam
+em um arquivo SQLite local e expiram após EXTRACTION_CACHE_TTL_SECONDS.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+EXTRACTION_CACHE_PATH = os.environ.get(
+    "AI_EXTRACTION_CACHE_PATH", os.path.join(tempfile.gettempdir(), "ai_extraction_cache.sqlite3")
+)
+EXTRACTION_CACHE_TTL_SECONDS = int(os.environ.get("AI_EXTRACTION_CACHE_TTL_DAYS", 30)) * 24 * 3600
+SQLITE_TIMEOUT_SECONDS = 5
+
+
+def extraction_cache_key(pdf_bytes: bytes, prompt: str, model_name: str) -> str:
+    """Chave do cache: SHA-256 do PDF + hash do prompt + modelo."""
+    pdf_hash = hashlib.sha256(pdf_bytes).hexdigest()
+    prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    return f"{pdf_hash}:{prompt_hash}:{model_name}"
+
+
+class ExtractionCache:
+    """Resultados de extração em SQLite, com expiração por TTL."""
+
+    def __init__(self, path: str = EXTRACTION_CACHE_PATH, ttl_seconds: int = EXTRACTION_CACHE_TTL_SECONDS):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._initialized = False
+        self._init_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Uma conexão por operação: o cache é usado pelas threads das extrações em lote
+        connection = sqlite3.connect(self.path, timeout=SQLITE_TIMEOUT_SECONDS)
+        with self._init_lock:
+            if not self._initialized:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS extraction_cache ("
+                    " cache_key TEXT PRIMARY KEY,"
+                    " result_json TEXT NOT NULL,"
+                    " created_at REAL NOT NULL)"
+                )
+                # Limpa os resultados vencidos uma vez por processo
+                connection.execute("DELETE FROM extraction_cache WHERE created_at < ?",
+                                   (time.time() - self.ttl_seconds,))
+                connection.commit()
+                self._initialized = True
+        return connection
+
+    def get(self, key: str):
+        """Retorna os dados em cache (novo objeto a cada chamada) ou None."""
+        try:
+            connection = self._connect()
+            try:
+                row = connection.execute(
+                    "SELECT result_json FROM extraction_cache WHERE cache_key = ? AND created_at >= ?",
+                    (key, time.time() - self.ttl_seconds)
+                ).fetchone()
+            finally:
+                connection.close()
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Falha ao ler o cache de extração: {e}")
+            return None
+
+        if row is None:
+            return None
+        logger.info(f"♻️ Extração encontrada no cache: {key[:12]}...")
+        return json.loads(row[0])
+
+    def set(self, key: str, data):
+        """Grava o resultado de uma extração bem-sucedida."""
+        try:
+            connection = self._connect()
+            try:
+                connection.execute(
+                    "INSERT OR REPLACE INTO extraction_cache (cache_key, result_json, created_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(data, ensure_ascii=False), time.time())
+                )
+                connection.commit()
+            finally:
+                connection.close()
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning(f"⚠️ Falha ao gravar o cache de extração: {e}")
+
+
+_extraction_cache: ExtractionCache | None = None
+_extraction_cache_lock = threading.Lock()
+
+
+def get_extraction_cache() -> ExtractionCache:
+    """Retorna o cache de extrações do processo."""
+    global _extraction_cache
+    with _extraction_cache_lock:
+        if _extraction_cache is None:
+            _extraction_cache = ExtractionCache()
+        return _extraction_cache
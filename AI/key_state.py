@@ -0,0 +1,253 @@
+# AI/key_state.py
+
+"""
+Estado compartilhado das chaves do Gemini (usos, falhas, tokens e cooldowns).
+
+O APIKeyManager mantém uma cópia em memória e grava cada alteração no backend
+configurado em gemini_config.state_backend:
+
+- "sqlite" (padrão): arquivo local; os processos do mesmo host compartilham o
+  estado pelo lock de arquivo do SQLite e ele sobrevive a reinícios.
+- "supabase": tabela GEMINI_KEY_STATE_SHEET_NAME; réplicas em hosts diferentes
+  enxergam os cooldowns umas das outras (SQL em doc/supabase-functions.md).
+- "memory": estado apenas do processo (comportamento anterior).
+
+As chaves nunca são gravadas: o backend recebe só um identificador (hash).
+"""
+
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import logging
+
+import streamlit as st
+from postgrest.exceptions import APIError
+
+from config.table_names import GEMINI_KEY_STATE_SHEET_NAME
+
+logger = logging.getLogger(__name__)
+
+KEY_STATE_SQLITE_PATH = os.environ.get(
+    "AI_KEY_STATE_PATH", os.path.join(tempfile.gettempdir(), "gemini_key_state.sqlite3")
+)
+SQLITE_TIMEOUT_SECONDS = 5
+# Função SQL que incrementa os contadores de forma atômica (doc/supabase-functions.md)
+RECORD_KEY_USAGE_RPC = "record_gemini_key_usage"
+# Código do PostgREST para função inexistente (HTTP 404)
+RPC_NOT_FOUND_CODE = "PGRST202"
+
+STATE_FIELDS = ("usage_count", "failure_count", "tokens_used", "cooldown_until")
+
+
+def key_state_id(api_key: str) -> str:
+    """Identificador da chave no backend (a chave em si não é persistida)."""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+def _empty_state() -> dict:
+    return {"usage_count": 0, "failure_count": 0, "tokens_used": 0, "cooldown_until": 0.0}
+
+
+class MemoryKeyStateBackend:
+    """Estado apenas em memória, por processo."""
+
+    name = "memory"
+
+    def __init__(self):
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def load(self) -> dict:
+        with self._lock:
+            return {key_id: dict(state) for key_id, state in self._states.items()}
+
+    def record_usage(self, key_id: str, requests: int = 0, tokens: int = 0, failures: int = 0):
+        with self._lock:
+            state = self._states.setdefault(key_id, _empty_state())
+            state["usage_count"] += requests
+            state["tokens_used"] += tokens
+            state["failure_count"] = max(0, state["failure_count"] + failures)
+
+    def set_cooldown(self, key_id: str, cooldown_until: float):
+        with self._lock:
+            self._states.setdefault(key_id, _empty_state())["cooldown_until"] = cooldown_until
+
+    def reset(self):
+        with self._lock:
+            for state in self._states.values():
+                state.update(usage_count=0, failure_count=0, tokens_used=0)
+
+    def clear_cooldowns(self):
+        with self._lock:
+            for state in self._states.values():
+                state["cooldown_until"] = 0.0
+
+
+class SQLiteKeyStateBackend:
+    """Estado em um arquivo SQLite compartilhado pelos processos do host."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str = KEY_STATE_SQLITE_PATH):
+        self.path = path
+        self._initialized = False
+        self._init_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Uma conexão por operação; o SQLite serializa as escritas com lock de arquivo
+        connection = sqlite3.connect(self.path, timeout=SQLITE_TIMEOUT_SECONDS)
+        with self._init_lock:
+            if not self._initialized:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS key_state ("
+                    " key_id TEXT PRIMARY KEY,"
+                    " usage_count INTEGER NOT NULL DEFAULT 0,"
+                    " failure_count INTEGER NOT NULL DEFAULT 0,"
+                    " tokens_used INTEGER NOT NULL DEFAULT 0,"
+                    " cooldown_until REAL NOT NULL DEFAULT 0)"
+                )
+                connection.commit()
+                self._initialized = True
+        return connection
+
+    def _execute(self, sql: str, params: tuple = ()):
+        try:
+            connection = self._connect()
+            try:
+                rows = connection.execute(sql, params).fetchall()
+                connection.commit()
+                return rows
+            finally:
+                connection.close()
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Falha no estado das chaves (SQLite): {e}")
+            return None
+
+    def load(self) -> dict:
+        rows = self._execute(f"SELECT key_id, {', '.join(STATE_FIELDS)} FROM key_state") or []
+        return {row[0]: dict(zip(STATE_FIELDS, row[1:])) for row in rows}
+
+    def record_usage(self, key_id: str, requests: int = 0, tokens: int = 0, failures: int = 0):
+        # Incremento atômico: o UPSERT roda inteiro sob o lock de escrita do arquivo
+        self._execute(
+            "INSERT INTO key_state (key_id, usage_count, failure_count, tokens_used) VALUES (?, ?, MAX(0, ?), ?) "
+            "ON CONFLICT(key_id) DO UPDATE SET "
+            " usage_count = usage_count + excluded.usage_count,"
+            " failure_count = MAX(0, failure_count + ?),"
+            " tokens_used = tokens_used + excluded.tokens_used",
+            (key_id, requests, failures, tokens, failures)
+        )
+
+    def set_cooldown(self, key_id: str, cooldown_until: float):
+        self._execute(
+            "INSERT INTO key_state (key_id, cooldown_until) VALUES (?, ?) "
+            "ON CONFLICT(key_id) DO UPDATE SET cooldown_until = MAX(cooldown_until, excluded.cooldown_until)",
+            (key_id, cooldown_until)
+        )
+
+    def reset(self):
+        self._execute("UPDATE key_state SET usage_count = 0, failure_count = 0, tokens_used = 0")
+
+    def clear_cooldowns(self):
+        # UPDATE direto: set_cooldown mantém o maior valor e não serve para remover
+        self._execute("UPDATE key_state SET cooldown_until = 0")
+
+
+class SupabaseKeyStateBackend:
+    """Estado na tabela GEMINI_KEY_STATE_SHEET_NAME, compartilhado entre réplicas."""
+
+    name = "supabase"
+
+    def __init__(self):
+        self._rpc_available = True
+
+    def _client(self):
+        # Chamado também nas threads das extrações em lote: usa o cliente do processo, sem sessão
+        from supabase_local.client import get_shared_client
+
+        return get_shared_client(st.secrets["supabase"]["url"], st.secrets["supabase"]["key"])
+
+    def load(self) -> dict:
+        try:
+            response = self._client().table(GEMINI_KEY_STATE_SHEET_NAME).select(
+                f"key_id, {', '.join(STATE_FIELDS)}").execute()
+        except Exception as e:
+            logger.warning(f"⚠️ Falha ao ler o estado das chaves no Supabase: {e}")
+            return {}
+        return {row["key_id"]: {field: row.get(field) or 0 for field in STATE_FIELDS}
+                for row in getattr(response, "data", None) or []}
+
+    def record_usage(self, key_id: str, requests: int = 0, tokens: int = 0, failures: int = 0):
+        try:
+            if self._rpc_available:
+                try:
+                    self._client().rpc(RECORD_KEY_USAGE_RPC, {
+                        "p_key_id": key_id,
+                        "p_requests": requests,
+                        "p_tokens": tokens,
+                        "p_failures": failures
+                    }).execute()
+                    return
+                except APIError as e:
+                    if e.code not in (RPC_NOT_FOUND_CODE, 404):
+                        raise
+                    # Só a ausência da função desativa a RPC; erros de rede/5xx são passageiros
+                    self._rpc_available = False
+                    logger.warning(
+                        f"⚠️ RPC '{RECORD_KEY_USAGE_RPC}' não existe, atualizando o estado sem incremento atômico: {e}")
+
+            # Sem a função: leitura + upsert (incrementos simultâneos de outra réplica podem se perder)
+            response = self._client().table(GEMINI_KEY_STATE_SHEET_NAME).select("*").eq("key_id", key_id).execute()
+            rows = getattr(response, "data", None) or []
+            state = rows[0] if rows else _empty_state()
+            self._client().table(GEMINI_KEY_STATE_SHEET_NAME).upsert({
+                "key_id": key_id,
+                "usage_count": (state.get("usage_count") or 0) + requests,
+                "failure_count": max(0, (state.get("failure_count") or 0) + failures),
+                "tokens_used": (state.get("tokens_used") or 0) + tokens
+            }, on_conflict="key_id").execute()
+        except Exception as e:
+            logger.warning(f"⚠️ Falha ao gravar o uso da chave no Supabase: {e}")
+
+    def set_cooldown(self, key_id: str, cooldown_until: float):
+        try:
+            self._client().table(GEMINI_KEY_STATE_SHEET_NAME).upsert(
+                {"key_id": key_id, "cooldown_until": cooldown_until}, on_conflict="key_id"
+            ).execute()
+        except Exception as e:
+            logger.warning(f"⚠️ Falha ao gravar o cooldown da chave no Supabase: {e}")
+
+    def reset(self):
+        try:
+            self._client().table(GEMINI_KEY_STATE_SHEET_NAME).update(
+                {"usage_count": 0, "failure_count": 0, "tokens_used": 0}
+            ).neq("key_id", "").execute()
+        except Exception as e:
+            logger.warning(f"⚠️ Falha ao resetar o estado das chaves no Supabase: {e}")
+
+    def clear_cooldowns(self):
+        try:
+            self._client().table(GEMINI_KEY_STATE_SHEET_NAME).update(
+                {"cooldown_until": 0}
+            ).neq("key_id", "").execute()
+        except Exception as e:
+            logger.warning(f"⚠️ Falha ao remover os cooldowns das chaves no Supabase: {e}")
+
+
+KEY_STATE_BACKENDS = {
+    "memory": MemoryKeyStateBackend,
+    "sqlite": SQLiteKeyStateBackend,
+    "supabase": SupabaseKeyStateBackend,
+}
+
+
+def create_key_state_backend(name: str = "sqlite"):
+    """Cria o backend de estado configurado; nomes desconhecidos usam o SQLite local."""
+    backend_class = KEY_STATE_BACKENDS.get(str(name).lower())
+    if backend_class is None:
+        logger.warning(f"⚠️ Backend de estado '{name}' desconhecido, usando 'sqlite'")
+        backend_class = SQLiteKeyStateBackend
+    return backend_class()
+
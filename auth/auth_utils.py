@@ -490,12 +490,7 @@ def setup_sidebar():
             return False
     
     # ✅ Armazena user_id na sessão para uso pelo SupabaseClient
-    if st.session_state.get('current_user_id') != user_id:
-        # Só limpa cache se realmente mudou de usuário
-        if st.session_state.get('current_user_id') is not None:
-            st.cache_data.clear()
-            logger.info(f"🔄 Cache limpo para novo usuário: {user_email}")
-    
+    # (o cache de dados é indexado por user_id, não precisa ser limpo na troca de usuário)
     st.session_state['current_user_id'] = user_id
     st.session_state['current_user_email'] = user_email
     
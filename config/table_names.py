@@ -43,6 +43,36 @@ USERS_SHEET_NAME = "usuarios"
 LOG_AUDITORIA_SHEET_NAME = "log_auditoria"
 SOLICITACOES_ACESSO_SHEET_NAME = "solicitacoes_acesso"
 SOLICITACOES_SUPORTE_SHEET_NAME = "solicitacoes_suporte"
+GEMINI_KEY_STATE_SHEET_NAME = "gemini_key_state"
 
 # Storage
 BUCKET_NAME = "evidencias"
+
+# Tabelas de histórico que só recebem inserções (nunca atualizadas/excluídas pelo
+# sistema). Podem ser lidas de forma incremental, buscando apenas os ids novos.
+APPEND_ONLY_TABLES = frozenset({
+    EXTINGUISHER_SHEET_NAME,
+    HOSE_SHEET_NAME,
+    SCBA_SHEET_NAME,
+    INSPECTIONS_SHELTER_SHEET_NAME,
+    SCBA_VISUAL_INSPECTIONS_SHEET_NAME,
+    EYEWASH_INSPECTIONS_SHEET_NAME,
+    FOAM_CHAMBER_INSPECTIONS_SHEET_NAME,
+    MULTIGAS_INSPECTIONS_SHEET_NAME,
+    ALARM_INSPECTIONS_SHEET_NAME,
+    CANHAO_MONITOR_INSPECTIONS_SHEET_NAME,
+    LOG_ACTIONS,
+    LOG_SHELTER_SHEET_NAME,
+    LOG_SCBA_SHEET_NAME,
+    LOG_EYEWASH_SHEET_NAME,
+    LOG_FOAM_CHAMBER_SHEET_NAME,
+    LOG_MULTIGAS_SHEET_NAME,
+    LOG_ALARM_SHEET_NAME,
+    LOG_CANHAO_MONITOR_SHEET_NAME,
+    HOSE_DISPOSAL_LOG_SHEET_NAME,
+    "log_acoes",
+    "log_baixas_extintores",
+    "log_remessa_extintores",
+    "log_remessa_mangueiras",
+    "qualidade_ar_scba",
+})
@@ -213,7 +213,8 @@ def save_inspection(record: dict) -> bool:
 
 def save_inspection_batch(inspections_list: list[dict]) -> tuple[bool, int]:
     """
-    Salva múltiplas inspeções de uma vez (batch), com tratamento de erro individual.
+    Salva múltiplas inspeções de uma vez (batch), em inserções em lote com
+    isolamento de erro por registro.
 
     Returns:
         tuple: (sucesso_geral: bool, quantidade_salva: int)
@@ -222,33 +223,39 @@ def save_inspection_batch(inspections_list: list[dict]) -> tuple[bool, int]:
         return True, 0 # Retorna sucesso se a lista estiver vazia
 
     db_client = get_supabase_client()
-    success_count = 0
-    failed_records = []
 
     progress_bar = st.progress(0, text="Salvando registros...")
     total_records = len(inspections_list)
 
-    for i, inspection in enumerate(inspections_list):
-        try:
-            clean_record = {}
-            for key, value in inspection.items():
-                if pd.isna(value):
-                    clean_record[key] = None
-                elif isinstance(value, (date, pd.Timestamp)):
-                    clean_record[key] = value.isoformat()
-                else:
-                    clean_record[key] = value
-            
-            # Insere um registro de cada vez
-            db_client.append_data("extintores", clean_record)
-            success_count += 1
-        except Exception as e:
-            failed_records.append({
-                'id': inspection.get('numero_identificacao', 'N/A'),
-                'erro': str(e)
-            })
-        
-        progress_bar.progress((i + 1) / total_records, text=f"Salvando {i+1}/{total_records}...")
+    clean_records = []
+    for inspection in inspections_list:
+        clean_record = {}
+        for key, value in inspection.items():
+            if pd.isna(value):
+                clean_record[key] = None
+            elif isinstance(value, (date, pd.Timestamp)):
+                clean_record[key] = value.isoformat()
+            else:
+                clean_record[key] = value
+        clean_records.append(clean_record)
+
+    def update_progress(done, total):
+        progress_bar.progress(done / total, text=f"Salvando {done}/{total}...")
+
+    try:
+        # Insere em lotes; lotes com erro são divididos até isolar os registros inválidos
+        success_count, failed_inserts = db_client.bulk_insert(
+            "extintores", clean_records, on_progress=update_progress)
+        failed_records = [
+            {'id': record.get('numero_identificacao', 'N/A'), 'erro': error}
+            for record, error in failed_inserts
+        ]
+    except Exception as e:
+        success_count = 0
+        failed_records = [
+            {'id': record.get('numero_identificacao', 'N/A'), 'erro': str(e)}
+            for record in clean_records
+        ]
 
     if failed_records:
         st.error(f"Falha ao salvar {len(failed_records)} registro(s).")
@@ -306,6 +313,7 @@ def update_extinguisher_location(equip_id, location_desc):
         # A função `upsert` do Supabase é perfeita para isso.
         record = {'id': str(equip_id), 'local': location_desc}
         db_client.client.table("locais").upsert(record).execute()
+        db_client.invalidate_cache("locais")
 
         log_action("ASSOCIOU_LOCAL_EXTINTOR",
                    f"ID: {equip_id}, Local: {location_desc}")
@@ -1,14 +1,28 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
 from supabase_local import get_supabase_client
+from supabase_local.client import DEFAULT_PAGE_SIZE
+from config.table_names import APPEND_ONLY_TABLES
 import pandas as pd
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+# Leituras simultâneas no pré-carregamento das páginas (load_tables)
+LOAD_TABLES_MAX_WORKERS = 8
 
-@st.cache_data(ttl=300)
-def load_sheet_data(table_name: str) -> pd.DataFrame:
+def load_sheet_data(table_name: str, columns: tuple[str, ...] | None = None) -> pd.DataFrame:
     """
     Carrega dados de uma tabela do Supabase e retorna como DataFrame.
+    A leitura é paginada, então tabelas maiores que o limite do PostgREST
+    são carregadas por completo. O resultado fica no cache do tenant
+    (supabase_local.cache) até expirar ou a tabela ser alterada.
+    Tabelas somente-inserção (APPEND_ONLY_TABLES) são recarregadas de forma
+    incremental, buscando apenas os registros novos.
     
     Args:
         table_name: Nome da tabela no Supabase
+        columns: Colunas a carregar (None = todas). Use tupla para o cache.
         
     Returns:
         DataFrame com os dados da tabela
@@ -26,7 +40,13 @@ def load_sheet_data(table_name: str) -> pd.DataFrame:
             st.error(f"Erro de conexão com o banco de dados para tabela '{table_name}'")
             return pd.DataFrame()
         
-        data = db_client.get_data(table_name)
+        if table_name in APPEND_ONLY_TABLES:
+            loader = lambda: db_client.get_data_incremental(table_name, columns=columns, page_size=DEFAULT_PAGE_SIZE)
+        else:
+            loader = lambda: db_client.get_data(table_name, columns=columns, page_size=DEFAULT_PAGE_SIZE)
+
+        data = db_client.cached_read(
+            table_name, ("get_data", tuple(columns) if columns else None), loader)
         
         if data is not None and not data.empty:
             logger.info(f"✅ Dados carregados: {len(data)} registros da tabela '{table_name}'")
@@ -43,6 +63,101 @@ def load_sheet_data(table_name: str) -> pd.DataFrame:
         return pd.DataFrame()
 
 
+def load_latest_records(table_name: str, key_column: str, date_column: str) -> pd.DataFrame:
+    """
+    Carrega somente o registro mais recente de cada equipamento de uma tabela de histórico.
+    
+    Args:
+        table_name: Nome da tabela no Supabase
+        key_column: Coluna que identifica o equipamento
+        date_column: Coluna de data que define o registro mais recente
+        
+    Returns:
+        DataFrame com um registro por equipamento
+    """
+    import logging
+    logger = logging.getLogger(__name__)
+
+    try:
+        db_client = get_supabase_client()
+
+        if db_client is None:
+            logger.error(f"❌ Cliente Supabase não pôde ser inicializado para tabela '{table_name}'")
+            st.error(f"Erro de conexão com o banco de dados para tabela '{table_name}'")
+            return pd.DataFrame()
+
+        return db_client.cached_read(
+            table_name, ("latest_per_key", key_column, date_column),
+            lambda: db_client.get_latest_per_key(table_name, key_column, date_column))
+
+    except Exception as e:
+        logger.error(f"❌ Erro ao carregar últimos registros da tabela '{table_name}': {e}")
+        st.error(f"Erro ao carregar dados da tabela '{table_name}': {e}")
+        return pd.DataFrame()
+
+
+def load_tables(tables, latest=None, max_workers: int = LOAD_TABLES_MAX_WORKERS) -> dict[str, pd.DataFrame]:
+    """
+    Carrega várias tabelas em paralelo, em uma única rodada de requisições.
+    
+    Args:
+        tables: Nomes de tabela ou tuplas (tabela, colunas), lidos com load_sheet_data
+        latest: Tuplas (tabela, key_column, date_column), lidas com load_latest_records
+        max_workers: Quantidade máxima de leituras simultâneas
+        
+    Returns:
+        Dicionário {nome_da_tabela: DataFrame}
+    """
+    import logging
+    logger = logging.getLogger(__name__)
+
+    jobs = {}
+    for spec in tables:
+        table_name, columns = (spec, None) if isinstance(spec, str) else spec
+        jobs[table_name] = (load_sheet_data, (table_name, columns))
+    for table_name, key_column, date_column in latest or ():
+        jobs[table_name] = (load_latest_records, (table_name, key_column, date_column))
+
+    if not jobs:
+        return {}
+
+    # Resolve cliente e identidade na thread do script, antes de disparar as leituras
+    db_client = get_supabase_client()
+    if db_client is not None:
+        db_client.get_identity()
+
+    # As threads precisam do contexto do script para acessar st.session_state/st.error
+    script_ctx = get_script_run_ctx()
+
+    def run(loader, args):
+        if script_ctx is not None:
+            add_script_run_ctx(threading.current_thread(), script_ctx)
+        return loader(*args)
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs))) as executor:
+        futures = {
+            table_name: executor.submit(run, loader, args)
+            for table_name, (loader, args) in jobs.items()
+        }
+        results = {}
+        for table_name, future in futures.items():
+            try:
+                results[table_name] = future.result()
+            except Exception as e:
+                logger.error(f"❌ Erro ao carregar dados da tabela '{table_name}': {e}")
+                results[table_name] = pd.DataFrame()
+
+    logger.info(f"✅ {len(results)} tabela(s) carregada(s) em paralelo")
+    return results
+
+
+def clear_data_cache():
+    """Limpa os dados em cache do usuário atual (botões de "Recarregar Dados")."""
+    db_client = get_supabase_client()
+    if db_client is not None:
+        db_client.clear_cache()
+
+
 def find_last_record(df: pd.DataFrame, equipment_id: str, id_column: str) -> dict:
     """
     Encontra o último registro de um equipamento específico.
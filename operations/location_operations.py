@@ -172,7 +172,6 @@ def show_location_selector(key_suffix="", required=False, current_value=None):
                     if new_id and new_name:
                         if save_new_location(new_id, new_name):
                             st.success(f"✅ Local '{new_name}' cadastrado!")
-                            st.cache_data.clear()
                             st.rerun()
                     else:
                         st.error("Preencha todos os campos obrigatórios.")
@@ -247,7 +246,6 @@ def show_location_selector(key_suffix="", required=False, current_value=None):
                             st.success(
                                 f"✅ Local '{new_name}' cadastrado com sucesso!")
                             st.session_state[f'show_new_location_form_{key_suffix}'] = False
-                            st.cache_data.clear()
                             st.rerun()
                     else:
                         st.error("❌ Preencha todos os campos obrigatórios.")
@@ -296,7 +294,6 @@ def show_location_management_interface():
                 if new_id and new_name:
                     if save_new_location(new_id, new_name):
                         st.success(f"✅ Local '{new_name}' cadastrado!")
-                        st.cache_data.clear()
                         st.rerun()
                 else:
                     st.error("Preencha todos os campos obrigatórios.")
@@ -345,7 +342,6 @@ def show_location_management_interface():
                         if new_name and new_name != current_name:
                             if update_location(location_to_edit, new_name):
                                 st.success(f"✅ Local atualizado!")
-                                st.cache_data.clear()
                                 st.rerun()
                         elif new_name == current_name:
                             st.info("Nenhuma alteração detectada.")
@@ -369,7 +365,6 @@ def show_location_management_interface():
                 if st.button("🗑️ Remover Local '{}'".format(location_to_delete), type="secondary"):
                     if delete_location(location_to_delete):
                         st.success("✅ Local removido com sucesso!")
-                        st.cache_data.clear()
                         st.rerun()
     else:
         st.info("📍 Nenhum local cadastrado ainda. Use o formulário acima para começar.")
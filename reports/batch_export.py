@@ -0,0 +1,344 @@
+# reports/batch_export.py
+
+"""
+Exportação em lote dos relatórios de um ano inteiro em um arquivo ZIP.
+
+Os relatórios (extintores, abrigos, alarmes, multigás e câmaras de espuma) são
+gerados por unidade com os geradores existentes e convertidos em PDF pelo
+serviço de renderização do processo (get_pdf_render_service), o mesmo pool dos
+demais relatórios. A exportação não bloqueia a sessão: start_export prepara os
+jobs e advance_export, chamado periodicamente por um fragmento da interface,
+envia poucos relatórios por vez ao serviço e grava cada PDF em disco assim que
+fica pronto. O ZIP é montado a partir desses arquivos (finish_export): nenhum
+momento exige todos os PDFs em memória.
+
+A exportação é retomável: os PDFs já gerados ficam na pasta da exportação
+(identificada por ano, relatórios e escopo do usuário), cada um acompanhado do
+hash do HTML que o originou (o mesmo de PDFRenderService.job_id_for). Ao gerar
+de novo, o HTML de cada relatório é montado e o PDF só é reaproveitado se o
+hash for igual; relatórios cujos dados mudaram (mês corrente, unidade editada)
+são renderizados novamente.
+"""
+
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+import zipfile
+import logging
+
+import pandas as pd
+
+from auth.auth_utils import get_user_email, get_user_info, is_superuser
+from config.table_names import (
+    EXTINGUISHER_SHEET_NAME, LOCATIONS_SHEET_NAME, SHELTER_SHEET_NAME,
+    INSPECTIONS_SHELTER_SHEET_NAME, LOG_SHELTER_SHEET_NAME, ALARM_INVENTORY_SHEET_NAME,
+    ALARM_INSPECTIONS_SHEET_NAME, MULTIGAS_INVENTORY_SHEET_NAME, MULTIGAS_INSPECTIONS_SHEET_NAME,
+    FOAM_CHAMBER_INVENTORY_SHEET_NAME, FOAM_CHAMBER_INSPECTIONS_SHEET_NAME, USERS_SHEET_NAME
+)
+from operations.history import load_sheet_data, load_tables
+from reports.pdf_render_service import (
+    JOB_DONE, JOB_FAILED, PDF_RENDER_WORKERS, PDFRenderService, get_pdf_render_service
+)
+
+logger = logging.getLogger(__name__)
+
+BATCH_EXPORT_DIR = os.path.join(tempfile.gettempdir(), "batch_report_exports")
+# PDFs de uma exportação no serviço ao mesmo tempo (limita a memória e não monopoliza a fila)
+BATCH_EXPORT_MAX_IN_FLIGHT = PDF_RENDER_WORKERS * 2
+# Arquivo ao lado de cada PDF com o hash do HTML que o gerou
+PART_HASH_SUFFIX = ".sha256"
+
+# Log de ações usado pelo relatório mensal de extintores (ver monthly_report_ui)
+EXTINGUISHER_ACTION_LOG_SHEET_NAME = "log_acoes"
+
+REPORT_KINDS = {
+    "extintores": "Inspeções Mensais de Extintores",
+    "abrigos": "Status de Abrigos de Emergência",
+    "alarmes": "Inspeções de Sistemas de Alarme",
+    "multigas": "Registro de Bump Test (Multigás)",
+    "camaras_espuma": "Câmaras de Espuma",
+}
+
+REPORT_TABLES = {
+    "extintores": [EXTINGUISHER_SHEET_NAME, EXTINGUISHER_ACTION_LOG_SHEET_NAME, LOCATIONS_SHEET_NAME],
+    "abrigos": [SHELTER_SHEET_NAME, INSPECTIONS_SHELTER_SHEET_NAME, LOG_SHELTER_SHEET_NAME],
+    "alarmes": [ALARM_INSPECTIONS_SHEET_NAME, ALARM_INVENTORY_SHEET_NAME],
+    "multigas": [MULTIGAS_INSPECTIONS_SHEET_NAME, MULTIGAS_INVENTORY_SHEET_NAME],
+    "camaras_espuma": [FOAM_CHAMBER_INSPECTIONS_SHEET_NAME, FOAM_CHAMBER_INVENTORY_SHEET_NAME],
+}
+
+
+def _slugify(text) -> str:
+    return re.sub(r"[^\w\-]+", "_", str(text)).strip("_") or "sem_nome"
+
+
+def _unit_rows(df: pd.DataFrame, user_id) -> pd.DataFrame:
+    """Registros de uma unidade (cópia, pois os geradores alteram o DataFrame)."""
+    if df.empty or 'user_id' not in df.columns:
+        return df.copy()
+    return df[df['user_id'] == user_id].copy()
+
+
+def _in_year(df: pd.DataFrame, date_column: str, year: int) -> pd.DataFrame:
+    """Registros do ano, com a coluna '<date_column>_dt' já convertida."""
+    if df.empty or date_column not in df.columns:
+        return pd.DataFrame()
+    df = df.assign(**{f"{date_column}_dt": pd.to_datetime(df[date_column], errors='coerce')})
+    return df[df[f"{date_column}_dt"].dt.year == year]
+
+
+def _unit_label(user: dict):
+    """Nome exibido da unidade: empresa, nome ou e-mail do usuário (o primeiro preenchido)."""
+    for column in ('empresa', 'nome', 'email'):
+        value = user.get(column)
+        if isinstance(value, str) and value.strip():
+            return value.strip()
+    return None
+
+
+def _resolve_units(data: dict) -> list[tuple]:
+    """
+    Unidades presentes nos dados: [(user_id, nome)].
+    O superuser lê todas as unidades; os demais usuários, somente a própria.
+    """
+    user_ids = set()
+    for df in data.values():
+        if not df.empty and 'user_id' in df.columns:
+            user_ids.update(df['user_id'].dropna().unique().tolist())
+
+    names = {}
+    if is_superuser():
+        users = load_sheet_data(USERS_SHEET_NAME)
+        if not users.empty and 'id' in users.columns:
+            for user in users.to_dict('records'):
+                names[user['id']] = _unit_label(user)
+    else:
+        user_info = get_user_info() or {}
+        if user_info.get('id') is not None:
+            names[user_info['id']] = _unit_label(user_info)
+
+    return [(user_id, names.get(user_id) or f"Unidade {user_id}") for user_id in sorted(user_ids, key=str)]
+
+
+def _iter_unit_jobs(data: dict, user_id, unit_name: str, year: int, kinds) -> list[tuple]:
+    """
+    Relatórios de uma unidade: [(nome do arquivo, gerador)]. O gerador devolve
+    (html, folhas de estilo) e só é chamado quando o PDF é enviado ao pool.
+    """
+    # Importados aqui: os módulos de relatório dependem de componentes da interface
+    from reports.alarm_report import generate_alarm_inspection_html
+    from reports.foam_chamber_report import _get_css_styles, build_foam_chamber_report_html
+    from reports.monthly_report_ui import generate_report_html
+    from reports.multigas_report import generate_bump_test_html
+    from reports.reports_pdf import generate_shelters_html
+
+    folder = f"{_slugify(unit_name)}_{user_id}"
+    jobs = []
+
+    if "extintores" in kinds:
+        inspections = _in_year(_unit_rows(data[EXTINGUISHER_SHEET_NAME], user_id), 'data_servico', year)
+        if not inspections.empty and 'tipo_servico' in inspections.columns:
+            inspections = inspections[inspections['tipo_servico'] == 'Inspeção'].assign(
+                data_servico=lambda df: df['data_servico_dt'])
+            action_log = _unit_rows(data[EXTINGUISHER_ACTION_LOG_SHEET_NAME], user_id)
+            locais = _unit_rows(data[LOCATIONS_SHEET_NAME], user_id)
+            for month, month_df in inspections.groupby(inspections['data_servico_dt'].dt.month):
+                jobs.append((
+                    f"{folder}/extintores/extintores_{year}-{month:02d}.pdf",
+                    lambda month_df=month_df, month=month, action_log=action_log, locais=locais: (
+                        generate_report_html(month_df.sort_values(by='data_servico'), action_log, locais, month, year), ())
+                ))
+
+    if "abrigos" in kinds:
+        shelters = _unit_rows(data[SHELTER_SHEET_NAME], user_id)
+        if not shelters.empty:
+            inspections = _in_year(_unit_rows(data[INSPECTIONS_SHELTER_SHEET_NAME], user_id), 'data_inspecao', year)
+            action_log = _in_year(_unit_rows(data[LOG_SHELTER_SHEET_NAME], user_id), 'data_acao', year)
+            jobs.append((
+                f"{folder}/abrigos/abrigos_{year}.pdf",
+                lambda shelters=shelters, inspections=inspections, action_log=action_log: (
+                    generate_shelters_html(shelters, inspections.copy(), action_log), ())
+            ))
+
+    if "alarmes" in kinds:
+        inspections = _in_year(_unit_rows(data[ALARM_INSPECTIONS_SHEET_NAME], user_id), 'data_inspecao', year)
+        inventory = _unit_rows(data[ALARM_INVENTORY_SHEET_NAME], user_id)
+        if not inspections.empty:
+            for month, month_df in inspections.groupby(inspections['data_inspecao_dt'].dt.month):
+                jobs.append((
+                    f"{folder}/alarmes/alarmes_{year}-{month:02d}.pdf",
+                    lambda month_df=month_df, inventory=inventory: (generate_alarm_inspection_html(
+                        month_df.sort_values(by='data_inspecao_dt'), inventory, unit_name), ())
+                ))
+
+    if "multigas" in kinds:
+        tests = _in_year(_unit_rows(data[MULTIGAS_INSPECTIONS_SHEET_NAME], user_id), 'data_teste', year)
+        inventory = _unit_rows(data[MULTIGAS_INVENTORY_SHEET_NAME], user_id)
+        if not tests.empty and 'tipo_teste' in tests.columns:
+            tests = tests[tests['tipo_teste'] != 'Calibração Anual']
+            for month, month_df in tests.groupby(tests['data_teste_dt'].dt.month):
+                jobs.append((
+                    f"{folder}/multigas/bump_test_{year}-{month:02d}.pdf",
+                    lambda month_df=month_df, inventory=inventory: (generate_bump_test_html(
+                        month_df.sort_values(by='data_teste_dt'), inventory, unit_name), ())
+                ))
+
+    if "camaras_espuma" in kinds:
+        inspections = _in_year(_unit_rows(data[FOAM_CHAMBER_INSPECTIONS_SHEET_NAME], user_id), 'data_inspecao', year)
+        inventory = _unit_rows(data[FOAM_CHAMBER_INVENTORY_SHEET_NAME], user_id)
+        if not inspections.empty:
+            jobs.append((
+                f"{folder}/camaras_espuma/camaras_espuma_{year}.pdf",
+                lambda inspections=inspections, inventory=inventory: (
+                    build_foam_chamber_report_html(inspections.copy(), inventory), (_get_css_styles(),))
+            ))
+
+    return jobs
+
+
+def get_export_dir(year: int, kinds) -> str:
+    """Pasta da exportação (mesmo ano, relatórios e usuário = mesma pasta, para retomar)."""
+    key = f"{get_user_email()}|{year}|{','.join(sorted(kinds))}"
+    return os.path.join(BATCH_EXPORT_DIR, hashlib.sha256(key.encode()).hexdigest()[:24])
+
+
+def discard_export(year: int, kinds):
+    """Remove os PDFs e o ZIP de uma exportação, para gerá-la do zero."""
+    shutil.rmtree(get_export_dir(year, kinds), ignore_errors=True)
+
+
+def _write_atomic(path: str, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as tmp_file:
+        tmp_file.write(data)
+    os.replace(tmp_path, path)
+
+
+def _part_is_current(part_path: str, content_hash: str) -> bool:
+    """True se o PDF já existe e foi gerado a partir do mesmo HTML."""
+    try:
+        with open(part_path + PART_HASH_SUFFIX, encoding="utf-8") as hash_file:
+            return hash_file.read().strip() == content_hash and os.path.exists(part_path)
+    except OSError:
+        return False
+
+
+def _write_part(part_path: str, pdf: bytes, content_hash: str):
+    # O hash é gravado depois do PDF: uma interrupção entre os dois só causa nova renderização
+    _write_atomic(part_path, pdf)
+    _write_atomic(part_path + PART_HASH_SUFFIX, content_hash.encode("utf-8"))
+
+
+def start_export(year: int, kinds=tuple(REPORT_KINDS)) -> dict | None:
+    """
+    Carrega os dados e prepara a exportação dos relatórios do ano de todas as
+    unidades visíveis ao usuário. Nenhum PDF é gerado aqui (ver advance_export).
+
+    Args:
+        year: Ano dos relatórios
+        kinds: Chaves de REPORT_KINDS a exportar
+
+    Returns:
+        Estado da exportação (guardado na sessão) ou None se não houver relatórios
+    """
+    kinds = [kind for kind in REPORT_KINDS if kind in kinds]
+    tables = sorted({table for kind in kinds for table in REPORT_TABLES[kind]})
+    data = load_tables(tables)
+
+    jobs = []
+    for user_id, unit_name in _resolve_units(data):
+        jobs.extend(_iter_unit_jobs(data, user_id, unit_name, year, kinds))
+    if not jobs:
+        return None
+
+    return {
+        "year": year,
+        "names": [name for name, _ in jobs],
+        "parts_dir": os.path.join(get_export_dir(year, kinds), "parts"),
+        "pending": list(reversed(jobs)),
+        # [(id do job no serviço, arquivo, hash do HTML)]
+        "in_flight": [],
+        "completed": 0,
+        "reused": 0,
+        "failures": [],
+        # PDFs atualizados nesta execução; versões antigas de relatórios que falharam ficam fora do ZIP
+        "current_parts": set(),
+    }
+
+
+def advance_export(export: dict) -> bool:
+    """
+    Avança a exportação sem bloquear: grava os PDFs que o serviço concluiu e
+    envia novos relatórios até BATCH_EXPORT_MAX_IN_FLIGHT.
+
+    Returns:
+        True quando todos os relatórios foram processados (ver finish_export)
+    """
+    service = get_pdf_render_service()
+
+    still_running = []
+    for job_id, name, content_hash in export["in_flight"]:
+        status = service.status(job_id)
+        if status["state"] == JOB_DONE:
+            try:
+                _write_part(os.path.join(export["parts_dir"], name), status["pdf"], content_hash)
+                export["completed"] += 1
+                export["current_parts"].add(name)
+            except OSError as e:
+                logger.error(f"❌ Falha ao gravar o PDF '{name}': {e}")
+                export["failures"].append((name, str(e)))
+        elif status["state"] == JOB_FAILED:
+            logger.error(f"❌ Falha ao gerar o PDF '{name}': {status['error']}")
+            export["failures"].append((name, status["error"]))
+            service.discard(job_id)
+        else:
+            still_running.append((job_id, name, content_hash))
+    export["in_flight"] = still_running
+
+    # Monta o HTML só quando há vaga
+    pending = export["pending"]
+    while pending and len(export["in_flight"]) < BATCH_EXPORT_MAX_IN_FLIGHT:
+        name, builder = pending.pop()
+        try:
+            html, stylesheets = builder()
+        except Exception as e:
+            logger.error(f"❌ Falha ao montar o relatório '{name}': {e}")
+            export["failures"].append((name, str(e)))
+            continue
+        if html is None:
+            export["completed"] += 1
+            continue
+        content_hash = PDFRenderService.job_id_for(html, stylesheets)
+        if _part_is_current(os.path.join(export["parts_dir"], name), content_hash):
+            export["completed"] += 1
+            export["reused"] += 1
+            export["current_parts"].add(name)
+            continue
+        export["in_flight"].append((service.submit(html, stylesheets), name, content_hash))
+
+    return not pending and not export["in_flight"]
+
+
+def finish_export(export: dict) -> str:
+    """Monta o ZIP com os PDFs atualizados da exportação e retorna o caminho."""
+    export_dir = os.path.dirname(export["parts_dir"])
+    if export["reused"]:
+        logger.info(f"♻️ Exportação retomada: {export['reused']}/{len(export['names'])} "
+                    f"PDF(s) sem alteração reaproveitados")
+
+    # ZIP montado arquivo a arquivo a partir do disco
+    zip_path = os.path.join(export_dir, f"relatorios_{export['year']}.zip")
+    tmp_zip_path = f"{zip_path}.tmp"
+    os.makedirs(export_dir, exist_ok=True)
+    with zipfile.ZipFile(tmp_zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name in export["names"]:
+            if name in export["current_parts"]:
+                zf.write(os.path.join(export["parts_dir"], name), arcname=name)
+    os.replace(tmp_zip_path, zip_path)
+
+    logger.info(f"📦 Exportação de {export['year']} concluída: {export['completed']}/{len(export['names'])} "
+                f"PDF(s), {len(export['failures'])} falha(s)")
+    return zip_path
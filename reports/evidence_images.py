@@ -0,0 +1,208 @@
+# reports/evidence_images.py
+
+"""
+Imagens de evidência embutidas nos relatórios (base64).
+
+As fotos são baixadas em paralelo, reduzidas para miniatura (JPEG) e guardadas
+em um cache em disco endereçado pelo conteúdo: o hash SHA-256 da imagem original
+identifica a miniatura e um índice liga cada URL ao seu hash. Relatórios
+seguintes reutilizam as miniaturas sem novo download. O cache tem limite de
+tamanho (EVIDENCE_CACHE_DISK_MAX_BYTES): ao ultrapassá-lo, os arquivos
+acessados há mais tempo são removidos, como no storage.image_cache.
+"""
+
+import base64
+import hashlib
+import os
+import tempfile
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from storage.image_processing import encode_image
+
+logger = logging.getLogger(__name__)
+
+EVIDENCE_CACHE_DIR = os.path.join(tempfile.gettempdir(), "evidence_image_cache")
+EVIDENCE_CACHE_DISK_MAX_BYTES = 256 * 1024 * 1024
+# Duas vezes a largura exibida (.evidence-img max-width: 300px), para boa impressão
+THUMBNAIL_MAX_SIZE = (600, 600)
+THUMBNAIL_JPEG_QUALITY = 75
+IMAGE_DOWNLOAD_TIMEOUT = 15
+IMAGE_FETCH_MAX_WORKERS = 8
+
+_thread_local = threading.local()
+
+# Bytes em disco do cache (calculado na primeira gravação do processo)
+_disk_bytes = None
+_disk_lock = threading.Lock()
+
+
+def is_embeddable_image_url(url) -> bool:
+    """Indica se a URL aponta para uma imagem do Storage que pode ser embutida."""
+    return isinstance(url, str) and bool(url.strip()) and 'supabase' in url
+
+
+def _get_session() -> requests.Session:
+    # Uma sessão (keep-alive) por thread de download
+    session = getattr(_thread_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        _thread_local.session = session
+    return session
+
+
+def _url_index_path(url: str) -> str:
+    return os.path.join(EVIDENCE_CACHE_DIR, "urls", hashlib.sha256(url.encode()).hexdigest())
+
+
+def _object_path(digest: str) -> str:
+    return os.path.join(EVIDENCE_CACHE_DIR, "objects", digest)
+
+
+def _write_atomic(path: str, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as tmp_file:
+        tmp_file.write(data)
+    os.replace(tmp_path, path)
+
+
+def _cache_files() -> list:
+    """Miniaturas e entradas do índice (arquivos temporários em gravação ficam de fora)."""
+    entries = []
+    for subdir in ("objects", "urls"):
+        try:
+            entries.extend(entry for entry in os.scandir(os.path.join(EVIDENCE_CACHE_DIR, subdir))
+                           if entry.is_file() and not entry.name.endswith(".tmp"))
+        except OSError:
+            continue
+    return entries
+
+
+def _evict_disk():
+    """Remove os arquivos acessados há mais tempo até ficar em 80% do limite (chamado com _disk_lock)."""
+    global _disk_bytes
+    try:
+        entries = sorted(_cache_files(), key=lambda entry: entry.stat().st_mtime)
+        total = sum(entry.stat().st_size for entry in entries)
+    except OSError:
+        return
+    target = EVIDENCE_CACHE_DISK_MAX_BYTES * 0.8
+    for entry in entries:
+        if total <= target:
+            break
+        try:
+            size = entry.stat().st_size
+            os.remove(entry.path)
+            total -= size
+        except OSError:
+            continue
+    # Índices de miniaturas removidas ficam órfãos e só causam um novo download
+    _disk_bytes = total
+
+
+def _account_disk_write(size: int):
+    global _disk_bytes
+    with _disk_lock:
+        if _disk_bytes is None:
+            try:
+                _disk_bytes = sum(entry.stat().st_size for entry in _cache_files())
+            except OSError:
+                _disk_bytes = 0
+        else:
+            _disk_bytes += size
+        if _disk_bytes > EVIDENCE_CACHE_DISK_MAX_BYTES:
+            _evict_disk()
+
+
+def make_thumbnail(content: bytes, content_type: str) -> tuple[bytes, str]:
+    """
+    Reduz a imagem para THUMBNAIL_MAX_SIZE em JPEG.
+    Conteúdos que o Pillow não abre são devolvidos sem alteração.
+    """
+    try:
+        thumbnail = encode_image(content, max(THUMBNAIL_MAX_SIZE), "JPEG", THUMBNAIL_JPEG_QUALITY)
+        return thumbnail, "image/jpeg"
+    except Exception as e:
+        logger.warning(f"⚠️ Não foi possível gerar miniatura ({content_type}): {e}")
+        return content, content_type
+
+
+def _read_cached(url: str) -> str | None:
+    """Retorna o data URI em cache para a URL, se existir."""
+    try:
+        index_path = _url_index_path(url)
+        with open(index_path, encoding="utf-8") as index_file:
+            digest, content_type = index_file.read().split(" ", 1)
+        object_path = _object_path(digest)
+        with open(object_path, "rb") as object_file:
+            data = object_file.read()
+        # Atualiza a data de acesso: a remoção no disco segue a mais antiga
+        os.utime(index_path)
+        os.utime(object_path)
+    except (OSError, ValueError):
+        return None
+    return f"data:{content_type};base64,{base64.b64encode(data).decode()}"
+
+
+def get_image_as_base64(url):
+    """
+    Baixa uma imagem de uma URL e a converte para o formato base64 (miniatura).
+
+    Returns:
+        Data URI da miniatura, o link original se o download falhar,
+        ou None se a URL não for uma imagem do Storage
+    """
+    if not is_embeddable_image_url(url):
+        return None
+
+    cached = _read_cached(url)
+    if cached is not None:
+        return cached
+
+    try:
+        response = _get_session().get(url, timeout=IMAGE_DOWNLOAD_TIMEOUT)
+        response.raise_for_status()
+    except requests.exceptions.RequestException:
+        # Retorna o link original como fallback se o download falhar
+        return url
+
+    # Determina o tipo de imagem (assumindo jpeg como padrão)
+    content_type = response.headers.get('Content-Type', 'image/jpeg')
+    digest = hashlib.sha256(response.content).hexdigest()
+    object_path = _object_path(digest)
+
+    thumbnail, thumbnail_type = make_thumbnail(response.content, content_type)
+
+    try:
+        # Fotos idênticas (mesmo hash) compartilham o mesmo objeto
+        written = 0
+        if not os.path.exists(object_path):
+            _write_atomic(object_path, thumbnail)
+            written += len(thumbnail)
+        index_entry = f"{digest} {thumbnail_type}".encode()
+        _write_atomic(_url_index_path(url), index_entry)
+        _account_disk_write(written + len(index_entry))
+    except OSError as e:
+        logger.warning(f"⚠️ Falha ao gravar imagem no cache de evidências: {e}")
+
+    return f"data:{thumbnail_type};base64,{base64.b64encode(thumbnail).decode()}"
+
+
+def fetch_images_as_base64(urls, max_workers: int = IMAGE_FETCH_MAX_WORKERS) -> dict:
+    """
+    Converte várias URLs em paralelo.
+
+    Returns:
+        Dicionário {url: resultado de get_image_as_base64}
+    """
+    unique_urls = list(dict.fromkeys(urls))
+    if not unique_urls:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(unique_urls))) as executor:
+        results = executor.map(get_image_as_base64, unique_urls)
+        return dict(zip(unique_urls, results))
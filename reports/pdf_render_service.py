@@ -0,0 +1,237 @@
+# reports/pdf_render_service.py
+
+"""
+Serviço de renderização de PDFs (WeasyPrint) em segundo plano.
+
+Os PDFs são gerados em um pool de processos compartilhado por todas as sessões,
+então a sessão do Streamlit não fica travada e vários tenants podem gerar
+relatórios ao mesmo tempo. Cada job é identificado pelo hash SHA-256 do HTML
+(e das folhas de estilo): pedidos repetidos reutilizam o job em andamento ou
+o PDF já gerado. A interface acompanha o job com show_pdf_render_job().
+"""
+
+import hashlib
+import multiprocessing
+import os
+import threading
+import time
+import logging
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+PDF_RENDER_WORKERS = int(os.environ.get("PDF_RENDER_WORKERS", 2))
+PDF_RESULT_CACHE_MAX_ENTRIES = 32
+PDF_POLL_INTERVAL_SECONDS = 1
+# Jobs com erro não consultados (e não descartados) saem da memória após este tempo
+PDF_FAILED_JOB_TTL_SECONDS = 600
+
+BROKEN_POOL_ERROR = "O processo de geração do PDF foi encerrado inesperadamente. Tente novamente."
+
+# Estados de um job
+JOB_QUEUED = "na_fila"
+JOB_RUNNING = "gerando"
+JOB_DONE = "concluido"
+JOB_FAILED = "erro"
+
+
+def render_pdf(html: str, stylesheets: tuple[str, ...] = ()) -> bytes:
+    """
+    Converte HTML (e folhas de estilo CSS em texto) em bytes de PDF, reutilizando
+    o contexto do processo (fontes, CSS interpretado e assets locais).
+    """
+    from reports.render_context import get_render_context
+
+    return get_render_context().render(html, stylesheets)
+
+
+class PDFRenderService:
+    """Fila de jobs de PDF executados em um pool de processos, com cache dos resultados."""
+
+    def __init__(self, max_workers: int = PDF_RENDER_WORKERS,
+                 cache_max_entries: int = PDF_RESULT_CACHE_MAX_ENTRIES):
+        self.max_workers = max_workers
+        self._executor = self._new_executor()
+        self.cache_max_entries = cache_max_entries
+        self._jobs: dict = {}
+        self._results: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # spawn: o processo do Streamlit tem threads (pool HTTP, auditoria) e não deve ser "forkado"
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def _replace_broken_executor(self, broken_executor: ProcessPoolExecutor):
+        """
+        Recria o pool depois que um worker morreu (OOM, segfault no WeasyPrint).
+
+        Um ProcessPoolExecutor quebrado recusa novos jobs para sempre; os jobs
+        que estavam nele são marcados com erro. Chamado com self._lock adquirido.
+        """
+        if broken_executor is not self._executor:
+            return  # Já recriado por outra chamada
+        logger.error("❌ Processo de renderização de PDF encerrado inesperadamente; recriando o pool")
+        now = time.time()
+        for job in self._jobs.values():
+            if job["executor"] is broken_executor and "error" not in job:
+                job["error"] = BROKEN_POOL_ERROR
+                job["finished_at"] = now
+        broken_executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = self._new_executor()
+
+    def _evict_failed_jobs(self):
+        """Remove jobs com erro mais antigos que PDF_FAILED_JOB_TTL_SECONDS (chamado com self._lock)."""
+        expired_before = time.time() - PDF_FAILED_JOB_TTL_SECONDS
+        for job_id in [job_id for job_id, job in self._jobs.items()
+                       if "error" in job and job["finished_at"] < expired_before]:
+            del self._jobs[job_id]
+
+    @staticmethod
+    def job_id_for(html: str, stylesheets: tuple[str, ...] = ()) -> str:
+        digest = hashlib.sha256(html.encode("utf-8"))
+        for stylesheet in stylesheets:
+            digest.update(b"\0")
+            digest.update(stylesheet.encode("utf-8"))
+        return digest.hexdigest()
+
+    def submit(self, html: str, stylesheets: tuple[str, ...] = ()) -> str:
+        """
+        Enfileira a renderização e retorna o id do job (hash do conteúdo).
+        Se o mesmo conteúdo já foi gerado ou está em andamento, reutiliza o job.
+        """
+        stylesheets = tuple(stylesheets)
+        job_id = self.job_id_for(html, stylesheets)
+
+        with self._lock:
+            self._evict_failed_jobs()
+            if job_id in self._results:
+                self._results.move_to_end(job_id)
+                logger.info(f"⚡ PDF {job_id[:12]} servido do cache")
+                return job_id
+            if job_id in self._jobs:
+                return job_id
+
+            try:
+                future = self._executor.submit(render_pdf, html, stylesheets)
+            except BrokenProcessPool:
+                self._replace_broken_executor(self._executor)
+                future = self._executor.submit(render_pdf, html, stylesheets)
+            self._jobs[job_id] = {"future": future, "executor": self._executor, "submitted_at": time.time()}
+
+        future.add_done_callback(lambda done: self._finish(job_id, done))
+        logger.info(f"🖨️ PDF {job_id[:12]} enfileirado para renderização")
+        return job_id
+
+    def _finish(self, job_id: str, future):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.get("future") is not future:
+                return
+            error = None if future.cancelled() else future.exception()
+            if future.cancelled() or isinstance(error, BrokenProcessPool):
+                self._replace_broken_executor(job["executor"])
+                job.setdefault("error", BROKEN_POOL_ERROR)
+                job.setdefault("finished_at", time.time())
+                return
+            if error is not None:
+                job["error"] = str(error)
+                job["finished_at"] = time.time()
+                logger.error(f"❌ Falha ao gerar PDF {job_id[:12]}: {error}")
+                return
+
+            del self._jobs[job_id]
+            self._results[job_id] = future.result()
+            while len(self._results) > self.cache_max_entries:
+                self._results.popitem(last=False)
+        logger.info(f"✅ PDF {job_id[:12]} gerado em {time.time() - job['submitted_at']:.1f}s")
+
+    def status(self, job_id: str) -> dict:
+        """
+        Situação de um job.
+
+        Returns:
+            Dicionário com 'state', 'progress' (0 a 1), 'pdf' (quando concluído)
+            e 'error' (quando falhou)
+        """
+        with self._lock:
+            self._evict_failed_jobs()
+            if job_id in self._results:
+                return {"state": JOB_DONE, "progress": 1.0, "pdf": self._results[job_id]}
+
+            job = self._jobs.get(job_id)
+            if job is None:
+                return {"state": JOB_FAILED, "progress": 0.0,
+                        "error": "Job não encontrado (expirado). Gere o relatório novamente."}
+            if "error" in job:
+                return {"state": JOB_FAILED, "progress": 0.0, "error": job["error"]}
+
+            elapsed = time.time() - job["submitted_at"]
+            if job["future"].running():
+                # O WeasyPrint não informa progresso; estimativa que se aproxima de 95%
+                return {"state": JOB_RUNNING, "progress": min(0.95, 0.1 + elapsed / 30), "elapsed": elapsed}
+            return {"state": JOB_QUEUED, "progress": 0.05, "elapsed": elapsed}
+
+    def discard(self, job_id: str):
+        """Remove um job com erro, permitindo nova tentativa."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and "error" in job:
+                del self._jobs[job_id]
+
+
+_render_service: PDFRenderService | None = None
+_render_service_lock = threading.Lock()
+
+
+def get_pdf_render_service() -> PDFRenderService:
+    """Retorna o serviço de renderização do processo, criando o pool na primeira chamada."""
+    global _render_service
+    with _render_service_lock:
+        if _render_service is None:
+            _render_service = PDFRenderService()
+        return _render_service
+
+
+def show_pdf_render_job(job_key: str, file_name: str, label: str = "⬇️ Baixar Relatório PDF"):
+    """
+    Exibe o andamento do job guardado em st.session_state[job_key] e, ao concluir,
+    o botão de download. Enquanto o PDF é gerado, apenas este trecho é atualizado.
+    """
+    job_id = st.session_state.get(job_key)
+    if not job_id:
+        return
+
+    service = get_pdf_render_service()
+    status = service.status(job_id)
+
+    if status["state"] == JOB_DONE:
+        st.success("✅ Relatório gerado com sucesso!")
+        st.download_button(
+            label=label,
+            data=status["pdf"],
+            file_name=file_name,
+            mime="application/pdf",
+            use_container_width=True
+        )
+    elif status["state"] == JOB_FAILED:
+        st.error(f"Erro ao gerar PDF: {status['error']}")
+        service.discard(job_id)
+        st.session_state.pop(job_key, None)
+    else:
+        _poll_pdf_render_job(job_id)
+
+
+@st.fragment(run_every=PDF_POLL_INTERVAL_SECONDS)
+def _poll_pdf_render_job(job_id: str):
+    status = get_pdf_render_service().status(job_id)
+    if status["state"] in (JOB_DONE, JOB_FAILED):
+        # Recarrega a página para exibir o resultado fora do fragmento
+        st.rerun()
+
+    text = "Aguardando na fila..." if status["state"] == JOB_QUEUED else "Gerando PDF..."
+    st.progress(status["progress"], text=f"{text} ({status.get('elapsed', 0):.0f}s)")
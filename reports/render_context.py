@@ -0,0 +1,119 @@
+# reports/render_context.py
+
+"""
+Contexto de renderização do WeasyPrint reutilizado entre PDFs.
+
+Cada processo de renderização mantém uma única instância com a configuração
+de fontes, as folhas de estilo já interpretadas (por texto do CSS) e os
+arquivos estáticos já carregados. Imagens do bucket público "assets" do
+Supabase (ex.: logo.png) são lidas da pasta local assets/ do projeto,
+sem download a cada relatório.
+"""
+
+import mimetypes
+import os
+import threading
+import logging
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+ASSETS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'assets'))
+# Prefixo das URLs públicas do bucket de assets servidas a partir de ASSETS_DIR
+PUBLIC_ASSETS_PATH = "/storage/v1/object/public/assets/"
+ASSET_CACHE_MAX_ENTRIES = 64
+STYLESHEET_CACHE_MAX_ENTRIES = 16
+
+
+class PDFRenderContext:
+    """Fontes, CSS interpretado e recursos estáticos compartilhados pelos jobs de um processo."""
+
+    def __init__(self):
+        from weasyprint.text.fonts import FontConfiguration
+
+        self.font_config = FontConfiguration()
+        self._stylesheets: OrderedDict = OrderedDict()
+        self._assets: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def stylesheet(self, css_text: str):
+        """Retorna o CSS interpretado, analisando cada texto apenas uma vez."""
+        from weasyprint import CSS
+
+        with self._lock:
+            css = self._stylesheets.get(css_text)
+            if css is not None:
+                self._stylesheets.move_to_end(css_text)
+                return css
+
+        css = CSS(string=css_text, font_config=self.font_config)
+        with self._lock:
+            self._stylesheets[css_text] = css
+            while len(self._stylesheets) > STYLESHEET_CACHE_MAX_ENTRIES:
+                self._stylesheets.popitem(last=False)
+        return css
+
+    def _local_asset_path(self, url: str) -> str | None:
+        if PUBLIC_ASSETS_PATH not in url:
+            return None
+        file_name = os.path.basename(url.split(PUBLIC_ASSETS_PATH, 1)[1].split("?", 1)[0])
+        path = os.path.join(ASSETS_DIR, file_name)
+        return path if os.path.isfile(path) else None
+
+    def url_fetcher(self, url: str, *args, **kwargs) -> dict:
+        """url_fetcher do WeasyPrint com cache em memória e assets locais."""
+        from weasyprint import default_url_fetcher
+
+        with self._lock:
+            cached = self._assets.get(url)
+            if cached is not None:
+                self._assets.move_to_end(url)
+                return dict(cached)
+
+        local_path = self._local_asset_path(url)
+        if local_path is not None:
+            with open(local_path, "rb") as asset_file:
+                fetched = {
+                    "string": asset_file.read(),
+                    "mime_type": mimetypes.guess_type(local_path)[0] or "application/octet-stream",
+                    "redirected_url": url
+                }
+        else:
+            fetched = default_url_fetcher(url, *args, **kwargs)
+            if "file_obj" in fetched:
+                # Lê o conteúdo para poder reutilizá-lo nos próximos PDFs
+                fetched = dict(fetched)
+                file_obj = fetched.pop("file_obj")
+                fetched["string"] = file_obj.read()
+                file_obj.close()
+            if url.startswith("data:"):
+                # data URIs já vêm no HTML; não vale a pena guardar
+                return fetched
+
+        with self._lock:
+            self._assets[url] = fetched
+            while len(self._assets) > ASSET_CACHE_MAX_ENTRIES:
+                self._assets.popitem(last=False)
+        return dict(fetched)
+
+    def render(self, html: str, stylesheets: tuple[str, ...] = ()) -> bytes:
+        """Converte HTML em PDF usando as fontes, estilos e recursos compartilhados."""
+        from weasyprint import HTML
+
+        css = [self.stylesheet(stylesheet) for stylesheet in stylesheets]
+        document = HTML(string=html, base_url=ASSETS_DIR + os.sep, url_fetcher=self.url_fetcher)
+        return document.write_pdf(stylesheets=css, font_config=self.font_config)
+
+
+_render_context: PDFRenderContext | None = None
+_render_context_lock = threading.Lock()
+
+
+def get_render_context() -> PDFRenderContext:
+    """Retorna o contexto de renderização do processo atual (criado no primeiro uso)."""
+    global _render_context
+    with _render_context_lock:
+        if _render_context is None:
+            _render_context = PDFRenderContext()
+            logger.info("🖨️ Contexto de renderização de PDF inicializado")
+        return _render_context
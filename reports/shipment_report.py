@@ -1,8 +1,7 @@
 import pandas as pd
 from datetime import date
-import io
-from weasyprint import HTML
 from supabase_local import get_supabase_client
+from reports.pdf_render_service import get_pdf_render_service, render_pdf
 
 
 def log_shipment(df_selected_items, item_type, bulletin_number):
@@ -82,15 +81,27 @@ def select_hoses_for_th(df_hoses, df_shipment_log):
 
 def generate_pdf_from_html(html_content):
     """Converte uma string HTML em um objeto de bytes de PDF usando WeasyPrint."""
-    pdf_bytes = io.BytesIO()
-    HTML(string=html_content).write_pdf(pdf_bytes)
-    return pdf_bytes.getvalue()
+    return render_pdf(html_content)
 
 
 def generate_shipment_html_and_pdf(df_selected_items, item_type, remetente_info, destinatario_info, bulletin_number):
     """
     Gera o HTML para o boletim e o converte para um PDF em bytes, incluindo campos para assinatura.
     """
+    html_string = build_shipment_html(
+        df_selected_items, item_type, remetente_info, destinatario_info, bulletin_number)
+    return generate_pdf_from_html(html_string)
+
+
+def submit_shipment_pdf(df_selected_items, item_type, remetente_info, destinatario_info, bulletin_number) -> str:
+    """Enfileira o PDF do boletim no serviço de renderização e retorna o id do job."""
+    html_string = build_shipment_html(
+        df_selected_items, item_type, remetente_info, destinatario_info, bulletin_number)
+    return get_pdf_render_service().submit(html_string)
+
+
+def build_shipment_html(df_selected_items, item_type, remetente_info, destinatario_info, bulletin_number):
+    """Monta o HTML do boletim de remessa, incluindo campos para assinatura."""
 
     # TODO: Replace with actual Supabase public URL
     logo_url = "https://gfolhadxwqfrmjrbjujp.supabase.co/storage/v1/object/public/assets/logo.png"
@@ -221,4 +232,4 @@ def generate_shipment_html_and_pdf(df_selected_items, item_type, remetente_info,
     </html>
     """
 
-    return generate_pdf_from_html(html_string)
+    return html_string
@@ -0,0 +1,31 @@
+# reports/templating.py
+
+"""
+Templates Jinja2 dos relatórios HTML (pasta reports/templates).
+
+O ambiente é único por processo: cada template é compilado no primeiro uso e
+reaproveitado nas renderizações seguintes, sem verificar o arquivo em disco a
+cada chamada. Os builders preparam os dados (listas de dicionários vindas de
+to_dict('records')) e o template apenas monta o HTML.
+"""
+
+import os
+
+from jinja2 import Environment, FileSystemLoader, StrictUndefined
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(__file__), 'templates')
+
+# Sem autoescape: os relatórios sempre inseriram os valores como estão no HTML
+_environment = Environment(
+    loader=FileSystemLoader(TEMPLATES_DIR),
+    autoescape=False,
+    auto_reload=False,
+    undefined=StrictUndefined,
+    trim_blocks=True,
+    lstrip_blocks=True
+)
+
+
+def render_template(template_name: str, **context) -> str:
+    """Renderiza um template de reports/templates com o contexto informado."""
+    return _environment.get_template(template_name).render(**context)
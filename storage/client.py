@@ -4,10 +4,10 @@ import streamlit as st
 from supabase_local import get_supabase_client
 from datetime import datetime
 import logging
-from PIL import Image
 import requests
-from io import BytesIO
 from config.table_names import BUCKET_NAME
+from storage.image_cache import get_image_cache
+from storage.image_processing import is_compressible_image, prepare_image_upload, thumbnail_path_for
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +15,8 @@ logger = logging.getLogger(__name__)
 def upload_file_to_storage(file, equipment_id: str, folder: str) -> str:
     """
     Faz upload de arquivo (imagem ou PDF) para o Supabase Storage.
+    Fotos são comprimidas antes do envio e ganham uma miniatura ao lado
+    (ver storage.image_processing); os demais arquivos vão como estão.
     
     Args:
         file: Objeto UploadedFile do Streamlit (imagem ou PDF)
@@ -44,6 +46,16 @@ def upload_file_to_storage(file, equipment_id: str, folder: str) -> str:
         
         # Lê bytes do arquivo
         file_bytes = file.getvalue() if hasattr(file, 'getvalue') else file.read()
+        content_type = file.type if hasattr(file, 'type') else 'application/octet-stream'
+        
+        # Comprime fotos (sem EXIF, dimensão máxima configurável) e gera a miniatura
+        prepared = None
+        if is_compressible_image(getattr(file, 'type', None), file.name):
+            prepared = prepare_image_upload(file_bytes)
+        if prepared:
+            file_bytes = prepared["content"]
+            content_type = prepared["content_type"]
+            file_path = f"{folder}/{safe_id}_{timestamp}.{prepared['extension']}"
         
         # Faz o upload
         logger.info(f"📤 Fazendo upload: {file_path}")
@@ -52,11 +64,22 @@ def upload_file_to_storage(file, equipment_id: str, folder: str) -> str:
             path=file_path,
             file=file_bytes,
             file_options={
-                "content-type": file.type if hasattr(file, 'type') else 'application/octet-stream',
+                "content-type": content_type,
                 "upsert": "false"
             }
         )
         
+        if prepared:
+            # A falha da miniatura não invalida o upload: a exibição usa a foto completa
+            try:
+                storage.from_(BUCKET_NAME).upload(
+                    path=thumbnail_path_for(file_path),
+                    file=prepared["thumbnail"],
+                    file_options={"content-type": content_type, "upsert": "false"}
+                )
+            except Exception as thumb_error:
+                logger.warning(f"⚠️ Falha ao enviar miniatura de {file_path}: {thumb_error}")
+        
         # Obtém URL pública
         public_url = storage.from_(BUCKET_NAME).get_public_url(file_path)
         
@@ -109,49 +132,16 @@ def display_storage_image(image_url: str, caption: str = "", width: int = 300):
         st.info("📷 Nenhuma imagem disponível.")
         return
     
-    try:
-        # Método 1: Tentar exibir diretamente (mais rápido)
-        try:
-            st.image(image_url, caption=caption, width=width)
-            logger.info(f"✅ Imagem exibida diretamente: {image_url[:60]}...")
-            return
-        except Exception as direct_error:
-            logger.warning(f"Falha na exibição direta, tentando download: {direct_error}")
-        
-        # Método 2: Download e exibição (fallback)
-        try:
-            # Faz download da imagem
-            response = requests.get(image_url, timeout=10)
-            response.raise_for_status()
-            
-            # Abre a imagem com PIL
-            img = Image.open(BytesIO(response.content))
-            
-            # Exibe a imagem
-            st.image(img, caption=caption, width=width)
-            logger.info(f"✅ Imagem carregada via download: {image_url[:60]}...")
-            
-        except requests.exceptions.RequestException as req_error:
-            logger.error(f"❌ Erro ao baixar imagem: {req_error}")
-            st.error("❌ Não foi possível carregar a imagem (erro de rede)")
-            
-            # Mostra link como fallback
-            st.markdown(f"🔗 [Abrir imagem em nova aba]({image_url})")
-            
-        except Exception as img_error:
-            logger.error(f"❌ Erro ao processar imagem: {img_error}")
-            st.error("❌ Formato de imagem não suportado ou corrompido")
-            
-            # Mostra link como fallback
-            st.markdown(f"🔗 [Abrir imagem em nova aba]({image_url})")
+    # Imagem reduzida servida do cache local (memória/disco); só vai à rede no primeiro acesso
+    image = get_image_cache().get(image_url, width)
+    if image is not None:
+        st.image(image, caption=caption, width=width)
+        return
     
-    except Exception as e:
-        logger.error(f"❌ Erro crítico ao exibir imagem: {e}")
-        st.error(f"❌ Erro ao exibir imagem: {e}")
-        
-        # Última tentativa: mostrar link
-        if image_url.startswith('http'):
-            st.markdown(f"🔗 [Abrir imagem em nova aba]({image_url})")
+    st.error("❌ Não foi possível carregar a imagem (link quebrado, erro de rede ou formato inválido)")
+    if image_url.startswith('http'):
+        # Mostra link como fallback
+        st.markdown(f"🔗 [Abrir imagem em nova aba]({image_url})")
 
 
 def download_file_from_storage(file_url: str) -> bytes:
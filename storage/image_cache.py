@@ -0,0 +1,251 @@
+# storage/image_cache.py
+
+"""
+Cache das imagens exibidas pelo display_storage_image.
+
+As imagens são baixadas uma vez, reduzidas para a largura de exibição e
+guardadas em um LRU em memória e em disco (ambos com limite de tamanho),
+indexado por (URL, largura). Links quebrados também ficam registrados por um
+tempo (cache negativo), então recarregar uma lista de equipamentos não faz
+nenhuma requisição de imagem.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+import logging
+from collections import OrderedDict
+
+import requests
+
+from config.table_names import BUCKET_NAME
+from storage.image_processing import (
+    THUMBNAIL_MAX_DIMENSION, UPLOAD_IMAGE_MAX_DIMENSION, encode_image, thumbnail_path_for
+)
+
+logger = logging.getLogger(__name__)
+
+IMAGE_CACHE_DIR = os.path.join(tempfile.gettempdir(), "storage_image_cache")
+IMAGE_CACHE_MEMORY_MAX_BYTES = 64 * 1024 * 1024
+IMAGE_CACHE_DISK_MAX_BYTES = 512 * 1024 * 1024
+DISPLAY_JPEG_QUALITY = 80
+IMAGE_FETCH_TIMEOUT = 10
+# Link inexistente/imagem inválida vs. falha de rede (provavelmente passageira)
+BROKEN_LINK_TTL_SECONDS = 3600
+NETWORK_ERROR_TTL_SECONDS = 60
+
+
+class ImageFetchError(Exception):
+    """Falha ao obter uma imagem; ttl indica por quanto tempo não tentar novamente."""
+
+    def __init__(self, message: str, ttl: int):
+        super().__init__(message)
+        self.ttl = ttl
+
+
+class DisplayImageCache:
+    """LRU de imagens reduzidas (memória + disco) com cache negativo de links quebrados."""
+
+    def __init__(self, cache_dir: str = IMAGE_CACHE_DIR,
+                 memory_max_bytes: int = IMAGE_CACHE_MEMORY_MAX_BYTES,
+                 disk_max_bytes: int = IMAGE_CACHE_DISK_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.memory_max_bytes = memory_max_bytes
+        self.disk_max_bytes = disk_max_bytes
+        self._memory: OrderedDict = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes = None
+        self._failures: dict = {}
+        self._lock = threading.Lock()
+        self._session = requests.Session()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(url: str, width: int | None) -> str:
+        return hashlib.sha256(f"{url}|{width}".encode()).hexdigest()
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    # --- memória ---
+
+    def _memory_get(self, key: str) -> bytes | None:
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+            return data
+
+    def _memory_set(self, key: str, data: bytes):
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= len(previous)
+            self._memory[key] = data
+            self._memory_bytes += len(data)
+            while self._memory_bytes > self.memory_max_bytes and len(self._memory) > 1:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted)
+
+    # --- disco ---
+
+    def _disk_get(self, key: str) -> bytes | None:
+        path = self._disk_path(key)
+        try:
+            with open(path, "rb") as cached_file:
+                data = cached_file.read()
+            # Atualiza a data de acesso: a remoção no disco segue a mais antiga
+            os.utime(path)
+            return data
+        except OSError:
+            return None
+
+    def _disk_set(self, key: str, data: bytes):
+        path = self._disk_path(key)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as tmp_file:
+                tmp_file.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"⚠️ Falha ao gravar imagem no cache em disco: {e}")
+            return
+
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = self._scan_disk_usage()
+            else:
+                self._disk_bytes += len(data)
+            if self._disk_bytes > self.disk_max_bytes:
+                self._evict_disk()
+
+    def _scan_disk_usage(self) -> int:
+        try:
+            return sum(entry.stat().st_size for entry in os.scandir(self.cache_dir) if entry.is_file())
+        except OSError:
+            return 0
+
+    def _evict_disk(self):
+        """Remove os arquivos acessados há mais tempo até ficar em 80% do limite."""
+        try:
+            entries = sorted((entry for entry in os.scandir(self.cache_dir) if entry.is_file()),
+                             key=lambda entry: entry.stat().st_mtime)
+        except OSError:
+            return
+        total = sum(entry.stat().st_size for entry in entries)
+        target = self.disk_max_bytes * 0.8
+        for entry in entries:
+            if total <= target:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+                total -= size
+            except OSError:
+                continue
+        self._disk_bytes = total
+
+    # --- cache negativo ---
+
+    def _failed_recently(self, url: str) -> bool:
+        with self._lock:
+            expires_at = self._failures.get(url)
+            if expires_at is None:
+                return False
+            if time.time() >= expires_at:
+                del self._failures[url]
+                return False
+            return True
+
+    def _record_failure(self, url: str, ttl: int):
+        with self._lock:
+            self._failures[url] = time.time() + ttl
+
+    # --- download ---
+
+    def _download(self, url: str) -> bytes:
+        try:
+            response = self._session.get(url, timeout=IMAGE_FETCH_TIMEOUT)
+        except requests.exceptions.RequestException as e:
+            raise ImageFetchError(f"erro de rede: {e}", NETWORK_ERROR_TTL_SECONDS)
+        if response.status_code != 200:
+            ttl = NETWORK_ERROR_TTL_SECONDS if response.status_code >= 500 else BROKEN_LINK_TTL_SECONDS
+            raise ImageFetchError(f"HTTP {response.status_code}", ttl)
+        return response.content
+
+    def _fetch_source(self, url: str, width: int | None) -> bytes:
+        """Baixa a miniatura gerada no upload (se servir para a largura) ou a imagem original."""
+        if width and width <= THUMBNAIL_MAX_DIMENSION and f"/object/public/{BUCKET_NAME}/" in url:
+            thumbnail_url = thumbnail_path_for(url)
+            if thumbnail_url != url and not self._failed_recently(thumbnail_url):
+                try:
+                    return self._download(thumbnail_url)
+                except ImageFetchError as e:
+                    # Uploads antigos não têm miniatura; não tenta de novo por um tempo
+                    self._record_failure(thumbnail_url, e.ttl)
+        return self._download(url)
+
+    def get(self, url: str, width: int | None = None) -> bytes | None:
+        """
+        Imagem pronta para exibição (JPEG reduzido para a largura informada).
+
+        Returns:
+            Bytes da imagem, ou None se o link estiver quebrado (resultado também em cache)
+        """
+        key = self._key(url, width)
+        data = self._memory_get(key)
+        if data is None:
+            data = self._disk_get(key)
+            if data is not None:
+                self._memory_set(key, data)
+        if data is not None:
+            self.hits += 1
+            return data
+
+        if self._failed_recently(url):
+            self.hits += 1
+            return None
+
+        self.misses += 1
+        try:
+            source = self._fetch_source(url, width)
+            try:
+                data = encode_image(source, width or UPLOAD_IMAGE_MAX_DIMENSION, "JPEG", DISPLAY_JPEG_QUALITY)
+            except Exception as e:
+                raise ImageFetchError(f"imagem inválida: {e}", BROKEN_LINK_TTL_SECONDS)
+        except ImageFetchError as e:
+            logger.warning(f"⚠️ Imagem indisponível ({e}): {url[:60]}...")
+            self._record_failure(url, e.ttl)
+            return None
+
+        self._memory_set(key, data)
+        self._disk_set(key, data)
+        return data
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_bytes": self._disk_bytes,
+                "broken_links": len(self._failures),
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+
+_image_cache: DisplayImageCache | None = None
+_image_cache_lock = threading.Lock()
+
+
+def get_image_cache() -> DisplayImageCache:
+    """Retorna o cache de imagens do processo, compartilhado por todas as sessões."""
+    global _image_cache
+    with _image_cache_lock:
+        if _image_cache is None:
+            _image_cache = DisplayImageCache()
+        return _image_cache
@@ -0,0 +1,114 @@
+# storage/image_processing.py
+
+"""
+Preparação de fotos antes do upload para o Storage.
+
+As fotos de celular (4–8 MB) são reduzidas para UPLOAD_IMAGE_MAX_DIMENSION,
+regravadas em UPLOAD_IMAGE_FORMAT (JPEG ou WEBP) sem metadados EXIF (a
+orientação é aplicada antes) e acompanhadas de uma miniatura, gravada ao lado
+da foto com o sufixo THUMBNAIL_SUFFIX. PDFs e outros arquivos não são alterados.
+"""
+
+import io
+import os
+import logging
+
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_IMAGE_MAX_DIMENSION = int(os.environ.get("UPLOAD_IMAGE_MAX_DIMENSION", 1600))
+UPLOAD_IMAGE_FORMAT = os.environ.get("UPLOAD_IMAGE_FORMAT", "JPEG").upper()
+UPLOAD_IMAGE_QUALITY = int(os.environ.get("UPLOAD_IMAGE_QUALITY", 80))
+# Maior largura em que o dashboard exibe as fotos (display_storage_image)
+THUMBNAIL_MAX_DIMENSION = 400
+THUMBNAIL_SUFFIX = "_thumb"
+
+IMAGE_FORMATS = {
+    "JPEG": ("image/jpeg", "jpg"),
+    "WEBP": ("image/webp", "webp"),
+}
+# Tipos regravados no upload (GIF animado e SVG são enviados como estão)
+COMPRESSIBLE_CONTENT_TYPES = {"image/jpeg", "image/jpg", "image/png", "image/webp", "image/bmp", "image/tiff"}
+
+
+def is_compressible_image(content_type: str | None, file_name: str | None = None) -> bool:
+    """Indica se o arquivo é uma foto que deve ser comprimida antes do upload."""
+    if content_type:
+        return content_type.lower() in COMPRESSIBLE_CONTENT_TYPES
+    extension = (file_name or "").rsplit(".", 1)[-1].lower()
+    return extension in {"jpg", "jpeg", "png", "webp", "bmp", "tif", "tiff"}
+
+
+def encode_image(content: bytes, max_dimension: int, image_format: str = UPLOAD_IMAGE_FORMAT,
+                 quality: int = UPLOAD_IMAGE_QUALITY) -> bytes:
+    """
+    Reduz a imagem para caber em max_dimension x max_dimension e a regrava no formato
+    indicado, aplicando a orientação EXIF e descartando os metadados.
+
+    Raises:
+        Exception do Pillow se o conteúdo não for uma imagem válida
+    """
+    with Image.open(io.BytesIO(content)) as image:
+        # JPEG: decodifica já em escala reduzida (bem mais rápido que decodificar e reduzir)
+        image.draft("RGB", (max_dimension, max_dimension))
+        image = ImageOps.exif_transpose(image)
+
+        if image_format == "JPEG" and image.mode not in ("RGB", "L"):
+            if image.mode in ("RGBA", "LA", "P"):
+                # Transparência sobre fundo branco
+                image = image.convert("RGBA")
+                background = Image.new("RGB", image.size, (255, 255, 255))
+                background.paste(image, mask=image.getchannel("A"))
+                image = background
+            else:
+                image = image.convert("RGB")
+        elif image_format == "WEBP" and image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "A" in image.getbands() or image.mode == "P" else "RGB")
+
+        image.thumbnail((max_dimension, max_dimension))
+        output = io.BytesIO()
+        # Sem exif=...: o Pillow não copia os metadados da foto original
+        if image_format == "JPEG":
+            image.save(output, format="JPEG", quality=quality, optimize=True)
+        else:
+            image.save(output, format=image_format, quality=quality, method=4)
+    return output.getvalue()
+
+
+def prepare_image_upload(content: bytes, image_format: str = UPLOAD_IMAGE_FORMAT,
+                         max_dimension: int = UPLOAD_IMAGE_MAX_DIMENSION,
+                         quality: int = UPLOAD_IMAGE_QUALITY) -> dict | None:
+    """
+    Gera a foto comprimida e a miniatura a partir dos bytes originais.
+
+    Returns:
+        Dicionário com 'content', 'thumbnail', 'content_type' e 'extension',
+        ou None se o conteúdo não puder ser lido como imagem (enviar o original)
+    """
+    content_type, extension = IMAGE_FORMATS[image_format]
+    try:
+        compressed = encode_image(content, max_dimension, image_format, quality)
+        thumbnail = encode_image(compressed, THUMBNAIL_MAX_DIMENSION, image_format, quality)
+    except Exception as e:
+        logger.warning(f"⚠️ Não foi possível comprimir a imagem, enviando o original: {e}")
+        return None
+
+    logger.info(f"🗜️ Imagem comprimida: {len(content) / 1024:.0f} KB -> {len(compressed) / 1024:.0f} KB "
+                f"(miniatura {len(thumbnail) / 1024:.0f} KB)")
+    return {
+        "content": compressed,
+        "thumbnail": thumbnail,
+        "content_type": content_type,
+        "extension": extension,
+    }
+
+
+def thumbnail_path_for(path_or_url: str) -> str:
+    """Caminho (ou URL) da miniatura gravada ao lado de uma foto: foto.jpg -> foto_thumb.jpg."""
+    base, query = (path_or_url.split("?", 1) + [""])[:2]
+    stem, dot, extension = base.rpartition(".")
+    if not dot or "/" in extension:
+        return path_or_url
+    thumbnail = f"{stem}{THUMBNAIL_SUFFIX}.{extension}"
+    return f"{thumbnail}?{query}" if query else thumbnail
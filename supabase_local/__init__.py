@@ -1,4 +1,5 @@
 # supabase/__init__.py
+from .cache import get_table_cache, TenantTableCache
 from .client import get_supabase_client, get_supabase_client_no_cache, SupabaseClient, reset_supabase_client, force_cleanup_supabase_state, diagnose_supabase_connection, diagnose_supabase_initialization
 
-__all__ = ['get_supabase_client', 'get_supabase_client_no_cache', 'SupabaseClient', 'reset_supabase_client', 'force_cleanup_supabase_state', 'diagnose_supabase_connection', 'diagnose_supabase_initialization']
+__all__ = ['get_supabase_client', 'get_supabase_client_no_cache', 'SupabaseClient', 'reset_supabase_client', 'force_cleanup_supabase_state', 'diagnose_supabase_connection', 'diagnose_supabase_initialization', 'get_table_cache', 'TenantTableCache']
@@ -0,0 +1,177 @@
+# supabase_local/cache.py
+
+"""
+Cache de leituras do Supabase isolado por tenant.
+
+As entradas são indexadas por (escopo, tabela, consulta). O escopo é o user_id
+usado no filtro multi-tenant, ou None para leituras sem filtro (superuser e
+tabelas globais). Escritas feitas pelo SupabaseClient invalidam apenas a tabela
+afetada, então salvar uma inspeção não obriga os outros tenants a recarregar.
+"""
+
+import threading
+import time
+import logging
+from collections import OrderedDict
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Mesmo TTL usado anteriormente pelo @st.cache_data de load_sheet_data
+DEFAULT_TTL_SECONDS = 300
+DEFAULT_MAX_ENTRIES = 512
+
+
+class TenantTableCache:
+    """Cache LRU com TTL de DataFrames, compartilhado por todas as sessões do processo."""
+
+    def __init__(self, ttl_seconds: int = DEFAULT_TTL_SECONDS, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, scope, table_name: str, query_key) -> pd.DataFrame | None:
+        """Retorna uma cópia do DataFrame em cache, ou None se ausente/expirado."""
+        key = (scope, table_name, query_key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            stored_at, df = entry
+            if time.time() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+        # Cópia: os chamadores costumam alterar colunas do DataFrame recebido
+        return df.copy()
+
+    def set(self, scope, table_name: str, query_key, df: pd.DataFrame):
+        """Armazena uma cópia do DataFrame para (escopo, tabela, consulta)."""
+        key = (scope, table_name, query_key)
+        with self._lock:
+            self._entries[key] = (time.time(), df.copy())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_table(self, table_name: str, scopes=None) -> int:
+        """
+        Remove as entradas de uma tabela.
+
+        Args:
+            table_name: Tabela alterada
+            scopes: Escopos a invalidar (None = todos os tenants)
+
+        Returns:
+            Quantidade de entradas removidas
+        """
+        with self._lock:
+            keys = [
+                key for key in self._entries
+                if key[1] == table_name and (scopes is None or key[0] in scopes)
+            ]
+            for key in keys:
+                del self._entries[key]
+
+        if keys:
+            logger.info(f"🧹 Cache invalidado: '{table_name}' ({len(keys)} entrada(s))")
+        return len(keys)
+
+    def clear_scope(self, scope) -> int:
+        """Remove todas as entradas de um tenant."""
+        with self._lock:
+            keys = [key for key in self._entries if key[0] == scope]
+            for key in keys:
+                del self._entries[key]
+        return len(keys)
+
+    def clear(self):
+        """Remove todas as entradas de todos os tenants."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Estatísticas simples de uso do cache."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "ttl_seconds": self.ttl_seconds,
+                "max_entries": self.max_entries
+            }
+
+
+class TableSnapshotStore:
+    """
+    Último DataFrame completo de cada (escopo, tabela, consulta), com a marca
+    d'água (maior id) usada na sincronização incremental.
+
+    Não expira por tempo: a sincronização busca só os registros novos e a
+    snapshot é descartada quando há atualização/exclusão na tabela.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, scope, table_name: str, query_key) -> tuple[pd.DataFrame, object] | None:
+        """Retorna (DataFrame, marca d'água) ou None. O DataFrame não é copiado."""
+        key = (scope, table_name, query_key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, scope, table_name: str, query_key, df: pd.DataFrame, watermark):
+        """Armazena a snapshot (o chamador não deve alterar o DataFrame depois)."""
+        key = (scope, table_name, query_key)
+        with self._lock:
+            self._entries[key] = (df, watermark)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_table(self, table_name: str, scopes=None) -> int:
+        """Descarta as snapshots de uma tabela (None = todos os tenants)."""
+        with self._lock:
+            keys = [
+                key for key in self._entries
+                if key[1] == table_name and (scopes is None or key[0] in scopes)
+            ]
+            for key in keys:
+                del self._entries[key]
+        return len(keys)
+
+    def clear_scope(self, scope) -> int:
+        """Descarta todas as snapshots de um tenant."""
+        with self._lock:
+            keys = [key for key in self._entries if key[0] == scope]
+            for key in keys:
+                del self._entries[key]
+        return len(keys)
+
+
+_table_cache = TenantTableCache()
+_snapshot_store = TableSnapshotStore()
+
+
+def get_table_cache() -> TenantTableCache:
+    """Retorna a instância de cache compartilhada pelo processo."""
+    return _table_cache
+
+
+def get_snapshot_store() -> TableSnapshotStore:
+    """Retorna o armazenamento de snapshots incrementais compartilhado pelo processo."""
+    return _snapshot_store
@@ -1,19 +1,189 @@
 # supabase/client.py (VERSÃO COM INTEGER)
 
 import streamlit as st
-from supabase import create_client, Client
+from supabase import create_client, Client, ClientOptions
+from postgrest.exceptions import APIError
+from postgrest.types import ReturnMethod
 import pandas as pd
+import httpx
 import logging
+import threading
+import time
+
+from .cache import get_table_cache, get_snapshot_store
 
 logger = logging.getLogger(__name__)
 
+# Tabelas GLOBAIS que NÃO devem ser filtradas por usuário
+GLOBAL_TABLES = {
+    "usuarios",
+    "log_auditoria",
+    "solicitacoes_acesso",
+    "notificacoes_pendentes",
+    "solicitacoes_suporte"
+}
+
+# Tamanho padrão de página para leituras paginadas (limite padrão do PostgREST)
+DEFAULT_PAGE_SIZE = 1000
+
+# Registros por requisição nas inserções em lote (bulk_insert)
+DEFAULT_INSERT_CHUNK_SIZE = 500
+
+# Tentativas de um lote inteiro em erros de rede/5xx (sem dividir o lote)
+BULK_INSERT_MAX_RETRIES = 3
+BULK_INSERT_RETRY_DELAY_SECONDS = 2
+
+# Códigos do PostgREST que indicam registro rejeitado (HTTP 4xx): SQLSTATE de
+# dados inválidos (22), restrições (23), colunas/sintaxe (42), RAISE (P0001)
+# e erros da requisição/esquema (PGRST1xx, PGRST2xx)
+RECORD_ERROR_CODE_PREFIXES = ("22", "23", "42", "P0001", "PGRST1", "PGRST2")
+# 4xx que valem para o lote inteiro (permissão/RLS, tabela inexistente): dividir não isola nada
+CHUNK_ERROR_CODES = ("42501", "42P01", "PGRST205")
+
+# Função SQL (DISTINCT ON) que retorna o último registro de cada equipamento.
+# Definição em doc/supabase-functions.md
+LATEST_PER_KEY_RPC = "get_latest_per_key"
+
+# Pool HTTP (keep-alive) compartilhado por todas as sessões do processo
+POOL_MAX_CONNECTIONS = 50
+POOL_MAX_KEEPALIVE_CONNECTIONS = 20
+POOL_KEEPALIVE_EXPIRY_SECONDS = 60
+POOL_TIMEOUT = httpx.Timeout(120.0, connect=10.0)
+
+_shared_client: Client | None = None
+_shared_client_credentials: tuple[str, str] | None = None
+_shared_client_lock = threading.Lock()
+
+
+def get_shared_client(url: str, key: str) -> Client:
+    """
+    Retorna o cliente Supabase do processo, criando-o na primeira chamada.
+
+    Todas as sessões usam o mesmo pool de conexões HTTP; o isolamento por
+    tenant continua sendo feito por requisição (filtro user_id) no SupabaseClient.
+    O teste de conectividade roda apenas quando o cliente é criado.
+    """
+    global _shared_client, _shared_client_credentials
+
+    with _shared_client_lock:
+        if _shared_client is not None and _shared_client_credentials == (url, key):
+            return _shared_client
+
+        start_time = time.time()
+
+        http_client = httpx.Client(
+            timeout=POOL_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=POOL_MAX_CONNECTIONS,
+                max_keepalive_connections=POOL_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=POOL_KEEPALIVE_EXPIRY_SECONDS
+            )
+        )
+        client = create_client(url, key, options=ClientOptions(httpx_client=http_client))
+
+        # Testa conexão básica (uma vez por processo)
+        try:
+            client.table("usuarios").select("id").limit(1).execute()
+            logger.info("✅ Conexão com Supabase testada com sucesso")
+        except Exception as test_error:
+            logger.warning(f"⚠️ Aviso: Teste de conexão falhou: {test_error}")
+            # Não falha aqui, apenas avisa
+
+        previous_client = _shared_client
+        _shared_client = client
+        _shared_client_credentials = (url, key)
+
+        if previous_client is not None:
+            # Credenciais mudaram: fecha o pool antigo
+            try:
+                previous_client.options.httpx_client.close()
+            except Exception:
+                pass
+
+        elapsed_time = time.time() - start_time
+        logger.info(f"✅ Pool de conexões Supabase criado em {elapsed_time:.2f}s")
+        return client
+
+
+def _same_error(error: APIError, other: APIError) -> bool:
+    """Mesmo erro do PostgREST (código, mensagem e detalhes, que citam o registro quando há um)."""
+    return (error.code, error.message, error.details) == (other.code, other.message, other.details)
+
+
+def is_record_error(error: Exception) -> bool:
+    """
+    True se o PostgREST rejeitou o conteúdo enviado (4xx).
+    
+    Só esses erros justificam dividir um lote para isolar o registro culpado;
+    falhas de rede, timeouts e 5xx atingiriam as metades da mesma forma.
+    """
+    if not isinstance(error, APIError):
+        return False
+    if isinstance(error.code, int):
+        # Resposta sem JSON: o código é o status HTTP
+        return 400 <= error.code < 500
+    return str(error.code or "").startswith(RECORD_ERROR_CODE_PREFIXES)
+
+
+class IdentityContext:
+    """Identidade resolvida do usuário da sessão (email, superuser e user_id)."""
+
+    def __init__(self, email: str | None, is_superuser: bool, user_id: int | None, session_user_id=None):
+        self.email = email
+        self.is_superuser = is_superuser
+        self.user_id = user_id
+        # Valor de st.session_state['current_user_id'] usado na resolução
+        self.session_user_id = session_user_id
+
+    def matches(self, email: str | None, session_user_id) -> bool:
+        """Indica se o contexto ainda vale para o login/sessão atuais."""
+        return self.email == email and self.session_user_id == session_user_id
+
+    def __repr__(self):
+        return f"IdentityContext(email={self.email!r}, is_superuser={self.is_superuser}, user_id={self.user_id})"
+
+
 class SupabaseClient:
     """Cliente Supabase com isolamento automático de dados por user_id (multi-tenant)."""
     
     def __init__(self):
         self.client: Client = self._initialize_client()
-        # Obtém o user_id do usuário logado (INTEGER)
-        self.user_id = self._get_current_user_id()
+        self._identity: IdentityContext | None = None
+        # Resolve o user_id do usuário logado (INTEGER)
+        self.get_identity()
+
+    @property
+    def user_id(self) -> int | None:
+        """user_id (INTEGER) do usuário logado, resolvido uma vez por login."""
+        return self.get_identity().user_id
+
+    def get_identity(self) -> IdentityContext:
+        """
+        Retorna a identidade do usuário da sessão, resolvendo-a apenas quando
+        o login (email) ou o current_user_id da sessão mudam.
+        """
+        email = self._get_user_email_directly()
+        session_user_id = st.session_state.get('current_user_id')
+
+        identity = self._identity
+        if identity is not None and identity.matches(email, session_user_id):
+            return identity
+
+        identity = IdentityContext(
+            email=email,
+            is_superuser=self._resolve_superuser(),
+            user_id=self._get_current_user_id(email),
+            session_user_id=session_user_id
+        )
+        # _get_current_user_id pode ter gravado o id encontrado na sessão
+        identity.session_user_id = st.session_state.get('current_user_id')
+        self._identity = identity
+        logger.info(f"🪪 Identidade resolvida: {identity}")
+        return identity
+
+    def invalidate_identity(self):
+        """Força nova resolução da identidade na próxima requisição (troca de login)."""
+        self._identity = None
 
     def _initialize_client(self) -> Client:
         """Inicializa a conexão com o Supabase."""
@@ -69,25 +239,8 @@ class SupabaseClient:
                 st.stop()
                 raise ValueError("URL do Supabase inválida")
             
-            # Cria cliente com timeout
-            import requests
-            import time
-            
-            start_time = time.time()
-            client = create_client(url, key)
-            
-            # Testa conexão básica
-            try:
-                # Teste simples de conectividade
-                test_response = client.table("usuarios").select("id").limit(1).execute()
-                logger.info("✅ Conexão com Supabase testada com sucesso")
-            except Exception as test_error:
-                logger.warning(f"⚠️ Aviso: Teste de conexão falhou: {test_error}")
-                # Não falha aqui, apenas avisa
-            
-            elapsed_time = time.time() - start_time
-            logger.info(f"✅ Cliente Supabase inicializado em {elapsed_time:.2f}s")
-            return client
+            # Reutiliza o cliente/pool HTTP do processo
+            return get_shared_client(url, key)
             
         except KeyError as e:
             error_msg = f"Configuração do Supabase ausente: {e}"
@@ -103,7 +256,11 @@ class SupabaseClient:
             raise
 
     def _is_superuser(self) -> bool:
-        """Verifica se o usuário atual é superuser."""
+        """Verifica se o usuário atual é superuser (memoizado por login)."""
+        return self.get_identity().is_superuser
+
+    def _resolve_superuser(self) -> bool:
+        """Consulta auth_utils para saber se o usuário atual é superuser."""
         try:
             from auth.auth_utils import is_superuser
             return is_superuser()
@@ -121,26 +278,20 @@ class SupabaseClient:
         except Exception:
             return None
 
-    def _get_users_data_directly(self) -> pd.DataFrame:
-        """Obtém dados de usuários diretamente do Supabase, sem cache do Streamlit."""
-        try:
-            # Busca diretamente na tabela usuarios sem usar auth_utils
-            users_data = self.get_data("usuarios")
-            if users_data is not None and not users_data.empty:
-                # Converte colunas de data que vêm como string do Supabase
-                if 'data_cadastro' in users_data.columns:
-                    users_data['data_cadastro'] = pd.to_datetime(
-                        users_data['data_cadastro'], errors='coerce').dt.date
-                if 'trial_end_date' in users_data.columns:
-                    users_data['trial_end_date'] = pd.to_datetime(
-                        users_data['trial_end_date'], errors='coerce').dt.date
-                return users_data
-            return pd.DataFrame()
-        except Exception as e:
-            logger.warning(f"Erro ao obter dados de usuários diretamente: {e}")
-            return pd.DataFrame()
+    def _get_user_id_by_email(self, user_email: str) -> int | None:
+        """Busca apenas o id do usuário com o email informado (uma linha)."""
+        response = (
+            self.client.table("usuarios")
+            .select("id")
+            .eq("email", user_email)
+            .limit(1)
+            .execute()
+        )
+        if not response.data:
+            return None
+        return response.data[0].get('id')
 
-    def _get_current_user_id(self) -> int | None:
+    def _get_current_user_id(self, user_email: str | None = None) -> int | None:
         """Obtém o user_id (INTEGER) do usuário logado da sessão."""
         try:
             # Evita dependência circular - obtém user_id diretamente da sessão
@@ -154,23 +305,18 @@ class SupabaseClient:
             # QUEBRA A DEPENDÊNCIA CIRCULAR: obtém user_id diretamente do Supabase
             # sem passar por auth_utils que chama get_supabase_client novamente
             try:
-                user_email = self._get_user_email_directly()
+                user_email = user_email or self._get_user_email_directly()
                 if user_email:
-                    # Busca diretamente na tabela usuarios sem usar auth_utils
-                    users_data = self._get_users_data_directly()
-                    if not users_data.empty:
-                        user_entry = users_data[users_data['email'] == user_email]
-                        if not user_entry.empty:
-                            user_id = user_entry.iloc[0].get('id')
-                            if user_id:
-                                try:
-                                    user_id = int(user_id)
-                                    # Armazena na sessão para próximas consultas
-                                    st.session_state['current_user_id'] = user_id
-                                    logger.info(f"✅ User ID obtido diretamente: {user_id}")
-                                    return user_id
-                                except (ValueError, TypeError):
-                                    logger.warning(f"ID do usuário não é um número válido: {user_id}")
+                    user_id = self._get_user_id_by_email(user_email)
+                    if user_id:
+                        try:
+                            user_id = int(user_id)
+                            # Armazena na sessão para próximas consultas
+                            st.session_state['current_user_id'] = user_id
+                            logger.info(f"✅ User ID obtido diretamente: {user_id}")
+                            return user_id
+                        except (ValueError, TypeError):
+                            logger.warning(f"ID do usuário não é um número válido: {user_id}")
             except Exception as direct_error:
                 logger.warning(f"Erro ao obter user_id diretamente: {direct_error}")
             
@@ -181,56 +327,160 @@ class SupabaseClient:
             logger.warning(f"Não foi possível obter user_id: {e}")
             return None
 
-    def get_data(self, table_name: str, filters: dict | None = None) -> pd.DataFrame:
+    def _resolve_read_scope(self, table_name: str) -> tuple[bool, int | None]:
+        """
+        Resolve o escopo multi-tenant de leitura de uma tabela.
+
+        Returns:
+            Tupla (acesso_permitido, user_id_para_filtro). O user_id é None
+            quando a leitura não deve ser filtrada (superuser ou tabela global).
+        """
+        # 🔒 APLICA FILTRO DE SEGURANÇA (multi-tenant) usando user_id
+        if table_name in GLOBAL_TABLES:
+            # Tabelas globais - apenas superuser pode acessar
+            if not self._is_superuser():
+                logger.warning(f"❌ Acesso negado: apenas superuser pode acessar tabela global '{table_name}'")
+                return False, None
+            logger.info(f"👑 Superuser acessando tabela global '{table_name}'")
+            return True, None
+
+        # Tabelas normais - filtro por user_id
+        if not self.user_id:
+            logger.warning(f"Usuário não identificado. Retornando dados vazios para '{table_name}'.")
+            # Não mostra warning para o usuário, apenas retorna dados vazios
+            return False, None
+
+        # Verifica se é superuser - se for, não aplica filtro
+        if self._is_superuser():
+            logger.info(f"👑 Superuser acessando todos os dados de '{table_name}'")
+            return True, None
+
+        logger.info(f"🔒 Filtro de segurança aplicado: user_id={self.user_id}")
+        return True, self.user_id
+
+    def _build_read_query(self, table_name: str, user_filter: int | None,
+                          filters: dict | None = None, columns: list[str] | tuple[str, ...] | None = None,
+                          after: tuple[str, object] | None = None):
+        """Monta uma nova query de leitura (projeção + filtro de tenant + filtros extras)."""
+        select_clause = ",".join(columns) if columns else "*"
+        query = self.client.table(table_name).select(select_clause)
+
+        if user_filter is not None:
+            query = query.eq('user_id', user_filter)
+
+        # Aplica filtros adicionais se fornecidos
+        if filters:
+            for key, value in filters.items():
+                query = query.eq(key, value)
+
+        # Apenas registros após a marca d'água (sincronização incremental)
+        if after is not None:
+            query = query.gt(after[0], after[1])
+
+        return query
+
+    def _cache_scope(self, table_name: str) -> tuple[bool, int | None]:
+        """
+        Resolve o escopo do cache de leitura de uma tabela.
+
+        Returns:
+            Tupla (cacheável, escopo). O escopo é o user_id do tenant ou None
+            para leituras sem filtro (superuser e tabelas globais).
+        """
+        is_superuser = self._is_superuser()
+        if table_name in GLOBAL_TABLES:
+            # Leituras negadas (não superuser) não podem ocupar o escopo global
+            return is_superuser, None
+        if is_superuser:
+            return True, None
+        if not self.user_id:
+            return False, None
+        return True, self.user_id
+
+    def cached_read(self, table_name: str, query_key, loader) -> pd.DataFrame:
+        """
+        Executa uma leitura usando o cache isolado por tenant.
+
+        Args:
+            table_name: Tabela lida (usada na invalidação)
+            query_key: Identificador hashable da consulta (colunas, modo, etc.)
+            loader: Função sem argumentos que busca o DataFrame no Supabase
+
+        Returns:
+            DataFrame da consulta
+        """
+        cacheable, scope = self._cache_scope(table_name)
+        if not cacheable:
+            return loader()
+
+        cache = get_table_cache()
+        cached = cache.get(scope, table_name, query_key)
+        if cached is not None:
+            logger.info(f"⚡ '{table_name}' servido do cache (escopo={scope})")
+            return cached
+
+        df = loader()
+        if df is not None:
+            cache.set(scope, table_name, query_key, df)
+        return df
+
+    def invalidate_cache(self, table_name: str, resync: bool = False):
+        """
+        Invalida o cache de leitura de uma tabela após uma escrita.
+
+        Escritas de um tenant afetam apenas o próprio escopo e a visão sem filtro
+        do superuser; escritas do superuser ou em tabelas globais afetam todos.
+
+        Args:
+            table_name: Tabela alterada
+            resync: Descarta também as snapshots incrementais (atualização ou
+                exclusão). Inserções são capturadas pela própria sincronização.
+        """
+        scopes = None
+        if table_name not in GLOBAL_TABLES and not self._is_superuser():
+            scopes = (self.user_id, None)
+
+        get_table_cache().invalidate_table(table_name, scopes=scopes)
+        if resync:
+            get_snapshot_store().invalidate_table(table_name, scopes=scopes)
+
+    def clear_cache(self):
+        """Limpa todas as leituras em cache do tenant atual."""
+        scope = None if self._is_superuser() else self.user_id
+        removed = get_table_cache().clear_scope(scope)
+        get_snapshot_store().clear_scope(scope)
+        logger.info(f"🧹 Cache do tenant limpo (escopo={scope}, {removed} entrada(s))")
+
+    def get_data(self, table_name: str, filters: dict | None = None,
+                 columns: list[str] | tuple[str, ...] | None = None,
+                 page_size: int | None = None) -> pd.DataFrame:
         """
         Busca dados de uma tabela com ISOLAMENTO AUTOMÁTICO por user_id.
         
         Args:
             table_name: Nome da tabela no Supabase
             filters: Filtros adicionais opcionais (dict)
+            columns: Colunas a selecionar (None = todas)
+            page_size: Se informado, busca a tabela em páginas via range()
+                e concatena o resultado (ver iter_data); nesse modo uma falha
+                em qualquer página é propagada em vez de retornar dados parciais
             
         Returns:
             DataFrame com os dados filtrados
         """
+        if page_size:
+            chunks = list(self.iter_data(table_name, filters=filters,
+                                         columns=columns, page_size=page_size))
+            if not chunks:
+                return pd.DataFrame()
+            return pd.concat(chunks, ignore_index=True)
+
         try:
-            # Tabelas GLOBAIS que NÃO devem ser filtradas por usuário
-            GLOBAL_TABLES = {
-                "usuarios", 
-                "log_auditoria", 
-                "solicitacoes_acesso", 
-                "notificacoes_pendentes", 
-                "solicitacoes_suporte"
-            }
-            
-            query = self.client.table(table_name).select("*")
-            
-            # 🔒 APLICA FILTRO DE SEGURANÇA (multi-tenant) usando user_id
-            if table_name in GLOBAL_TABLES:
-                # Tabelas globais - apenas superuser pode acessar
-                if not self._is_superuser():
-                    logger.warning(f"❌ Acesso negado: apenas superuser pode acessar tabela global '{table_name}'")
-                    return pd.DataFrame()
-                else:
-                    logger.info(f"👑 Superuser acessando tabela global '{table_name}'")
-            else:
-                # Tabelas normais - filtro por user_id
-                if not self.user_id:
-                    logger.warning(f"Usuário não identificado. Retornando dados vazios para '{table_name}'.")
-                    # Não mostra warning para o usuário, apenas retorna dados vazios
-                    return pd.DataFrame()
-                
-                # Verifica se é superuser - se for, não aplica filtro
-                if self._is_superuser():
-                    logger.info(f"👑 Superuser acessando todos os dados de '{table_name}'")
-                else:
-                    query = query.eq('user_id', self.user_id)
-                    logger.info(f"🔒 Filtro de segurança aplicado: user_id={self.user_id}")
-            
-            # Aplica filtros adicionais se fornecidos
-            if filters:
-                for key, value in filters.items():
-                    query = query.eq(key, value)
-            
+            allowed, user_filter = self._resolve_read_scope(table_name)
+            if not allowed:
+                return pd.DataFrame()
+
+            query = self._build_read_query(table_name, user_filter, filters, columns)
             response = query.execute()
             
             # Verifica se a resposta tem dados
@@ -256,6 +506,229 @@ class SupabaseClient:
             st.error(f"Erro ao carregar dados de '{table_name}': {e}")
             return pd.DataFrame()
 
+    def iter_data(self, table_name: str, filters: dict | None = None,
+                  columns: list[str] | tuple[str, ...] | None = None,
+                  page_size: int = DEFAULT_PAGE_SIZE, order_by: str | None = "id",
+                  after: tuple[str, object] | None = None):
+        """
+        Lê uma tabela em páginas (range() do PostgREST), gerando um DataFrame por página.
+
+        Mantém o mesmo isolamento multi-tenant de get_data. A ordenação por
+        `order_by` garante paginação estável entre as requisições.
+
+        Args:
+            table_name: Nome da tabela no Supabase
+            filters: Filtros adicionais opcionais (dict)
+            columns: Colunas a selecionar (None = todas)
+            page_size: Quantidade de registros por página
+            order_by: Coluna usada para ordenar as páginas (None = sem ordenação)
+            after: Tupla (coluna, valor) para ler apenas registros com coluna > valor
+
+        Yields:
+            DataFrame com os registros de cada página
+
+        Raises:
+            Exception do Supabase se alguma página falhar: uma leitura parcial
+            nunca é devolvida (nem guardada em cache) como se fosse a tabela inteira
+        """
+        if page_size <= 0:
+            raise ValueError("page_size deve ser maior que zero")
+
+        try:
+            allowed, user_filter = self._resolve_read_scope(table_name)
+            if not allowed:
+                return
+
+            start = 0
+            total = 0
+            while True:
+                # O builder do postgrest é mutável: monta uma query nova por página
+                query = self._build_read_query(table_name, user_filter, filters, columns, after)
+                if order_by:
+                    query = query.order(order_by)
+                response = query.range(start, start + page_size - 1).execute()
+
+                data = getattr(response, 'data', None) or []
+                if not data:
+                    break
+
+                total += len(data)
+                yield pd.DataFrame(data)
+
+                if len(data) < page_size:
+                    break
+                start += page_size
+
+            logger.info(f"✅ {total} registros lidos de '{table_name}' em páginas de {page_size}")
+
+        except Exception as e:
+            logger.error(f"❌ Erro ao ler '{table_name}' em páginas: {e}")
+            st.error(f"Erro ao carregar dados de '{table_name}': {e}")
+            raise
+
+    def count_rows(self, table_name: str) -> int | None:
+        """
+        Conta os registros visíveis para o tenant sem transferir linhas (count exato, HEAD).
+
+        Returns:
+            Quantidade de registros, ou None se a contagem falhar
+        """
+        allowed, user_filter = self._resolve_read_scope(table_name)
+        if not allowed:
+            return 0
+
+        try:
+            query = self.client.table(table_name).select("*", count="exact", head=True)
+            if user_filter is not None:
+                query = query.eq('user_id', user_filter)
+            return query.execute().count
+        except Exception as e:
+            logger.warning(f"⚠️ Não foi possível contar registros de '{table_name}': {e}")
+            return None
+
+    def get_data_incremental(self, table_name: str, columns: list[str] | tuple[str, ...] | None = None,
+                             watermark_column: str = "id", page_size: int = DEFAULT_PAGE_SIZE) -> pd.DataFrame:
+        """
+        Lê uma tabela somente-inserção buscando apenas os registros novos.
+
+        Mantém em memória o último DataFrame de cada tenant/tabela e, nas próximas
+        leituras, pede só os registros com `watermark_column` maior que o último
+        já carregado. Se a contagem no servidor não bater com a snapshot (houve
+        exclusão, inclusive por outro processo), faz uma ressincronização completa.
+
+        Args:
+            table_name: Tabela de histórico (somente inserções)
+            columns: Colunas a selecionar (None = todas); a coluna da marca d'água é incluída
+            watermark_column: Coluna crescente usada como marca d'água
+            page_size: Tamanho de página das leituras
+
+        Returns:
+            DataFrame com todos os registros da tabela
+        """
+        cacheable, scope = self._cache_scope(table_name)
+        if not cacheable:
+            return self.get_data(table_name, columns=columns, page_size=page_size)
+
+        if columns and watermark_column not in columns:
+            columns = (*columns, watermark_column)
+        query_key = tuple(columns) if columns else None
+
+        store = get_snapshot_store()
+        snapshot = store.get(scope, table_name, query_key)
+
+        if snapshot is not None:
+            snapshot_df, watermark = snapshot
+            after = (watermark_column, watermark) if watermark is not None else None
+            delta_chunks = list(self.iter_data(
+                table_name, columns=columns, page_size=page_size,
+                order_by=watermark_column, after=after))
+
+            if delta_chunks:
+                merged_df = pd.concat([snapshot_df, *delta_chunks], ignore_index=True)
+            else:
+                merged_df = snapshot_df
+
+            server_count = self.count_rows(table_name)
+            if server_count is None or server_count == len(merged_df):
+                if delta_chunks:
+                    store.set(scope, table_name, query_key, merged_df,
+                              merged_df[watermark_column].max())
+                    logger.info(
+                        f"🔁 '{table_name}': {len(merged_df) - len(snapshot_df)} novo(s) registro(s) sincronizado(s)")
+                return merged_df.copy()
+
+            logger.info(
+                f"🔄 '{table_name}': contagem divergente ({server_count} != {len(merged_df)}), ressincronizando")
+
+        df = self.get_data(table_name, columns=columns, page_size=page_size)
+        if df.empty or watermark_column in df.columns:
+            watermark = df[watermark_column].max() if not df.empty else None
+            store.set(scope, table_name, query_key, df, watermark)
+        return df.copy()
+
+    def get_latest_per_key(self, table_name: str, key_column: str, date_column: str) -> pd.DataFrame:
+        """
+        Retorna apenas o registro mais recente de cada chave (ex.: um por equipamento).
+
+        A seleção é feita no banco pela função RPC `get_latest_per_key`
+        (DISTINCT ON), então só uma linha por equipamento trafega. Se a função
+        ainda não estiver instalada no projeto Supabase, faz a mesma seleção
+        localmente a partir da leitura paginada.
+
+        Args:
+            table_name: Nome da tabela de histórico
+            key_column: Coluna que identifica o equipamento (ex.: 'id_equipamento')
+            date_column: Coluna de data usada para escolher o registro mais recente
+
+        Returns:
+            DataFrame com um registro por chave
+        """
+        allowed, user_filter = self._resolve_read_scope(table_name)
+        if not allowed:
+            return pd.DataFrame()
+
+        try:
+            data = []
+            start = 0
+            while True:
+                # O limite de linhas do PostgREST (max-rows) também vale para RPC: lê em páginas.
+                # A função já devolve as linhas ordenadas pela chave (DISTINCT ON ... ORDER BY),
+                # o que mantém as páginas estáveis; o resultado setof jsonb não expõe a
+                # coluna da chave para um .order() do PostgREST
+                response = self.client.rpc(LATEST_PER_KEY_RPC, {
+                    "p_table": table_name,
+                    "p_key_column": key_column,
+                    "p_date_column": date_column,
+                    "p_user_id": user_filter
+                }).range(start, start + DEFAULT_PAGE_SIZE - 1).execute()
+                page = getattr(response, 'data', None) or []
+                data.extend(page)
+                if len(page) < DEFAULT_PAGE_SIZE:
+                    break
+                start += DEFAULT_PAGE_SIZE
+            logger.info(f"✅ {len(data)} registros mais recentes lidos de '{table_name}' (por '{key_column}')")
+            return pd.DataFrame(data)
+        except Exception as e:
+            logger.warning(
+                f"⚠️ RPC '{LATEST_PER_KEY_RPC}' indisponível para '{table_name}', filtrando localmente: {e}")
+
+        df = self.get_data(table_name, page_size=DEFAULT_PAGE_SIZE)
+        if df.empty or key_column not in df.columns or date_column not in df.columns:
+            return df
+
+        sort_key = pd.to_datetime(df[date_column], errors='coerce')
+        return (df.assign(_sort_key=sort_key)
+                  .sort_values('_sort_key', ascending=False, na_position='last')
+                  .drop_duplicates(subset=key_column, keep='first')
+                  .drop(columns='_sort_key')
+                  .reset_index(drop=True))
+
+    def _prepare_insert(self, table_name: str, data: dict | list[dict]):
+        """Aplica o controle de acesso e injeta o user_id nos registros a inserir."""
+        # 🔒 CONTROLE DE ACESSO E INJEÇÃO DE user_id
+        if table_name in GLOBAL_TABLES:
+            # Tabelas globais - apenas superuser pode acessar
+            if not self._is_superuser():
+                raise ValueError(f"❌ Acesso negado: apenas superuser pode acessar tabela global '{table_name}'")
+            else:
+                logger.info(f"👑 Superuser salvando em tabela global '{table_name}'")
+        else:
+            # Tabelas normais - injeta user_id
+            if not self.user_id:
+                raise ValueError("❌ Usuário não identificado. Impossível salvar dados.")
+            
+            # Se não for superuser, injeta user_id
+            if not self._is_superuser():
+                if isinstance(data, list):
+                    for record in data:
+                        record['user_id'] = self.user_id
+                else:
+                    data['user_id'] = self.user_id
+                
+                logger.info(f"🔒 user_id {self.user_id} injetado nos registros")
+            else:
+                logger.info(f"👑 Superuser salvando dados sem filtro de user_id")
+
     def append_data(self, table_name: str, data: dict | list[dict]):
         """
         Adiciona registros com INJEÇÃO AUTOMÁTICA do user_id.
@@ -272,39 +745,10 @@ class SupabaseClient:
             return None
         
         try:
-            GLOBAL_TABLES = {
-                "usuarios", 
-                "log_auditoria", 
-                "solicitacoes_acesso", 
-                "notificacoes_pendentes", 
-                "solicitacoes_suporte"
-            }
-            
-            # 🔒 CONTROLE DE ACESSO E INJEÇÃO DE user_id
-            if table_name in GLOBAL_TABLES:
-                # Tabelas globais - apenas superuser pode acessar
-                if not self._is_superuser():
-                    raise ValueError(f"❌ Acesso negado: apenas superuser pode acessar tabela global '{table_name}'")
-                else:
-                    logger.info(f"👑 Superuser salvando em tabela global '{table_name}'")
-            else:
-                # Tabelas normais - injeta user_id
-                if not self.user_id:
-                    raise ValueError("❌ Usuário não identificado. Impossível salvar dados.")
-                
-                # Se não for superuser, injeta user_id
-                if not self._is_superuser():
-                    if isinstance(data, list):
-                        for record in data:
-                            record['user_id'] = self.user_id
-                    else:
-                        data['user_id'] = self.user_id
-                    
-                    logger.info(f"🔒 user_id {self.user_id} injetado nos registros")
-                else:
-                    logger.info(f"👑 Superuser salvando dados sem filtro de user_id")
+            self._prepare_insert(table_name, data)
             
             response = self.client.table(table_name).insert(data).execute()
+            self.invalidate_cache(table_name)
             
             count = len(data) if isinstance(data, list) else 1
             logger.info(f"✅ {count} registro(s) inserido(s) em '{table_name}'")
@@ -316,14 +760,117 @@ class SupabaseClient:
             st.error(f"Erro ao salvar dados em '{table_name}': {e}")
             raise
 
+    def bulk_insert(self, table_name: str, records: list[dict],
+                    chunk_size: int = DEFAULT_INSERT_CHUNK_SIZE, on_progress=None) -> tuple[int, list[tuple[dict, str]]]:
+        """
+        Insere muitos registros em lotes, isolando as falhas por lote.
+        
+        Cada lote é enviado em uma única requisição. Se o PostgREST rejeitar um
+        lote (4xx), ele é dividido ao meio repetidamente até isolar os registros
+        com erro; os demais registros do lote são gravados normalmente. Erros que
+        valem para o lote inteiro (permissão/RLS, tabela inexistente, ou o mesmo
+        erro nas duas metades) rejeitam o lote sem continuar a divisão. Erros de
+        rede, timeouts e 5xx repetem o lote inteiro até BULK_INSERT_MAX_RETRIES
+        vezes; se persistirem, a inserção é interrompida e os registros ainda
+        não gravados são devolvidos como falhas.
+        
+        Args:
+            table_name: Nome da tabela
+            records: Lista de dicionários para inserir
+            chunk_size: Quantidade de registros por requisição
+            on_progress: Função opcional (processados, total) chamada após cada lote
+            
+        Returns:
+            Tupla (quantidade_inserida, [(registro, mensagem_de_erro), ...])
+        """
+        if not records:
+            return 0, []
+
+        # Erros de acesso/identificação valem para o lote inteiro
+        self._prepare_insert(table_name, records)
+
+        total = len(records)
+        inserted = 0
+        failed = []
+
+        outage_error = None
+
+        def fail_records(chunk):
+            failed.extend((record, str(outage_error)) for record in chunk)
+
+        def reject(chunk, error):
+            failed.extend((record, str(error)) for record in chunk)
+
+        def send(chunk):
+            """Envia o lote; retorna o erro 4xx do PostgREST ou None (gravado ou interrompido)."""
+            nonlocal inserted, outage_error
+            if outage_error is not None:
+                fail_records(chunk)
+                return None
+            for attempt in range(BULK_INSERT_MAX_RETRIES):
+                try:
+                    # missing=default: colunas ausentes usam o default da tabela, como na inserção individual
+                    self.client.table(table_name).insert(
+                        chunk, returning=ReturnMethod.minimal, default_to_null=False).execute()
+                    inserted += len(chunk)
+                    return None
+                except Exception as e:
+                    if is_record_error(e):
+                        return e
+
+                    # Rede, timeout ou 5xx: repete o lote inteiro
+                    logger.warning(f"⚠️ Tentativa {attempt + 1}/{BULK_INSERT_MAX_RETRIES} do lote em "
+                                   f"'{table_name}' falhou: {e}")
+                    last_error = e
+                    if attempt < BULK_INSERT_MAX_RETRIES - 1:
+                        time.sleep(BULK_INSERT_RETRY_DELAY_SECONDS)
+
+            outage_error = last_error
+            logger.error(f"❌ Inserção em lote em '{table_name}' interrompida: {outage_error}")
+            fail_records(chunk)
+            return None
+
+        def isolate(chunk, error):
+            """Divide um lote rejeitado (4xx) ao meio até isolar os registros com erro."""
+            if len(chunk) == 1 or str(error.code) in CHUNK_ERROR_CODES:
+                logger.warning(f"⚠️ {len(chunk)} registro(s) rejeitado(s) em '{table_name}': {error}")
+                reject(chunk, error)
+                return
+            middle = len(chunk) // 2
+            halves = (chunk[:middle], chunk[middle:])
+            errors = [send(half) for half in halves]
+            if all(half_error is not None and _same_error(half_error, error) for half_error in errors):
+                # As duas metades falham com o erro do lote: o erro não depende dos registros
+                logger.warning(f"⚠️ {len(chunk)} registro(s) rejeitado(s) em '{table_name}': {error}")
+                reject(chunk, error)
+                return
+            for half, half_error in zip(halves, errors):
+                if half_error is not None:
+                    isolate(half, half_error)
+
+        def insert_chunk(chunk):
+            error = send(chunk)
+            if error is not None:
+                isolate(chunk, error)
+
+        for start in range(0, total, chunk_size):
+            insert_chunk(records[start:start + chunk_size])
+            if outage_error is not None:
+                # Servidor indisponível: os lotes seguintes falhariam da mesma forma
+                fail_records(records[start + chunk_size:])
+                break
+            if on_progress is not None:
+                on_progress(min(start + chunk_size, total), total)
+
+        if inserted:
+            self.invalidate_cache(table_name)
+
+        logger.info(f"✅ {inserted}/{total} registro(s) inserido(s) em lote em '{table_name}'")
+        return inserted, failed
+
     def update_data(self, table_name: str, data: dict, filter_column: str, filter_value):
         """Atualiza registros na tabela com segurança multi-tenant."""
         try:
-            GLOBAL_TABLES = {
-                "usuarios", "log_auditoria", "solicitacoes_acesso", 
-                "notificacoes_pendentes", "solicitacoes_suporte"
-            }
-            
             query = self.client.table(table_name).update(data)
             
             if table_name in GLOBAL_TABLES:
@@ -345,6 +892,7 @@ class SupabaseClient:
                     logger.info(f"👑 Superuser atualizando dados sem filtro de user_id")
             
             response = query.eq(filter_column, filter_value).execute()
+            self.invalidate_cache(table_name, resync=True)
             logger.info(f"✅ Registro atualizado em '{table_name}'")
             return response
             
@@ -356,11 +904,6 @@ class SupabaseClient:
     def delete_data(self, table_name: str, filter_column: str, filter_value):
         """Remove registros da tabela com segurança multi-tenant."""
         try:
-            GLOBAL_TABLES = {
-                "usuarios", "log_auditoria", "solicitacoes_acesso", 
-                "notificacoes_pendentes", "solicitacoes_suporte"
-            }
-            
             query = self.client.table(table_name).delete()
             
             if table_name in GLOBAL_TABLES:
@@ -382,6 +925,7 @@ class SupabaseClient:
                     logger.info(f"👑 Superuser excluindo dados sem filtro de user_id")
             
             response = query.eq(filter_column, filter_value).execute()
+            self.invalidate_cache(table_name, resync=True)
             logger.info(f"✅ Registro deletado de '{table_name}'")
             return response
             
@@ -410,7 +954,6 @@ def get_supabase_client() -> SupabaseClient | None:
         # Verifica se há uma inicialização em andamento para evitar loops
         if 'supabase_client_initializing' in st.session_state:
             # Verifica se a inicialização está travada (mais de 30 segundos)
-            import time
             current_time = time.time()
             init_start_time = st.session_state.get('supabase_client_init_start_time', current_time)
             
@@ -434,7 +977,6 @@ def get_supabase_client() -> SupabaseClient | None:
         logger.info("🔄 Inicializando cliente Supabase...")
         
         # Timeout para evitar carregamento infinito
-        import time
         start_time = time.time()
         timeout_seconds = 30  # 30 segundos de timeout
         
@@ -0,0 +1,48 @@
+# tests/bench_shelter_status.py
+
+"""
+Benchmark de get_shelter_status_df (vetorizado) contra o laço original.
+
+Uso: python tests/bench_shelter_status.py
+
+Gera abrigos e inspeções sintéticos (até 10 mil abrigos / 80 mil inspeções),
+confere que as duas implementações produzem o mesmo DataFrame e imprime os tempos.
+"""
+
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.legacy_status import legacy_shelter_status_df  # noqa: E402
+from tests.synthetic_data import make_shelter_data  # noqa: E402
+from views.dashboard import get_shelter_status_df  # noqa: E402
+
+SIZES = [(10, 40), (300, 3000), (10000, 80000)]
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    print(f"{'abrigos':>8} {'inspeções':>10} {'original (s)':>13} {'vetorizado (s)':>15} {'ganho':>7}")
+    for n_shelters, n_inspections in SIZES:
+        shelters, inspections = make_shelter_data(n_shelters, n_inspections)
+
+        # As duas implementações convertem data_inspecao no próprio DataFrame recebido
+        expected, legacy_seconds = _timed(legacy_shelter_status_df, shelters, inspections.copy())
+        result, vectorized_seconds = _timed(get_shelter_status_df, shelters, inspections.copy())
+        pd.testing.assert_frame_equal(result.astype(str), expected.astype(str))
+
+        print(f"{n_shelters:>8} {n_inspections:>10} {legacy_seconds:>13.3f} {vectorized_seconds:>15.3f} "
+              f"{legacy_seconds / max(vectorized_seconds, 1e-9):>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+# tests/conftest.py
+
+import os
+import sys
+
+# Permite importar os pacotes do aplicativo (views, operations, ...) a partir da raiz do repositório
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
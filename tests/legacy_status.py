@@ -0,0 +1,189 @@
+# tests/legacy_status.py
+
+"""
+Implementações originais (laço por equipamento) dos cálculos de status do
+dashboard, mantidas apenas como referência para o teste de regressão e o
+benchmark das versões vetorizadas em views/dashboard.py.
+"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+from dateutil.relativedelta import relativedelta
+
+
+def legacy_shelter_status_df(df_shelters_registered, df_inspections):
+    if df_shelters_registered.empty:
+        return pd.DataFrame()
+
+    latest_inspections_list = []
+    if not df_inspections.empty:
+        df_inspections['data_inspecao'] = pd.to_datetime(
+            df_inspections['data_inspecao'], errors='coerce').dt.date
+
+        for shelter_id in df_shelters_registered['id_abrigo'].unique():
+            shelter_inspections = df_inspections[df_inspections['id_abrigo'] == shelter_id].copy(
+            )
+            if not shelter_inspections.empty:
+                shelter_inspections = shelter_inspections.sort_values(
+                    by='data_inspecao', ascending=False)
+
+                latest_date = shelter_inspections['data_inspecao'].iloc[0]
+                inspections_on_latest_date = shelter_inspections[
+                    shelter_inspections['data_inspecao'] == latest_date]
+
+                approved_on_latest = inspections_on_latest_date[
+                    inspections_on_latest_date['status_geral'] != 'Reprovado com Pendências']
+
+                if not approved_on_latest.empty:
+                    latest_inspections_list.append(approved_on_latest.iloc[0])
+                else:
+                    latest_inspections_list.append(
+                        inspections_on_latest_date.iloc[0])
+
+    latest_inspections = pd.DataFrame(latest_inspections_list)
+
+    if not latest_inspections.empty:
+        dashboard_df = pd.merge(df_shelters_registered[[
+                                'id_abrigo', 'cliente', 'local']], latest_inspections, on='id_abrigo', how='left')
+    else:
+
+        dashboard_df = df_shelters_registered.copy()
+        for col in ['data_inspecao', 'data_proxima_inspecao', 'status_geral', 'inspetor', 'resultados_json']:
+            dashboard_df[col] = None
+
+    today = pd.to_datetime(date.today()).date()
+    dashboard_df['data_proxima_inspecao'] = pd.to_datetime(
+        dashboard_df['data_proxima_inspecao'], errors='coerce').dt.date
+
+    conditions = [
+        (dashboard_df['data_inspecao'].isna()),
+        (dashboard_df['data_proxima_inspecao'] < today),
+        (dashboard_df['status_geral'] == 'Reprovado com Pendências')
+    ]
+    choices = ['🔵 PENDENTE (Nova Inspeção)', '🔴 VENCIDO', '🟠 COM PENDÊNCIAS']
+    dashboard_df['status_dashboard'] = np.select(
+        conditions, choices, default='🟢 OK')
+
+
+    dashboard_df['inspetor'] = dashboard_df['inspetor'].fillna('N/A')
+    dashboard_df['resultados_json'] = dashboard_df['resultados_json'].fillna(
+        '{}')
+
+    display_columns = ['id_abrigo', 'status_dashboard', 'data_inspecao_str',
+                       'data_proxima_inspecao_str', 'status_geral', 'inspetor', 'resultados_json', 'local']
+    existing_columns = [
+        col for col in display_columns if col in dashboard_df.columns]
+
+    return dashboard_df[existing_columns]
+
+
+def legacy_consolidated_status_df(df_full, df_locais):
+    if df_full.empty:
+        return pd.DataFrame()
+
+    from operations.extinguisher_disposal_operations import get_disposed_extinguishers
+
+    consolidated_data = []
+    df_copy = df_full.copy()
+    df_copy['data_servico'] = pd.to_datetime(
+        df_copy['data_servico'], errors='coerce')
+    df_copy = df_copy.dropna(subset=['data_servico'])
+
+    df_disposed = get_disposed_extinguishers()
+    disposed_ids = df_disposed['numero_identificacao'].tolist(
+    ) if not df_disposed.empty else []
+
+    unique_ids = df_copy['numero_identificacao'].unique()
+
+    for ext_id in unique_ids:
+        if ext_id in disposed_ids:
+            continue
+
+        ext_df = df_copy[df_copy['numero_identificacao']
+                         == ext_id].sort_values(by='data_servico')
+        if ext_df.empty:
+            continue
+
+        latest_record_info = ext_df.iloc[-1]
+
+        last_insp_date = ext_df['data_servico'].max()
+        last_maint2_date = ext_df[ext_df['tipo_servico']
+                                  == 'Manutenção Nível 2']['data_servico'].max()
+        last_maint3_date = ext_df[ext_df['tipo_servico']
+                                  == 'Manutenção Nível 3']['data_servico'].max()
+
+        dates_that_renew_inspection = [
+            last_insp_date, last_maint2_date, last_maint3_date]
+        valid_dates_inspection = [
+            d for d in dates_that_renew_inspection if pd.notna(d)]
+        if valid_dates_inspection:
+            most_recent_inspection_renewal = max(valid_dates_inspection)
+            next_insp = most_recent_inspection_renewal + \
+                relativedelta(months=1)
+        else:
+            next_insp = pd.NaT
+
+        dates_that_renew_n2 = [last_maint2_date, last_maint3_date]
+        valid_dates_n2 = [d for d in dates_that_renew_n2 if pd.notna(d)]
+        if valid_dates_n2:
+            most_recent_n2_renewal = max(valid_dates_n2)
+            next_maint2 = most_recent_n2_renewal + relativedelta(months=12)
+        else:
+            next_maint2 = pd.NaT
+
+        if pd.notna(last_maint3_date):
+            next_maint3 = last_maint3_date + relativedelta(years=5)
+        else:
+            next_maint3 = pd.NaT
+
+        vencimentos = [d for d in [next_insp,
+                                   next_maint2, next_maint3] if pd.notna(d)]
+        if not vencimentos:
+            continue
+        proximo_vencimento_real = min(vencimentos)
+
+        today_ts = pd.Timestamp(date.today())
+        status_atual = "OK"
+
+        if latest_record_info.get('plano_de_acao') == "FORA DE OPERAÇÃO (SUBSTITUÍDO)":
+            status_atual = "FORA DE OPERAÇÃO"
+        elif latest_record_info.get('aprovado_inspecao') == 'Não':
+            status_atual = "NÃO CONFORME (Aguardando Ação)"
+        elif proximo_vencimento_real < today_ts:
+            status_atual = "VENCIDO"
+
+        # Verifica se o equipamento está fora de operação por substituição ou baixa definitiva
+        plano_de_acao_upper = str(latest_record_info.get('plano_de_acao', '')).upper()
+        if "FORA DE OPERAÇÃO" in plano_de_acao_upper or "BAIXADO DEFINITIVAMENTE" in plano_de_acao_upper:
+            continue
+
+        consolidated_data.append({
+            'numero_identificacao': ext_id,
+            'numero_selo_inmetro': latest_record_info.get('numero_selo_inmetro'),
+            'tipo_agente': latest_record_info.get('tipo_agente'),
+            'status_atual': status_atual,
+            'proximo_vencimento_geral': proximo_vencimento_real,
+            'prox_venc_inspecao': next_insp if pd.notna(next_insp) else pd.NaT,
+            'prox_venc_maint2': next_maint2 if pd.notna(next_maint2) else pd.NaT,
+            'prox_venc_maint3': next_maint3 if pd.notna(next_maint3) else pd.NaT,
+            'plano_de_acao': latest_record_info.get('plano_de_acao'),
+        })
+
+    if not consolidated_data:
+        return pd.DataFrame()
+
+    dashboard_df = pd.DataFrame(consolidated_data)
+    if not df_locais.empty:
+        df_locais = df_locais.rename(columns={'id': 'numero_identificacao'})
+        df_locais['numero_identificacao'] = df_locais['numero_identificacao'].astype(
+            str)
+        dashboard_df = pd.merge(dashboard_df, df_locais[[
+                                'numero_identificacao', 'local']], on='numero_identificacao', how='left')
+        dashboard_df['status_instalacao'] = dashboard_df['local'].apply(
+            lambda x: f"✅ {x}" if pd.notna(x) and str(x).strip() != '' else "⚠️ Local não definido")
+    else:
+        dashboard_df['status_instalacao'] = "⚠️ Local não definido"
+
+    return dashboard_df
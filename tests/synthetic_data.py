@@ -0,0 +1,60 @@
+# tests/synthetic_data.py
+
+"""Dados sintéticos para os testes e benchmarks dos cálculos de status do dashboard."""
+
+import numpy as np
+import pandas as pd
+
+
+def make_extinguisher_history(n_extinguishers: int, n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """Histórico sintético com uma data por extintor (empates de data são tratados de forma diferente)."""
+    rng = np.random.default_rng(seed)
+    ids = rng.integers(0, n_extinguishers, n_rows)
+    dates = pd.Timestamp("2019-01-31") + pd.to_timedelta(rng.integers(0, 2500, n_rows), unit="D")
+    df = pd.DataFrame({
+        "numero_identificacao": [f"E{i}" for i in ids],
+        "data_servico": dates.strftime("%Y-%m-%d"),
+        "tipo_servico": rng.choice(
+            ["Inspeção", "Manutenção Nível 2", "Manutenção Nível 3", "Substituição"], n_rows,
+            p=[.8, .1, .05, .05]),
+        "aprovado_inspecao": rng.choice(["Sim", "Não", None], n_rows, p=[.85, .1, .05]),
+        "plano_de_acao": rng.choice(
+            ["Manter", "FORA DE OPERAÇÃO (SUBSTITUÍDO)", "Baixado definitivamente", None], n_rows,
+            p=[.9, .04, .03, .03]),
+        "numero_selo_inmetro": rng.integers(1000, 9999, n_rows),
+        "tipo_agente": rng.choice(["PQS", "CO2"], n_rows),
+    })
+    df = df.drop_duplicates(["numero_identificacao", "data_servico"]).reset_index(drop=True)
+    # Datas inválidas são descartadas pelas duas implementações
+    df.loc[rng.integers(0, len(df), 5), "data_servico"] = "bad"
+    return df
+
+
+def make_shelter_data(n_shelters: int, n_inspections: int, seed: int = 0) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Abrigos cadastrados e histórico de inspeções sintéticos.
+
+    Inclui inspeções de abrigos não cadastrados e inspeções aprovadas e com
+    pendências na mesma data, que exercitam a regra de desempate. Duplicatas
+    exatas (abrigo, data, status) são removidas: entre elas o laço original
+    escolhe uma linha arbitrária (ordenação instável).
+    """
+    rng = np.random.default_rng(seed)
+    shelters = pd.DataFrame({
+        "id_abrigo": [f"A{i}" for i in range(n_shelters)],
+        "cliente": "Cliente",
+        "local": [f"Local {i}" for i in range(n_shelters)],
+    })
+    ids = rng.integers(0, n_shelters + 20, n_inspections)
+    dates = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 300, n_inspections), unit="D")
+    inspections = pd.DataFrame({
+        "id_abrigo": [f"A{i}" for i in ids],
+        "data_inspecao": dates.strftime("%Y-%m-%d"),
+        "data_proxima_inspecao": (dates + pd.Timedelta(days=30)).strftime("%Y-%m-%d"),
+        "status_geral": rng.choice(["Aprovado", "Reprovado com Pendências"], n_inspections),
+        "inspetor": rng.choice(["Inspetor", None], n_inspections),
+        "resultados_json": [f'{{"item": {k}}}' for k in range(n_inspections)],
+    })
+    inspections = inspections.drop_duplicates(
+        ["id_abrigo", "data_inspecao", "status_geral"]).reset_index(drop=True)
+    return shelters, inspections
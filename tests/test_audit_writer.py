@@ -0,0 +1,40 @@
+# tests/test_audit_writer.py
+
+"""
+Gravador assíncrono do log de auditoria: erros de disco no spool local não
+podem encerrar a thread de gravação.
+"""
+
+import time
+
+from utils.audit_writer import AuditLogWriter
+
+
+def _wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return condition()
+
+
+def test_writer_survives_unopenable_spool_lock(tmp_path):
+    spool_path = str(tmp_path / "spool.jsonl")
+    # Um diretório no lugar do arquivo de lock: abrir <spool>.lock gera OSError
+    (tmp_path / "spool.jsonl.lock").mkdir()
+
+    writer = AuditLogWriter(batch_size=1, flush_interval=0.05, spool_path=spool_path)
+    written = []
+    writer._insert = written.extend
+    try:
+        writer.enqueue({"acao": "primeira"})
+        assert _wait_for(lambda: len(written) == 1)
+
+        writer.enqueue({"acao": "segunda"})
+        assert _wait_for(lambda: len(written) == 2)
+        assert writer._thread.is_alive()
+        assert writer._queue.empty()
+    finally:
+        writer._stop_event.set()
+        writer._thread.join(timeout=1)
@@ -0,0 +1,124 @@
+# tests/test_bulk_insert.py
+
+"""
+SupabaseClient.bulk_insert contra uma tabela falsa do PostgREST: isolamento de
+registros rejeitados (4xx), repetição em erros de rede/5xx e rejeição do lote
+inteiro quando o erro não depende dos registros.
+"""
+
+import httpx
+import pytest
+from postgrest.exceptions import APIError
+
+import supabase_local.client as supabase_client
+
+
+class FakeTable:
+    """Tabela que grava os lotes ou levanta o erro devolvido por fail(chunk, chamada)."""
+
+    def __init__(self, fail):
+        self.fail = fail
+        self.calls = 0
+        self.rows = []
+        self._chunk = None
+
+    def insert(self, chunk, **kwargs):
+        self._chunk = chunk
+        return self
+
+    def execute(self):
+        self.calls += 1
+        error = self.fail(self._chunk, self.calls)
+        if error is not None:
+            raise error
+        self.rows.extend(self._chunk)
+
+
+@pytest.fixture
+def make_client(monkeypatch):
+    monkeypatch.setattr(supabase_client, "BULK_INSERT_RETRY_DELAY_SECONDS", 0)
+
+    def factory(fail):
+        table = FakeTable(fail)
+        client = supabase_client.SupabaseClient.__new__(supabase_client.SupabaseClient)
+        client.client = type("FakeSupabase", (), {"table": lambda self, name: table})()
+        client._prepare_insert = lambda table_name, records: None
+        client.invalidate_cache = lambda table_name: None
+        return client, table
+
+    return factory
+
+
+RECORDS = [{"id": i} for i in range(1000)]
+
+
+def test_rejected_record_is_isolated(make_client):
+    def fail(chunk, call):
+        if any(record["id"] == 10 for record in chunk):
+            return APIError({"code": "23514", "message": "check", "details": "Failing row contains (10)"})
+
+    client, table = make_client(fail)
+    inserted, failed = client.bulk_insert("t", RECORDS, chunk_size=100)
+
+    assert inserted == 999
+    assert [record["id"] for record, _ in failed] == [10]
+
+
+def test_scattered_duplicates_keep_bisecting(make_client):
+    # Mesmo código, detalhes diferentes: erros de registros distintos, não do lote
+    def fail(chunk, call):
+        duplicated = [record["id"] for record in chunk if record["id"] in (3, 60)]
+        if duplicated:
+            return APIError({"code": "23505", "message": "duplicate key",
+                             "details": f"Key (id)=({duplicated[0]}) already exists."})
+
+    client, table = make_client(fail)
+    inserted, failed = client.bulk_insert("t", RECORDS[:100], chunk_size=100)
+
+    assert inserted == 98
+    assert sorted(record["id"] for record, _ in failed) == [3, 60]
+
+
+@pytest.mark.parametrize("code", ["42501", "PGRST205"])
+def test_chunk_level_error_is_not_bisected(make_client, code):
+    client, table = make_client(lambda chunk, call: APIError({"code": code, "message": "denied"}))
+    inserted, failed = client.bulk_insert("t", RECORDS, chunk_size=500)
+
+    assert inserted == 0
+    assert len(failed) == 1000
+    assert table.calls == 2
+
+
+def test_same_error_in_both_halves_stops_bisecting(make_client):
+    client, table = make_client(lambda chunk, call: APIError({"code": "PGRST204", "message": "no column"}))
+    inserted, failed = client.bulk_insert("t", RECORDS, chunk_size=500)
+
+    assert inserted == 0
+    assert len(failed) == 1000
+    # Por lote: a requisição original e uma por metade
+    assert table.calls == 6
+
+
+def test_server_error_retries_whole_chunk(make_client):
+    def fail(chunk, call):
+        if call == 1:
+            return APIError({"code": 502, "message": "JSON could not be generated"})
+
+    client, table = make_client(fail)
+    inserted, failed = client.bulk_insert("t", RECORDS, chunk_size=100)
+
+    assert (inserted, failed) == (1000, [])
+    assert table.calls == 11
+
+
+def test_outage_stops_insert(make_client):
+    def fail(chunk, call):
+        if call > 2:
+            return httpx.ConnectError("down")
+
+    client, table = make_client(fail)
+    inserted, failed = client.bulk_insert("t", RECORDS, chunk_size=100)
+
+    assert inserted == 200
+    assert len(failed) == 800
+    assert table.calls == 2 + supabase_client.BULK_INSERT_MAX_RETRIES
@@ -0,0 +1,68 @@
+# tests/test_dashboard_status.py
+
+"""
+Regressão dos cálculos de status do dashboard: as versões vetorizadas em
+views/dashboard.py devem produzir o mesmo resultado das implementações
+originais (tests/legacy_status.py) em dados sintéticos.
+"""
+
+import pandas as pd
+import pytest
+
+from tests.legacy_status import legacy_consolidated_status_df, legacy_shelter_status_df
+from tests.synthetic_data import make_extinguisher_history, make_shelter_data
+
+# views.dashboard importa a página inteira (streamlit_js_eval, cv2, Gemini...): sem as
+# dependências do requirements.txt o módulo é ignorado em vez de falhar
+dashboard = pytest.importorskip("views.dashboard")
+
+DISPOSED_IDS = ["E7"]
+
+
+@pytest.fixture
+def disposed_extinguishers(monkeypatch):
+    import operations.extinguisher_disposal_operations as disposal
+
+    monkeypatch.setattr(disposal, "get_disposed_extinguishers",
+                        lambda: pd.DataFrame({"numero_identificacao": DISPOSED_IDS}))
+
+
+@pytest.mark.parametrize("n_extinguishers, n_rows, seed", [(20, 100, 0), (300, 3000, 1), (50, 5000, 2)])
+def test_consolidated_status_matches_legacy(disposed_extinguishers, n_extinguishers, n_rows, seed):
+    history = make_extinguisher_history(n_extinguishers, n_rows, seed)
+    locais = pd.DataFrame({"id": ["E1", "E2", "E3"], "local": ["Almoxarifado", "", None]})
+
+    expected = legacy_consolidated_status_df(history, locais.copy())
+    result = dashboard.get_consolidated_status_df(history, locais.copy())
+
+    assert not result.empty
+    assert "E7" not in set(result["numero_identificacao"])
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_consolidated_status_without_locations(disposed_extinguishers):
+    history = make_extinguisher_history(30, 300, seed=3)
+
+    expected = legacy_consolidated_status_df(history, pd.DataFrame())
+    result = dashboard.get_consolidated_status_df(history, pd.DataFrame())
+
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_consolidated_status_empty_history(disposed_extinguishers):
+    history = make_extinguisher_history(5, 20).iloc[:0]
+
+    assert dashboard.get_consolidated_status_df(history, pd.DataFrame()).empty
+    assert legacy_consolidated_status_df(history, pd.DataFrame()).empty
+
+
+@pytest.mark.parametrize("n_shelters, n_inspections, seed", [(10, 40, 0), (300, 3000, 1)])
+def test_shelter_status_matches_legacy(n_shelters, n_inspections, seed):
+    shelters, inspections = make_shelter_data(n_shelters, n_inspections, seed)
+
+    # As duas implementações convertem data_inspecao no próprio DataFrame recebido
+    expected = legacy_shelter_status_df(shelters, inspections.copy())
+    result = dashboard.get_shelter_status_df(shelters, inspections.copy())
+
+    pd.testing.assert_frame_equal(result.astype(str), expected.astype(str))
+
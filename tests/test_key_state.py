@@ -0,0 +1,80 @@
+# tests/test_key_state.py
+
+"""
+Estado compartilhado das chaves do Gemini no backend SQLite local: incrementos
+atômicos entre conexões, cooldown que mantém o maior valor e reset.
+"""
+
+import threading
+
+import pytest
+
+# AI/__init__ importa o SDK do Gemini: sem as dependências do requirements.txt o módulo é ignorado
+key_state = pytest.importorskip("AI.key_state")
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "key_state.sqlite3")
+
+
+def test_concurrent_record_usage_increments(db_path):
+    n_threads, n_calls = 8, 25
+
+    def worker():
+        # Uma instância por thread, como processos diferentes no mesmo arquivo
+        backend = key_state.SQLiteKeyStateBackend(db_path)
+        for _ in range(n_calls):
+            backend.record_usage("key-a", requests=1, tokens=10)
+
+    threads = [threading.Thread(target=worker) for _ in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    state = key_state.SQLiteKeyStateBackend(db_path).load()["key-a"]
+    assert state["usage_count"] == n_threads * n_calls
+    assert state["tokens_used"] == n_threads * n_calls * 10
+
+
+def test_failure_count_never_negative(db_path):
+    backend = key_state.SQLiteKeyStateBackend(db_path)
+    backend.record_usage("key-a", failures=1)
+    backend.record_usage("key-a", failures=-1)
+    backend.record_usage("key-a", failures=-1)
+
+    assert backend.load()["key-a"]["failure_count"] == 0
+
+
+def test_set_cooldown_keeps_larger_value(db_path):
+    backend = key_state.SQLiteKeyStateBackend(db_path)
+    backend.set_cooldown("key-a", 2000.0)
+    backend.set_cooldown("key-a", 1000.0)
+    assert backend.load()["key-a"]["cooldown_until"] == 2000.0
+
+    backend.set_cooldown("key-a", 3000.0)
+    assert backend.load()["key-a"]["cooldown_until"] == 3000.0
+
+
+def test_reset_keeps_cooldowns(db_path):
+    backend = key_state.SQLiteKeyStateBackend(db_path)
+    backend.record_usage("key-a", requests=3, tokens=30, failures=2)
+    backend.set_cooldown("key-a", 2000.0)
+
+    backend.reset()
+
+    assert backend.load()["key-a"] == {
+        "usage_count": 0, "failure_count": 0, "tokens_used": 0, "cooldown_until": 2000.0}
+
+
+def test_clear_cooldowns(db_path):
+    backend = key_state.SQLiteKeyStateBackend(db_path)
+    backend.record_usage("key-a", requests=3)
+    backend.set_cooldown("key-a", 2000.0)
+
+    backend.clear_cooldowns()
+
+    state = backend.load()["key-a"]
+    assert state["cooldown_until"] == 0
+    assert state["usage_count"] == 3
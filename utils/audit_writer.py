@@ -0,0 +1,241 @@
+# utils/audit_writer.py
+
+"""
+Gravação assíncrona do log de auditoria.
+
+log_action apenas enfileira o registro; uma thread em segundo plano grava no
+Supabase em lotes (a cada AUDIT_BATCH_SIZE registros ou AUDIT_FLUSH_INTERVAL_SECONDS).
+Se o Supabase estiver indisponível, os registros vão para um arquivo local
+(spool) e são reenviados no próximo envio bem-sucedido. O spool é compartilhado
+pelos processos do host e protegido por um lock de arquivo; registros que o
+Supabase rejeita (4xx) vão para um arquivo de descarte (dead-letter) em vez de
+bloquear o reenvio. A fila é esvaziada no encerramento do processo.
+"""
+
+import atexit
+import json
+import os
+import queue
+import tempfile
+import threading
+import time
+import logging
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: só o lock entre threads do processo
+    fcntl = None
+
+import streamlit as st
+
+from config.table_names import LOG_AUDITORIA_SHEET_NAME
+
+logger = logging.getLogger(__name__)
+
+AUDIT_BATCH_SIZE = 50
+AUDIT_FLUSH_INTERVAL_SECONDS = 5
+AUDIT_SPOOL_PATH = os.path.join(tempfile.gettempdir(), "log_auditoria_spool.jsonl")
+# Registros rejeitados pelo Supabase no reenvio do spool, guardados para análise
+AUDIT_DEAD_LETTER_SUFFIX = ".rejected"
+
+
+class AuditLogWriter:
+    """Fila de registros de auditoria gravada em lote por uma thread em segundo plano."""
+
+    def __init__(self, batch_size: int = AUDIT_BATCH_SIZE,
+                 flush_interval: float = AUDIT_FLUSH_INTERVAL_SECONDS,
+                 spool_path: str = AUDIT_SPOOL_PATH):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.spool_path = spool_path
+        self.dead_letter_path = spool_path + AUDIT_DEAD_LETTER_SUFFIX
+        self._queue: queue.Queue = queue.Queue()
+        self._spool_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="audit-log-writer", daemon=True)
+        self._thread.start()
+
+    def enqueue(self, record: dict):
+        """Enfileira um registro de auditoria (não bloqueia)."""
+        self._queue.put(record)
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                batch = self._collect_batch()
+                if batch:
+                    self._write(batch)
+            except Exception:
+                # Nenhum erro pode encerrar a thread: a auditoria do processo pararia em silêncio
+                logger.exception("ALERTA: Erro inesperado no gravador de auditoria")
+
+    def _collect_batch(self) -> list[dict]:
+        """Aguarda o primeiro registro e junta os seguintes até encher o lote ou o intervalo expirar."""
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _drain(self) -> list[dict]:
+        records = []
+        while True:
+            try:
+                records.append(self._queue.get_nowait())
+            except queue.Empty:
+                return records
+
+    def _insert(self, records: list[dict]):
+        # Thread sem sessão: usa o cliente compartilhado do processo diretamente
+        from supabase_local.client import get_shared_client
+
+        client = get_shared_client(st.secrets["supabase"]["url"], st.secrets["supabase"]["key"])
+        client.table(LOG_AUDITORIA_SHEET_NAME).insert(records).execute()
+
+    def _write(self, batch: list[dict]):
+        with self._flush_lock:
+            try:
+                self._insert(batch)
+            except Exception as e:
+                logger.error(f"ALERTA: Falha ao gravar {len(batch)} registro(s) de auditoria no Supabase. "
+                             f"Gravando no spool local. Erro: {e}")
+                self._spool(batch)
+                return
+            try:
+                self._replay_spool()
+            except OSError as e:
+                # O lote já foi gravado; o spool fica para o próximo envio bem-sucedido
+                logger.error(f"Erro ao reenviar o spool de auditoria: {e}")
+
+    @contextmanager
+    def _locked_spool(self):
+        """Lock do spool entre threads (_spool_lock) e entre processos (lock de arquivo)."""
+        with self._spool_lock, open(self.spool_path + ".lock", "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _append_records(path: str, records: list[dict]):
+        with open(path, "a", encoding="utf-8") as spool_file:
+            for record in records:
+                spool_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def _spool(self, records: list[dict]):
+        """Acrescenta registros ao arquivo local de contingência."""
+        try:
+            with self._locked_spool():
+                self._append_records(self.spool_path, records)
+        except OSError as e:
+            logger.error(f"ALERTA: Registros de auditoria perdidos ({len(records)}). Erro no spool: {e}")
+
+    def _read_spool(self) -> list[dict]:
+        """Lê o spool ignorando linhas corrompidas (ex.: processo encerrado no meio de uma gravação)."""
+        records = []
+        with open(self.spool_path, encoding="utf-8") as spool_file:
+            for line_number, line in enumerate(spool_file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError as e:
+                    logger.error(f"Linha {line_number} do spool de auditoria ignorada (corrompida): {e}")
+        return records
+
+    def _replay_spool(self):
+        """
+        Reenvia os registros do spool local, se houver.
+        
+        Um lote rejeitado pelo Supabase (4xx) é reenviado registro a registro e
+        os registros recusados vão para o descarte; falhas de rede/5xx
+        interrompem o reenvio e mantêm no spool só o que não foi enviado.
+        """
+        from supabase_local.client import is_record_error
+
+        with self._locked_spool():
+            if not os.path.exists(self.spool_path):
+                return
+            try:
+                records = self._read_spool()
+            except OSError as e:
+                logger.error(f"Erro ao ler o spool de auditoria: {e}")
+                return
+
+            position = 0
+            rejected = []
+            try:
+                while position < len(records):
+                    batch = records[position:position + self.batch_size]
+                    try:
+                        self._insert(batch)
+                        position += len(batch)
+                        continue
+                    except Exception as e:
+                        if not is_record_error(e):
+                            raise
+                    for record in batch:
+                        try:
+                            self._insert([record])
+                        except Exception as e:
+                            if not is_record_error(e):
+                                raise
+                            logger.error(f"Registro de auditoria rejeitado pelo Supabase, movido para o descarte: {e}")
+                            rejected.append(record)
+                        position += 1
+            except Exception as e:
+                # Regrava somente o que ainda não foi enviado
+                logger.warning(f"⚠️ Reenvio do spool de auditoria interrompido: {e}")
+                with open(self.spool_path, "w", encoding="utf-8") as spool_file:
+                    for record in records[position:]:
+                        spool_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                return
+            finally:
+                if rejected:
+                    self._append_records(self.dead_letter_path, rejected)
+                    logger.error(f"ALERTA: {len(rejected)} registro(s) de auditoria rejeitado(s) gravado(s) em "
+                                 f"{self.dead_letter_path}")
+
+            os.remove(self.spool_path)
+            logger.info(f"✅ {len(records) - len(rejected)} registro(s) de auditoria reenviado(s) do spool local")
+
+    def flush(self):
+        """Grava imediatamente tudo o que está na fila."""
+        records = self._drain()
+        for start in range(0, len(records), self.batch_size):
+            self._write(records[start:start + self.batch_size])
+
+    def shutdown(self):
+        """Para a thread e grava o que restou na fila (chamado no encerramento do processo)."""
+        self._stop_event.set()
+        self._thread.join(timeout=self.flush_interval + 1)
+        self.flush()
+
+
+_audit_writer: AuditLogWriter | None = None
+_audit_writer_lock = threading.Lock()
+
+
+def get_audit_writer() -> AuditLogWriter:
+    """Retorna o gravador de auditoria do processo, iniciando a thread na primeira chamada."""
+    global _audit_writer
+    with _audit_writer_lock:
+        if _audit_writer is None:
+            _audit_writer = AuditLogWriter()
+            atexit.register(_audit_writer.shutdown)
+        return _audit_writer
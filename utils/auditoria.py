@@ -8,8 +8,8 @@ import logging
 # DE: from gdrive.gdrive_upload import GoogleDriveUploader
 # DE: from gdrive.config import AUDIT_LOG_SHEET_NAME
 # PARA:
-from supabase_local import get_supabase_client
 from auth.auth_utils import get_user_email, get_user_role
+from utils.audit_writer import get_audit_writer
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +23,8 @@ def get_sao_paulo_time_str():
 def log_action(action: str, details: str = "", target_uo: str = None):
     """
     Registra uma ação de usuário no log de auditoria do Supabase.
+    O registro é enfileirado e gravado em lote em segundo plano (utils.audit_writer),
+    sem acrescentar latência à ação do usuário.
     """
     try:
         user_email = get_user_email() or "não logado"
@@ -44,9 +46,8 @@ def log_action(action: str, details: str = "", target_uo: str = None):
             "target_uo": target_uo
         }
 
-        # PARA: Usa o cliente Supabase para inserir o registro
-        db_client = get_supabase_client()
-        db_client.append_data("log_auditoria", log_record)
+        # Enfileira para gravação assíncrona em lote
+        get_audit_writer().enqueue(log_record)
 
     except Exception as e:
         logger.error(
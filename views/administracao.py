@@ -7,6 +7,7 @@ import altair as alt
 # Imports do projeto
 from supabase_local import get_supabase_client
 from auth.auth_utils import get_users_data
+from operations.history import clear_data_cache
 from config.page_config import set_page_config
 from config.table_names import (
     USERS_SHEET_NAME,
@@ -38,11 +39,15 @@ def show_api_key_statistics():
     try:
         key_manager = get_api_key_manager()
         stats = key_manager.get_statistics()
-        col1, col2, col3, col4 = st.columns(4)
+        col1, col2, col3, col4, col5 = st.columns(5)
         col1.metric("Total de Chaves", stats['total_keys'])
         col2.metric("Chaves Disponíveis", stats['available_keys'])
         col3.metric("Chaves em Cooldown", stats['keys_in_cooldown'])
         col4.metric("Estratégia", stats['strategy'])
+        col5.metric("Requisições na Fila", stats['pending_requests'])
+        st.caption(f"Limites por chave: {stats['requests_per_minute']} requisições/min e "
+                   f"{stats['tokens_per_minute']:,} tokens/min".replace(",", ".") +
+                   f" · Estado compartilhado: {stats['state_backend']}")
         st.markdown("---")
         if stats['usage_count']:
             st.markdown("### 📈 Uso Detalhado por Chave")
@@ -51,12 +56,16 @@ def show_api_key_statistics():
                 masked_key = key_manager._mask_key(key)
                 usage = stats['usage_count'].get(key, 0)
                 failures = stats['failure_count'].get(key, 0)
+                tokens_used = stats['tokens_used'].get(key, 0)
                 in_cooldown = "🔴 Sim" if key in key_manager.key_cooldown else "🟢 Não"
                 total_requests = usage
                 success_rate = ((total_requests - failures) / total_requests * 100) if total_requests > 0 else 0
                 usage_data.append({
                     "Chave": f"Chave #{i}", "ID Mascarado": masked_key, "Usos Totais": usage,
-                    "Falhas": failures, "Taxa de Sucesso": f"{success_rate:.1f}%", "Em Cooldown": in_cooldown
+                    "Falhas": failures, "Taxa de Sucesso": f"{success_rate:.1f}%", "Em Cooldown": in_cooldown,
+                    "Tokens Usados": tokens_used,
+                    "Requisições Livres": f"{stats['requests_remaining'].get(key, 0)}/{stats['requests_per_minute']}",
+                    "Tokens Livres": f"{stats['tokens_remaining'].get(key, 0)}/{stats['tokens_per_minute']}"
                 })
             df_usage = pd.DataFrame(usage_data)
             st.dataframe(df_usage, use_container_width=True, hide_index=True)
@@ -86,9 +95,7 @@ def show_api_key_statistics():
         col_reset1, col_reset2 = st.columns([3, 1])
         with col_reset2:
             if st.button("🔄 Resetar Estatísticas", type="secondary"):
-                key_manager.key_usage_count.clear()
-                key_manager.key_failures.clear()
-                key_manager.key_last_used.clear()
+                key_manager.reset_statistics()
                 st.success("✅ Estatísticas resetadas!")
                 st.rerun()
     except Exception as e:
@@ -154,7 +161,7 @@ def show_api_key_tests():
         if key_manager.key_cooldown:
             st.write(f"**Chaves atualmente em cooldown:** {len(key_manager.key_cooldown)}")
             if st.button("🔓 Remover Todos os Cooldowns", type="secondary"):
-                key_manager.key_cooldown.clear()
+                key_manager.clear_cooldowns()
                 st.success("✅ Todos os cooldowns foram removidos!")
                 st.rerun()
         else:
@@ -176,7 +183,8 @@ def show_page():
     with tab_dashboard:
         st.header("Visão Geral do Status de Todos os Usuários Ativos")
         if st.button("Recarregar Dados Globais"):
-            st.cache_data.clear()
+            clear_data_cache()
+            get_users_data.clear()
             st.rerun()
 
         users_df = get_users_data()
@@ -285,7 +293,7 @@ def show_page():
                                 st.success(f"✅ Usuário {request['nome_usuario']} aprovado!")
                                 st.warning(f"⚠️ Erro na notificação: {e}")
                             
-                            st.cache_data.clear()
+                            get_users_data.clear()
                             st.rerun()
                     
                     if cols[2].button("Rejeitar", key=f"reject_{request['id']}"):
@@ -300,7 +308,7 @@ def show_page():
                         except:
                             st.warning(f"Solicitação de {request['nome_usuario']} rejeitada.")
                         
-                        st.cache_data.clear()
+                        get_users_data.clear()
                         st.rerun()
 
     with tab_users:
@@ -339,7 +347,7 @@ def show_page():
                     db_client.update_data(USERS_SHEET_NAME, updates, 'email', selected_email)
                     log_action("ALTEROU_USUARIO", f"Email: {selected_email}, Plano: {new_plan}, Status: {new_status}, Perfil: {new_role}")
                     st.success("Usuário atualizado com sucesso!")
-                    st.cache_data.clear()
+                    get_users_data.clear()
                     st.rerun()
 
     with tab_audit:
@@ -400,7 +408,6 @@ def show_page():
                                 }
                                 db_client.update_data(SOLICITACOES_SUPORTE_SHEET_NAME, updates, 'id', ticket_data['id'])
                                 st.success("✅ Resposta enviada!")
-                                st.cache_data.clear()
                                 st.rerun()
 
     with tab_api_keys:
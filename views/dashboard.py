@@ -28,11 +28,10 @@ from operations.extinguisher_operations import batch_regularize_monthly_inspecti
 from operations.instrucoes import instru_dash
 from config.page_config import set_page_config
 from auth.auth_utils import is_admin, get_user_display_name
-from operations.history import load_sheet_data, find_last_record
+from operations.history import load_sheet_data, load_latest_records, load_tables, find_last_record, clear_data_cache
 import streamlit as st
 import pandas as pd
 from datetime import date
-from dateutil.relativedelta import relativedelta
 from datetime import datetime
 import sys
 import os
@@ -47,6 +46,18 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 set_page_config()
 
+# Colunas efetivamente usadas pelo dashboard (projeção enviada ao Supabase)
+EXTINGUISHER_STATUS_COLUMNS = (
+    "numero_identificacao", "data_servico", "tipo_servico", "aprovado_inspecao",
+    "plano_de_acao", "numero_selo_inmetro", "tipo_agente"
+)
+LOCAIS_DASHBOARD_COLUMNS = ("id", "local")
+HOSE_DISPOSAL_DASHBOARD_COLUMNS = ("id_mangueira",)
+MULTIGAS_INSPECTIONS_DASHBOARD_COLUMNS = (
+    "id_equipamento", "tipo_teste", "data_teste", "resultado_teste",
+    "proxima_calibracao", "link_certificado"
+)
+
 
 def get_canhao_monitor_status_df(df_inspections):
     if df_inspections.empty:
@@ -128,7 +139,6 @@ def action_dialog_canhao_monitor(item_row):
                 # Sucesso em ambas as operações
                 st.success("Ação registrada e status do equipamento regularizado com sucesso!")
                 #st.balloons()
-                st.cache_data.clear()
                 st.rerun() # Fecha o diálogo e atualiza a página
 
             except Exception as e:
@@ -155,35 +165,38 @@ def get_multigas_status_df(df_inventory, df_inspections):
     df_inspections['data_teste'] = pd.to_datetime(
         df_inspections['data_teste'], errors='coerce')
 
-    dashboard_df['proxima_calibracao'] = pd.NaT
-    dashboard_df['link_certificado'] = None
-    dashboard_df['resultado_ultimo_bump_test'] = 'N/A'
-    dashboard_df['data_ultimo_bump_test'] = pd.NaT
-
-    for index, row in dashboard_df.iterrows():
-        equip_id = row['id_equipamento']
-        equip_inspections = df_inspections[df_inspections['id_equipamento'] == equip_id]
-
-        if not equip_inspections.empty:
-            calibrations = equip_inspections[equip_inspections['tipo_teste']
-                                             == 'Calibração Anual']
-            if not calibrations.empty:
-                last_calib = calibrations.sort_values(
-                    'data_teste', ascending=False).iloc[0]
-                dashboard_df.loc[index, 'proxima_calibracao'] = last_calib.get(
-                    'proxima_calibracao')
-                dashboard_df.loc[index, 'link_certificado'] = last_calib.get(
-                    'link_certificado')
-
-            bump_tests = equip_inspections[equip_inspections['tipo_teste']
-                                           != 'Calibração Anual']
-            if not bump_tests.empty:
-                last_bump = bump_tests.sort_values(
-                    'data_teste', ascending=False).iloc[0]
-                dashboard_df.loc[index, 'resultado_ultimo_bump_test'] = last_bump.get(
-                    'resultado_teste')
-                dashboard_df.loc[index, 'data_ultimo_bump_test'] = last_bump.get(
-                    'data_teste')
+    inspections = df_inspections.reset_index(drop=True)
+    # Datas inválidas ficam por último na escolha do teste mais recente
+    test_dates = inspections['data_teste'].fillna(pd.Timestamp.min)
+    is_calibration = inspections['tipo_teste'] == 'Calibração Anual'
+
+    def latest_by_equipment(mask, columns):
+        latest_idx = test_dates[mask].groupby(
+            inspections.loc[mask, 'id_equipamento']).idxmax()
+        return inspections.loc[latest_idx.values].reindex(columns=['id_equipamento'] + columns)
+
+    last_calibrations = latest_by_equipment(
+        is_calibration, ['proxima_calibracao', 'link_certificado'])
+    last_bump_tests = latest_by_equipment(
+        ~is_calibration, ['resultado_teste', 'data_teste']).rename(columns={
+            'resultado_teste': 'resultado_ultimo_bump_test',
+            'data_teste': 'data_ultimo_bump_test'
+        })
+
+    status_columns = ['proxima_calibracao', 'link_certificado',
+                      'resultado_ultimo_bump_test', 'data_ultimo_bump_test']
+    merged_df = dashboard_df.drop(columns=status_columns, errors='ignore').merge(
+        last_calibrations, on='id_equipamento', how='left').merge(
+        last_bump_tests, on='id_equipamento', how='left')
+    merged_df.index = dashboard_df.index
+    dashboard_df = merged_df
+
+    has_bump_test = dashboard_df['id_equipamento'].isin(
+        last_bump_tests['id_equipamento'])
+    dashboard_df['resultado_ultimo_bump_test'] = dashboard_df['resultado_ultimo_bump_test'].where(
+        has_bump_test, 'N/A')
+    dashboard_df['data_ultimo_bump_test'] = pd.to_datetime(
+        dashboard_df['data_ultimo_bump_test'], errors='coerce')
 
     today = pd.Timestamp(date.today())
 
@@ -384,7 +397,6 @@ def action_dialog_multigas(item_row):
 
             if log_saved:
                 st.success("Ação registrada com sucesso!")
-                st.cache_data.clear()
                 st.rerun()
             else:
                 st.error("Falha ao salvar o log da ação.")
@@ -480,7 +492,6 @@ def disposal_dialog_extinguisher(item_row):
                 st.success(
                     f"🔄 Lembre-se de instalar o substituto {substitute_id} no local.")
                 #st.balloons()
-                st.cache_data.clear()
                 st.rerun()
             else:
                 st.error("❌ Falha ao registrar a baixa. Tente novamente.")
@@ -513,7 +524,6 @@ def dispose_hose_dialog(hose_id):
                 db_client.append_data("baixas_mangueiras", log_row)
                 st.success(
                     f"Baixa da mangueira {hose_id} registrada com sucesso!")
-                st.cache_data.clear()
                 st.rerun()
             except Exception as e:
                 st.error(f"Ocorreu um erro ao registrar a baixa: {e}")
@@ -523,32 +533,22 @@ def get_shelter_status_df(df_shelters_registered, df_inspections):
     if df_shelters_registered.empty:
         return pd.DataFrame()
 
-    latest_inspections_list = []
+    latest_inspections = pd.DataFrame()
     if not df_inspections.empty:
         df_inspections['data_inspecao'] = pd.to_datetime(
             df_inspections['data_inspecao'], errors='coerce').dt.date
 
-        for shelter_id in df_shelters_registered['id_abrigo'].unique():
-            shelter_inspections = df_inspections[df_inspections['id_abrigo'] == shelter_id].copy(
-            )
-            if not shelter_inspections.empty:
-                shelter_inspections = shelter_inspections.sort_values(
-                    by='data_inspecao', ascending=False)
-
-                latest_date = shelter_inspections['data_inspecao'].iloc[0]
-                inspections_on_latest_date = shelter_inspections[
-                    shelter_inspections['data_inspecao'] == latest_date]
-
-                approved_on_latest = inspections_on_latest_date[
-                    inspections_on_latest_date['status_geral'] != 'Reprovado com Pendências']
-
-                if not approved_on_latest.empty:
-                    latest_inspections_list.append(approved_on_latest.iloc[0])
-                else:
-                    latest_inspections_list.append(
-                        inspections_on_latest_date.iloc[0])
+        shelter_inspections = df_inspections[df_inspections['id_abrigo'].isin(
+            df_shelters_registered['id_abrigo'].unique())]
 
-    latest_inspections = pd.DataFrame(latest_inspections_list)
+        # Data mais recente primeiro; na mesma data, a inspeção aprovada tem prioridade
+        latest_inspections = shelter_inspections.assign(
+            _sort_date=pd.to_datetime(shelter_inspections['data_inspecao']),
+            _sort_rejected=shelter_inspections['status_geral'] == 'Reprovado com Pendências'
+        ).sort_values(
+            by=['_sort_date', '_sort_rejected'], ascending=[False, True], kind='mergesort'
+        ).drop_duplicates(subset='id_abrigo', keep='first').drop(
+            columns=['_sort_date', '_sort_rejected'])
 
     if not latest_inspections.empty:
         dashboard_df = pd.merge(df_shelters_registered[[
@@ -591,96 +591,83 @@ def get_consolidated_status_df(df_full, df_locais):
 
     from operations.extinguisher_disposal_operations import get_disposed_extinguishers
 
-    consolidated_data = []
     df_copy = df_full.copy()
     df_copy['data_servico'] = pd.to_datetime(
         df_copy['data_servico'], errors='coerce')
     df_copy = df_copy.dropna(subset=['data_servico'])
 
     df_disposed = get_disposed_extinguishers()
-    disposed_ids = df_disposed['numero_identificacao'].tolist(
-    ) if not df_disposed.empty else []
-
-    unique_ids = df_copy['numero_identificacao'].unique()
-
-    for ext_id in unique_ids:
-        if ext_id in disposed_ids:
-            continue
-
-        ext_df = df_copy[df_copy['numero_identificacao']
-                         == ext_id].sort_values(by='data_servico')
-        if ext_df.empty:
-            continue
-
-        latest_record_info = ext_df.iloc[-1]
-
-        last_insp_date = ext_df['data_servico'].max()
-        last_maint2_date = ext_df[ext_df['tipo_servico']
-                                  == 'Manutenção Nível 2']['data_servico'].max()
-        last_maint3_date = ext_df[ext_df['tipo_servico']
-                                  == 'Manutenção Nível 3']['data_servico'].max()
-
-        dates_that_renew_inspection = [
-            last_insp_date, last_maint2_date, last_maint3_date]
-        valid_dates_inspection = [
-            d for d in dates_that_renew_inspection if pd.notna(d)]
-        if valid_dates_inspection:
-            most_recent_inspection_renewal = max(valid_dates_inspection)
-            next_insp = most_recent_inspection_renewal + \
-                relativedelta(months=1)
-        else:
-            next_insp = pd.NaT
+    if not df_disposed.empty:
+        df_copy = df_copy[~df_copy['numero_identificacao'].isin(
+            df_disposed['numero_identificacao'])]
 
-        dates_that_renew_n2 = [last_maint2_date, last_maint3_date]
-        valid_dates_n2 = [d for d in dates_that_renew_n2 if pd.notna(d)]
-        if valid_dates_n2:
-            most_recent_n2_renewal = max(valid_dates_n2)
-            next_maint2 = most_recent_n2_renewal + relativedelta(months=12)
-        else:
-            next_maint2 = pd.NaT
+    if df_copy.empty:
+        return pd.DataFrame()
 
-        if pd.notna(last_maint3_date):
-            next_maint3 = last_maint3_date + relativedelta(years=5)
-        else:
-            next_maint3 = pd.NaT
-
-        vencimentos = [d for d in [next_insp,
-                                   next_maint2, next_maint3] if pd.notna(d)]
-        if not vencimentos:
-            continue
-        proximo_vencimento_real = min(vencimentos)
-
-        today_ts = pd.Timestamp(date.today())
-        status_atual = "OK"
-
-        if latest_record_info.get('plano_de_acao') == "FORA DE OPERAÇÃO (SUBSTITUÍDO)":
-            status_atual = "FORA DE OPERAÇÃO"
-        elif latest_record_info.get('aprovado_inspecao') == 'Não':
-            status_atual = "NÃO CONFORME (Aguardando Ação)"
-        elif proximo_vencimento_real < today_ts:
-            status_atual = "VENCIDO"
-
-        # Verifica se o equipamento está fora de operação por substituição ou baixa definitiva
-        plano_de_acao_upper = str(latest_record_info.get('plano_de_acao', '')).upper()
-        if "FORA DE OPERAÇÃO" in plano_de_acao_upper or "BAIXADO DEFINITIVAMENTE" in plano_de_acao_upper:
-            continue
-
-        consolidated_data.append({
-            'numero_identificacao': ext_id,
-            'numero_selo_inmetro': latest_record_info.get('numero_selo_inmetro'),
-            'tipo_agente': latest_record_info.get('tipo_agente'),
-            'status_atual': status_atual,
-            'proximo_vencimento_geral': proximo_vencimento_real,
-            'prox_venc_inspecao': next_insp if pd.notna(next_insp) else pd.NaT,
-            'prox_venc_maint2': next_maint2 if pd.notna(next_maint2) else pd.NaT,
-            'prox_venc_maint3': next_maint3 if pd.notna(next_maint3) else pd.NaT,
-            'plano_de_acao': latest_record_info.get('plano_de_acao'),
-        })
+    df_copy = df_copy.reindex(columns=df_copy.columns.union(
+        ['numero_selo_inmetro', 'tipo_agente', 'plano_de_acao', 'aprovado_inspecao'], sort=False))
+
+    # Ordem original de aparição dos equipamentos no histórico
+    ext_order = df_copy['numero_identificacao'].dropna().unique()
+
+    # Último registro de cada extintor (ordenação estável por data de serviço)
+    latest_records = df_copy.sort_values(by='data_servico', kind='mergesort').drop_duplicates(
+        subset='numero_identificacao', keep='last').set_index('numero_identificacao')
+
+    # Datas do último serviço, da última manutenção N2 e da última N3 em um único groupby
+    service_dates = df_copy['data_servico']
+    last_dates = df_copy.assign(
+        last_maint2=service_dates.where(
+            df_copy['tipo_servico'] == 'Manutenção Nível 2'),
+        last_maint3=service_dates.where(
+            df_copy['tipo_servico'] == 'Manutenção Nível 3')
+    ).groupby('numero_identificacao', sort=False).agg(
+        last_insp=('data_servico', 'max'),
+        last_maint2=('last_maint2', 'max'),
+        last_maint3=('last_maint3', 'max')
+    )
 
-    if not consolidated_data:
+    status_df = latest_records.join(last_dates).reindex(ext_order)
+
+    # Inspeção é renovada por qualquer serviço; N2 por N2 ou N3; N3 apenas por N3
+    next_insp = status_df['last_insp'] + pd.DateOffset(months=1)
+    next_maint2 = status_df[['last_maint2', 'last_maint3']].max(
+        axis=1) + pd.DateOffset(months=12)
+    next_maint3 = status_df['last_maint3'] + pd.DateOffset(years=5)
+    proximo_vencimento_real = pd.concat(
+        [next_insp, next_maint2, next_maint3], axis=1).min(axis=1)
+
+    today_ts = pd.Timestamp(date.today())
+    status_atual = np.select(
+        [status_df['aprovado_inspecao'] == 'Não',
+         proximo_vencimento_real < today_ts],
+        ["NÃO CONFORME (Aguardando Ação)", "VENCIDO"],
+        default="OK")
+
+    consolidated_df = pd.DataFrame({
+        'numero_identificacao': status_df.index,
+        'numero_selo_inmetro': status_df['numero_selo_inmetro'].values,
+        'tipo_agente': status_df['tipo_agente'].values,
+        'status_atual': status_atual,
+        'proximo_vencimento_geral': proximo_vencimento_real.values,
+        'prox_venc_inspecao': next_insp.values,
+        'prox_venc_maint2': next_maint2.values,
+        'prox_venc_maint3': next_maint3.values,
+        'plano_de_acao': status_df['plano_de_acao'].values,
+    })
+
+    # Remove equipamentos sem vencimento ou fora de operação por substituição ou baixa definitiva
+    plano_de_acao_upper = consolidated_df['plano_de_acao'].astype(str).str.upper()
+    is_out_of_service = (
+        plano_de_acao_upper.str.contains("FORA DE OPERAÇÃO", regex=False) |
+        plano_de_acao_upper.str.contains("BAIXADO DEFINITIVAMENTE", regex=False))
+    consolidated_df = consolidated_df[
+        consolidated_df['proximo_vencimento_geral'].notna() & ~is_out_of_service]
+
+    if consolidated_df.empty:
         return pd.DataFrame()
 
-    dashboard_df = pd.DataFrame(consolidated_data)
+    dashboard_df = consolidated_df.reset_index(drop=True)
     if not df_locais.empty:
         df_locais = df_locais.rename(columns={'id': 'numero_identificacao'})
         df_locais['numero_identificacao'] = df_locais['numero_identificacao'].astype(
@@ -744,7 +731,6 @@ def action_dialog_alarm(item_row):
                 st.success(
                     "Ação registrada e status do sistema regularizado com sucesso!")
                 #st.balloons()
-                st.cache_data.clear()
                 st.rerun()
 
             except Exception as e:
@@ -800,7 +786,6 @@ def action_dialog_foam_chamber(item_row):
                 st.success(
                     "Ação registrada e status do equipamento regularizado com sucesso!")
                 #st.balloons()
-                st.cache_data.clear()
                 st.rerun()
 
             except Exception as e:
@@ -855,7 +840,6 @@ def action_dialog_eyewash(item_row):
                 st.success(
                     "Ação registrada e status do equipamento regularizado com sucesso!")
                 #st.balloons()
-                st.cache_data.clear()
                 st.rerun()
 
             except Exception as e:
@@ -893,7 +877,6 @@ def action_dialog_scba(equipment_id, problem):
 
                 st.success("Ação registrada e status regularizado!")
                 #st.balloons()
-                st.cache_data.clear()
                 st.rerun()
 
             except Exception as e:
@@ -958,7 +941,6 @@ def action_dialog_shelter(shelter_id, problem):
                 st.success(
                     "Plano de ação registrado e status do abrigo regularizado com sucesso!")
                 #st.balloons()
-                st.cache_data.clear()
                 st.rerun()
 
             except Exception as e:
@@ -1064,7 +1046,6 @@ def action_form(item, df_full_history, location):
                     st.success(
                         f"🔄 Lembre-se de instalar o substituto {substitute_id} no local.")
                     #st.balloons()
-                    st.cache_data.clear()
                     st.rerun()
                 else:
                     st.error("❌ Falha ao registrar a baixa. Tente novamente.")
@@ -1161,24 +1142,15 @@ def action_form(item, df_full_history, location):
                         st.success("Substituição registrada com sucesso!")
                     else:
                         st.success("Ação corretiva registrada com sucesso!")
-                    st.cache_data.clear()
                     st.rerun()
                 else:
                     st.error("Falha ao registrar a ação.")
 
 
-def show_page():
-
-    st.title("Situação Atual dos Equipamentos de Emergência")
-
-    if st.button("Limpar Cache e Recarregar Dados"):
-        st.cache_data.clear()
-        st.rerun()
-
-    tab_help, tab_extinguishers, tab_hoses, tab_shelters, tab_scba, tab_eyewash, tab_foam, tab_multigas, tab_alarms, tab_canhoes = st.tabs([
-        "📘 Como Usar", "🔥 Extintores", "💧 Mangueiras", "🧯 Abrigos", "💨 C. Autônomo",
-        "🚿 Chuveiros/Lava-Olhos", "☁️ Câmaras de Espuma", "💨 Multigás", "🔔 Alarmes", "🌊 Canhões Monitores"
-    ])
+@st.fragment
+def show_extinguishers_dashboard():
+    """Aba de extintores: status consolidado, ações e relatório mensal."""
+    st.header("Dashboard de Extintores")
 
     location = streamlit_js_eval(js_expressions="""
         new Promise(function(resolve, reject) {
@@ -1189,897 +1161,843 @@ def show_page():
         });
     """)
 
-    with tab_help:
-        instru_dash()
+    data = load_tables(["extintores", ("locais", LOCAIS_DASHBOARD_COLUMNS)])
 
-    with tab_extinguishers:
-        st.header("Dashboard de Extintores")
+    if is_admin():
+        with st.expander("⚙️ Ações de Administrador"):
+            st.warning(
+                "Esta ação criará um registro de inspeção 'Aprovado' com a data de hoje para TODOS os extintores com inspeção mensal vencida.")
+            if st.button("Regularizar Todas as Inspeções Mensais Vencidas", type="primary"):
+                with st.spinner("Verificando e regularizando extintores..."):
+                    df_history_for_action = load_sheet_data("extintores")
+                    num_regularized = batch_regularize_monthly_inspections(
+                        df_history_for_action)
+
+                    if num_regularized > 0:
+                        st.success(
+                            f"{num_regularized} extintores foram regularizados com sucesso!")
+                        #st.balloons()
+                        st.rerun()
+                    elif num_regularized == 0:
+                        pass
+                    else:
+                        st.error(
+                            "A operação de regularização falhou. Verifique os logs.")
 
-        if is_admin():
-            with st.expander("⚙️ Ações de Administrador"):
-                st.warning(
-                    "Esta ação criará um registro de inspeção 'Aprovado' com a data de hoje para TODOS os extintores com inspeção mensal vencida.")
-                if st.button("Regularizar Todas as Inspeções Mensais Vencidas", type="primary"):
-                    with st.spinner("Verificando e regularizando extintores..."):
-                        df_history_for_action = load_sheet_data("extintores")
-                        num_regularized = batch_regularize_monthly_inspections(
-                            df_history_for_action)
+    with st.expander("📄 Gerar Relatório Mensal..."):
+        show_monthly_report_interface()
+    st.markdown("---")
 
-                        if num_regularized > 0:
-                            st.success(
-                                f"{num_regularized} extintores foram regularizados com sucesso!")
-                            #st.balloons()
-                            st.cache_data.clear()
-                            st.rerun()
-                        elif num_regularized == 0:
-                            pass
-                        else:
-                            st.error(
-                                "A operação de regularização falhou. Verifique os logs.")
+    df_full_history = data["extintores"]
+    df_locais = data["locais"]
 
-        with st.expander("📄 Gerar Relatório Mensal..."):
-            show_monthly_report_interface()
-        st.markdown("---")
+    if df_full_history.empty:
+        st.warning("Ainda não há registros de inspeção para exibir.")
+        return
 
-        df_full_history = load_sheet_data("extintores")
-        df_locais = load_sheet_data("locais")
+    with st.spinner("Analisando o status de todos os extintores..."):
+        dashboard_df = get_consolidated_status_df(
+            df_full_history, df_locais)
 
-        if df_full_history.empty:
-            st.warning("Ainda não há registros de inspeção para exibir.")
-            return
+    if dashboard_df.empty:
+        st.warning(
+            "Não foi possível gerar o dashboard ou não há equipamentos ativos.")
+        return
+
+    status_counts = dashboard_df['status_atual'].value_counts()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("✅ Total Ativo", len(dashboard_df))
+    col2.metric("🟢 OK", status_counts.get("OK", 0))
+    col3.metric("🔴 VENCIDO", status_counts.get("VENCIDO", 0))
+    col4.metric("🟠 NÃO CONFORME", status_counts.get(
+        "NÃO CONFORME (Aguardando Ação)", 0))
+    st.markdown("---")
 
-        with st.spinner("Analisando o status de todos os extintores..."):
-            dashboard_df = get_consolidated_status_df(
-                df_full_history, df_locais)
+    status_filter = st.multiselect("Filtrar por Status:", options=sorted(
+        dashboard_df['status_atual'].unique()), default=sorted(dashboard_df['status_atual'].unique()))
+    filtered_df = dashboard_df[dashboard_df['status_atual'].isin(
+        status_filter)]
 
-        if dashboard_df.empty:
-            st.warning(
-                "Não foi possível gerar o dashboard ou não há equipamentos ativos.")
-            return
+    st.subheader("Lista de Equipamentos")
 
-        status_counts = dashboard_df['status_atual'].value_counts()
-        col1, col2, col3, col4 = st.columns(4)
-        col1.metric("✅ Total Ativo", len(dashboard_df))
-        col2.metric("🟢 OK", status_counts.get("OK", 0))
-        col3.metric("🔴 VENCIDO", status_counts.get("VENCIDO", 0))
-        col4.metric("🟠 NÃO CONFORME", status_counts.get(
-            "NÃO CONFORME (Aguardando Ação)", 0))
-        st.markdown("---")
+    if filtered_df.empty:
+        st.info("Nenhum item corresponde ao filtro selecionado.")
+    else:
+        for index, row in filtered_df.iterrows():
+            status_icon = "🟢" if row['status_atual'] == 'OK' else (
+                '🔴' if row['status_atual'] == 'VENCIDO' else '🟠')
 
-        status_filter = st.multiselect("Filtrar por Status:", options=sorted(
-            dashboard_df['status_atual'].unique()), default=sorted(dashboard_df['status_atual'].unique()))
-        filtered_df = dashboard_df[dashboard_df['status_atual'].isin(
-            status_filter)]
+            expander_title = f"{status_icon} **ID:** {row['numero_identificacao']} | **Tipo:** {row['tipo_agente']} | **Status:** {row['status_atual']} | **Localização:** {row['status_instalacao']}"
 
-        st.subheader("Lista de Equipamentos")
+            with st.expander(expander_title):
+                st.markdown(
+                    f"**Plano de Ação Sugerido:** {row['plano_de_acao']}")
+                st.markdown("---")
+                st.subheader("Próximos Vencimentos:")
 
-        if filtered_df.empty:
-            st.info("Nenhum item corresponde ao filtro selecionado.")
-        else:
-            for index, row in filtered_df.iterrows():
-                status_icon = "🟢" if row['status_atual'] == 'OK' else (
-                    '🔴' if row['status_atual'] == 'VENCIDO' else '🟠')
+                col_venc1, col_venc2, col_venc3 = st.columns(3)
+                col_venc1.metric("Inspeção Mensal",
+                                 value=row['prox_venc_inspecao'].strftime('%d/%m/%Y') if pd.notna(row['prox_venc_inspecao']) else "N/A")
+                col_venc2.metric("Manutenção Nível 2",
+                                 value=row['prox_venc_maint2'].strftime('%d/%m/%Y') if pd.notna(row['prox_venc_maint2']) else "N/A")
+                col_venc3.metric("Manutenção Nível 3",
+                                 value=row['prox_venc_maint3'].strftime('%d/%m/%Y') if pd.notna(row['prox_venc_maint3']) else "N/A")
 
-                expander_title = f"{status_icon} **ID:** {row['numero_identificacao']} | **Tipo:** {row['tipo_agente']} | **Status:** {row['status_atual']} | **Localização:** {row['status_instalacao']}"
+                st.caption(
+                    f"Último Selo INMETRO registrado: {row.get('numero_selo_inmetro', 'N/A')}")
 
-                with st.expander(expander_title):
-                    st.markdown(
-                        f"**Plano de Ação Sugerido:** {row['plano_de_acao']}")
-                    st.markdown("---")
-                    st.subheader("Próximos Vencimentos:")
+                st.markdown("---")
+                st.subheader("📸 Evidências Fotográficas")
 
-                    col_venc1, col_venc2, col_venc3 = st.columns(3)
-                    col_venc1.metric("Inspeção Mensal",
-                                     value=row['prox_venc_inspecao'].strftime('%d/%m/%Y') if pd.notna(row['prox_venc_inspecao']) else "N/A")
-                    col_venc2.metric("Manutenção Nível 2",
-                                     value=row['prox_venc_maint2'].strftime('%d/%m/%Y') if pd.notna(row['prox_venc_maint2']) else "N/A")
-                    col_venc3.metric("Manutenção Nível 3",
-                                     value=row['prox_venc_maint3'].strftime('%d/%m/%Y') if pd.notna(row['prox_venc_maint3']) else "N/A")
+                ext_id = row['numero_identificacao']
+                ext_history = df_full_history[df_full_history['numero_identificacao'] == ext_id].sort_values(
+                    'data_servico', ascending=False)
 
-                    st.caption(
-                        f"Último Selo INMETRO registrado: {row.get('numero_selo_inmetro', 'N/A')}")
+                if not ext_history.empty:
+                    latest_full_record = ext_history.iloc[0]
+                    photo_link = latest_full_record.get(
+                        'link_foto_nao_conformidade')
 
-                    st.markdown("---")
-                    st.subheader("📸 Evidências Fotográficas")
+                    if photo_link and pd.notna(photo_link) and str(photo_link).strip() != '':
+                        display_storage_image(
+                            photo_link, caption="Foto da Não Conformidade", width=400)
+                    else:
+                        st.info(
+                            "Nenhuma foto de não conformidade registrada para este equipamento.")
+                else:
+                    st.info("Sem histórico fotográfico disponível.")
 
-                    ext_id = row['numero_identificacao']
-                    ext_history = df_full_history[df_full_history['numero_identificacao'] == ext_id].sort_values(
-                        'data_servico', ascending=False)
+                if row['status_atual'] != 'OK':
+                    st.markdown("---")
+                    if st.button("✍️ Registrar Ação Corretiva", key=f"action_ext_{index}", use_container_width=True):
+                        action_form(row.to_dict(),
+                                    df_full_history, location)
 
-                    if not ext_history.empty:
-                        latest_full_record = ext_history.iloc[0]
-                        photo_link = latest_full_record.get(
-                            'link_foto_nao_conformidade')
 
-                        if photo_link and pd.notna(photo_link) and str(photo_link).strip() != '':
-                            display_storage_image(
-                                photo_link, caption="Foto da Não Conformidade", width=400)
-                        else:
-                            st.info(
-                                "Nenhuma foto de não conformidade registrada para este equipamento.")
-                    else:
-                        st.info("Sem histórico fotográfico disponível.")
+@st.fragment
+def show_hoses_dashboard():
+    """Aba de mangueiras de incêndio."""
+    st.header("Dashboard de Mangueiras de Incêndio")
 
-                    if row['status_atual'] != 'OK':
-                        st.markdown("---")
-                        if st.button("✍️ Registrar Ação Corretiva", key=f"action_ext_{index}", use_container_width=True):
-                            action_form(row.to_dict(),
-                                        df_full_history, location)
+    data = load_tables([("baixas_mangueiras", HOSE_DISPOSAL_DASHBOARD_COLUMNS)],
+                       latest=[("mangueiras", "id_mangueira", "data_inspecao")])
 
-    with tab_hoses:
-        st.header("Dashboard de Mangueiras de Incêndio")
+    df_hoses_history = data["mangueiras"]
+    df_disposals = data["baixas_mangueiras"]
 
-        df_hoses_history = load_sheet_data("mangueiras")
-        df_disposals = load_sheet_data("baixas_mangueiras")
+    if df_hoses_history.empty:
+        st.warning(
+            "Ainda não há registros de inspeção de mangueiras para exibir no dashboard.")
+    else:
+        dashboard_df_hoses = get_hose_status_df(
+            df_hoses_history, df_disposals)
 
-        if df_hoses_history.empty:
-            st.warning(
-                "Ainda não há registros de inspeção de mangueiras para exibir no dashboard.")
-        else:
-            dashboard_df_hoses = get_hose_status_df(
-                df_hoses_history, df_disposals)
+        status_counts = dashboard_df_hoses['status'].value_counts()
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("✅ Total Ativas", len(dashboard_df_hoses))
+        col2.metric("🟢 OK", status_counts.get("🟢 OK", 0))
+        col3.metric("🔴 VENCIDO", status_counts.get("🔴 VENCIDO", 0))
+        col4.metric("🟠 REPROVADA", status_counts.get("🟠 REPROVADA", 0))
 
-            status_counts = dashboard_df_hoses['status'].value_counts()
-            col1, col2, col3, col4 = st.columns(4)
-            col1.metric("✅ Total Ativas", len(dashboard_df_hoses))
-            col2.metric("🟢 OK", status_counts.get("🟢 OK", 0))
-            col3.metric("🔴 VENCIDO", status_counts.get("🔴 VENCIDO", 0))
-            col4.metric("🟠 REPROVADA", status_counts.get("🟠 REPROVADA", 0))
+        st.markdown("---")
 
-            st.markdown("---")
+        st.subheader("Lista de Mangueiras Ativas")
 
-            st.subheader("Lista de Mangueiras Ativas")
+        for _, row in dashboard_df_hoses.iterrows():
+            if row['status'] == '🟠 REPROVADA':
+                with st.container(border=True):
+                    cols = st.columns([5, 2])
+                    with cols[0]:
+                        st.markdown(
+                            f"**ID:** {row['id_mangueira']} | **Status:** {row['status']} | **Próx. Teste:** {row['data_proximo_teste']}")
+                    with cols[1]:
+                        if st.button("🗑️ Registrar Baixa", key=f"dispose_{row['id_mangueira']}", use_container_width=True):
+                            dispose_hose_dialog(row['id_mangueira'])
+            else:
+                st.text(
+                    f"ID: {row['id_mangueira']} | Status: {row['status']} | Próx. Teste: {row['data_proximo_teste']}")
+
+        with st.expander("Ver tabela completa de mangueiras ativas"):
+            st.dataframe(
+                dashboard_df_hoses,
+                column_config={
+                    "id_mangueira": "ID", "status": "Status", "marca": "Marca",
+                    "diametro": "Diâmetro", "tipo": "Tipo", "comprimento": "Comprimento",
+                    "ano_fabricacao": "Ano Fab.",
+                    # Use column_config para formatar a data na exibição
+                    "data_inspecao": st.column_config.DateColumn(
+                        "Último Teste", format="DD/MM/YYYY"
+                    ),
+                    "data_proximo_teste": st.column_config.DateColumn(
+                        "Próximo Teste", format="DD/MM/YYYY"
+                    ),
+                    "registrado_por": "Registrado Por",
+                    "link_certificado_pdf": st.column_config.LinkColumn(
+                        "Certificado", display_text="🔗 Ver PDF"
+                    )
+                },
+                hide_index=True,
+                use_container_width=True
+            )
 
-            for _, row in dashboard_df_hoses.iterrows():
-                if row['status'] == '🟠 REPROVADA':
-                    with st.container(border=True):
-                        cols = st.columns([5, 2])
-                        with cols[0]:
-                            st.markdown(
-                                f"**ID:** {row['id_mangueira']} | **Status:** {row['status']} | **Próx. Teste:** {row['data_proximo_teste']}")
-                        with cols[1]:
-                            if st.button("🗑️ Registrar Baixa", key=f"dispose_{row['id_mangueira']}", use_container_width=True):
-                                dispose_hose_dialog(row['id_mangueira'])
-                else:
-                    st.text(
-                        f"ID: {row['id_mangueira']} | Status: {row['status']} | Próx. Teste: {row['data_proximo_teste']}")
-
-            with st.expander("Ver tabela completa de mangueiras ativas"):
-                st.dataframe(
-                    dashboard_df_hoses,
-                    column_config={
-                        "id_mangueira": "ID", "status": "Status", "marca": "Marca",
-                        "diametro": "Diâmetro", "tipo": "Tipo", "comprimento": "Comprimento",
-                        "ano_fabricacao": "Ano Fab.",
-                        # Use column_config para formatar a data na exibição
-                        "data_inspecao": st.column_config.DateColumn(
-                            "Último Teste", format="DD/MM/YYYY"
-                        ),
-                        "data_proximo_teste": st.column_config.DateColumn(
-                            "Próximo Teste", format="DD/MM/YYYY"
-                        ),
-                        "registrado_por": "Registrado Por",
-                        "link_certificado_pdf": st.column_config.LinkColumn(
-                            "Certificado", display_text="🔗 Ver PDF"
-                        )
-                    },
-                    hide_index=True,
-                    use_container_width=True
-                )
 
-    with tab_shelters:
-        st.header("Dashboard de Status dos Abrigos de Emergência")
+@st.fragment
+def show_shelters_dashboard():
+    """Aba de abrigos de emergência."""
+    st.header("Dashboard de Status dos Abrigos de Emergência")
 
-        df_shelters_registered = load_sheet_data("abrigos")
-        df_inspections_history = load_sheet_data("inspecoes_abrigos")
-        df_action_log = load_sheet_data("log_acoes_abrigos")
+    data = load_tables(["abrigos", "inspecoes_abrigos", "log_acoes_abrigos"])
 
-        if df_shelters_registered.empty:
-            st.warning("Nenhum abrigo de emergência cadastrado.")
-        else:
-            st.info("Aqui está o status de todos os abrigos. Gere um relatório de status completo para impressão ou registre ações corretivas.")
-            if st.button("📄 Gerar Relatório de Status em PDF", type="primary"):
-                report_html = generate_shelters_html(
-                    df_shelters_registered, df_inspections_history, df_action_log)
-                js_code = f"""
-                    const reportHtml = {json.dumps(report_html)};
-                    const printWindow = window.open('', '_blank');
-                    if (printWindow) {{
-                        printWindow.document.write(reportHtml);
-                        printWindow.document.close();
-                        printWindow.focus();
-                        setTimeout(() => {{ printWindow.print(); printWindow.close(); }}, 500);
-                    }} else {{
-                        alert('Por favor, desabilite o bloqueador de pop-ups para este site.');
-                    }}
-                """
-                streamlit_js_eval(js_expressions=js_code,
-                                  key="print_shelters_js")
-                st.success("Relatório de status enviado para impressão!")
-            st.markdown("---")
+    df_shelters_registered = data["abrigos"]
+    df_inspections_history = data["inspecoes_abrigos"]
+    df_action_log = data["log_acoes_abrigos"]
 
-            dashboard_df_shelters = get_shelter_status_df(
-                df_shelters_registered, df_inspections_history)
+    if df_shelters_registered.empty:
+        st.warning("Nenhum abrigo de emergência cadastrado.")
+    else:
+        st.info("Aqui está o status de todos os abrigos. Gere um relatório de status completo para impressão ou registre ações corretivas.")
+        if st.button("📄 Gerar Relatório de Status em PDF", type="primary"):
+            report_html = generate_shelters_html(
+                df_shelters_registered, df_inspections_history, df_action_log)
+            js_code = f"""
+                const reportHtml = {json.dumps(report_html)};
+                const printWindow = window.open('', '_blank');
+                if (printWindow) {{
+                    printWindow.document.write(reportHtml);
+                    printWindow.document.close();
+                    printWindow.focus();
+                    setTimeout(() => {{ printWindow.print(); printWindow.close(); }}, 500);
+                }} else {{
+                    alert('Por favor, desabilite o bloqueador de pop-ups para este site.');
+                }}
+            """
+            streamlit_js_eval(js_expressions=js_code,
+                              key="print_shelters_js")
+            st.success("Relatório de status enviado para impressão!")
+        st.markdown("---")
 
-            status_counts = dashboard_df_shelters['status_dashboard'].value_counts(
-            )
-            ok_count = status_counts.get(
-                "🟢 OK", 0) + status_counts.get("🟢 OK (Ação Realizada)", 0)
-            pending_count = status_counts.get(
-                "🟠 COM PENDÊNCIAS", 0) + status_counts.get("🔵 PENDENTE (Nova Inspeção)", 0)
-            col1, col2, col3, col4 = st.columns(4)
-            col1.metric("✅ Total de Abrigos", len(dashboard_df_shelters))
-            col2.metric("🟢 OK", ok_count)
-            col3.metric("🟠 Pendentes", pending_count)
-            col4.metric("🔴 Vencido", status_counts.get("🔴 VENCIDO", 0))
-            st.markdown("---")
+        dashboard_df_shelters = get_shelter_status_df(
+            df_shelters_registered, df_inspections_history)
 
-            st.subheader("Lista de Abrigos e Status")
-            for _, row in dashboard_df_shelters.iterrows():
-                status = row['status_dashboard']
-                prox_inspecao_str = row['data_proxima_inspecao'].strftime('%d/%m/%Y') if pd.notna(row['data_proxima_inspecao']) else 'N/A'
-                local_info = row.get('local', 'N/A')
-                expander_title = f"{status} | **ID:** {row['id_abrigo']} | **Local:** {local_info} | **Próx. Inspeção:** {prox_inspecao_str}"
+        status_counts = dashboard_df_shelters['status_dashboard'].value_counts(
+        )
+        ok_count = status_counts.get(
+            "🟢 OK", 0) + status_counts.get("🟢 OK (Ação Realizada)", 0)
+        pending_count = status_counts.get(
+            "🟠 COM PENDÊNCIAS", 0) + status_counts.get("🔵 PENDENTE (Nova Inspeção)", 0)
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("✅ Total de Abrigos", len(dashboard_df_shelters))
+        col2.metric("🟢 OK", ok_count)
+        col3.metric("🟠 Pendentes", pending_count)
+        col4.metric("🔴 Vencido", status_counts.get("🔴 VENCIDO", 0))
+        st.markdown("---")
 
-                with st.expander(expander_title):
-                    data_inspecao_str = row['data_inspecao'].strftime('%d/%m/%Y') if pd.notna(row['data_inspecao']) else 'N/A'
-                    st.write(
-                        f"**Última inspeção:** {data_inspecao_str} por **{row['inspetor']}**")
-                    st.write(
-                        f"**Resultado da última inspeção:** {row.get('status_geral', 'N/A')}")
+        st.subheader("Lista de Abrigos e Status")
+        for _, row in dashboard_df_shelters.iterrows():
+            status = row['status_dashboard']
+            prox_inspecao_str = row['data_proxima_inspecao'].strftime('%d/%m/%Y') if pd.notna(row['data_proxima_inspecao']) else 'N/A'
+            local_info = row.get('local', 'N/A')
+            expander_title = f"{status} | **ID:** {row['id_abrigo']} | **Local:** {local_info} | **Próx. Inspeção:** {prox_inspecao_str}"
+
+            with st.expander(expander_title):
+                data_inspecao_str = row['data_inspecao'].strftime('%d/%m/%Y') if pd.notna(row['data_inspecao']) else 'N/A'
+                st.write(
+                    f"**Última inspeção:** {data_inspecao_str} por **{row['inspetor']}**")
+                st.write(
+                    f"**Resultado da última inspeção:** {row.get('status_geral', 'N/A')}")
+
+                if status not in ["🟢 OK", "🟢 OK (Ação Realizada)"]:
+                    problem_description = status.replace(
+                        "🔴 ", "").replace("🟠 ", "").replace("🔵 ", "")
+                    if st.button("✍️ Registrar Ação", key=f"action_{row['id_abrigo']}", use_container_width=True):
+                        action_dialog_shelter(
+                            row['id_abrigo'], problem_description)
 
-                    if status not in ["🟢 OK", "🟢 OK (Ação Realizada)"]:
-                        problem_description = status.replace(
-                            "🔴 ", "").replace("🟠 ", "").replace("🔵 ", "")
-                        if st.button("✍️ Registrar Ação", key=f"action_{row['id_abrigo']}", use_container_width=True):
-                            action_dialog_shelter(
-                                row['id_abrigo'], problem_description)
+                st.markdown("---")
+                st.write("**Detalhes da Última Inspeção:**")
 
-                    st.markdown("---")
-                    st.write("**Detalhes da Última Inspeção:**")
+                try:
+                    results_dict = json.loads(row['resultados_json'])
 
-                    try:
-                        results_dict = json.loads(row['resultados_json'])
+                    if results_dict:
+                        general_conditions = results_dict.pop(
+                            'Condições Gerais', {})
 
                         if results_dict:
-                            general_conditions = results_dict.pop(
-                                'Condições Gerais', {})
-
-                            if results_dict:
-                                st.write("**Itens do Inventário:**")
-                                items_df = pd.DataFrame.from_dict(
-                                    results_dict, orient='index')
-                                st.table(items_df)
-
-                            if general_conditions:
-                                st.write("**Condições Gerais do Abrigo:**")
-                                cols = st.columns(len(general_conditions))
-                                for i, (key, value) in enumerate(general_conditions.items()):
-                                    with cols[i]:
-                                        st.metric(label=key, value=value)
+                            st.write("**Itens do Inventário:**")
+                            items_df = pd.DataFrame.from_dict(
+                                results_dict, orient='index')
+                            st.table(items_df)
+
+                        if general_conditions:
+                            st.write("**Condições Gerais do Abrigo:**")
+                            cols = st.columns(len(general_conditions))
+                            for i, (key, value) in enumerate(general_conditions.items()):
+                                with cols[i]:
+                                    st.metric(label=key, value=value)
 
-                        else:
-                            st.info("Nenhum detalhe de inspeção disponível.")
+                    else:
+                        st.info("Nenhum detalhe de inspeção disponível.")
 
-                    except (json.JSONDecodeError, TypeError):
-                        st.error(
-                            "Não foi possível carregar os detalhes desta inspeção (formato inválido).")
+                except (json.JSONDecodeError, TypeError):
+                    st.error(
+                        "Não foi possível carregar os detalhes desta inspeção (formato inválido).")
+
+
+@st.fragment
+def show_scba_dashboard():
+    """Aba de conjuntos autônomos (SCBA)."""
+    st.header("Dashboard de Status dos Conjuntos Autônomos")
+
+    data = load_tables(["conjuntos_autonomos", "inspecoes_scba"])
 
-    with tab_scba:
-        st.header("Dashboard de Status dos Conjuntos Autônomos")
+    df_scba_main = data["conjuntos_autonomos"]
+    df_scba_visual = data["inspecoes_scba"]
 
-        df_scba_main = load_sheet_data("conjuntos_autonomos")
-        df_scba_visual = load_sheet_data("inspecoes_scba")
+    if df_scba_main.empty:
+        st.warning("Nenhum teste de equipamento (Posi3) registrado.")
+    else:
+        dashboard_df = get_scba_status_df(df_scba_main, df_scba_visual)
 
-        if df_scba_main.empty:
-            st.warning("Nenhum teste de equipamento (Posi3) registrado.")
+        if dashboard_df.empty:
+            st.info("Não há equipamentos SCBA para exibir no dashboard.")
         else:
-            dashboard_df = get_scba_status_df(df_scba_main, df_scba_visual)
+            status_counts = dashboard_df['status_consolidado'].value_counts(
+            )
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("✅ Total", len(dashboard_df))
+            col2.metric("🟢 OK", status_counts.get("🟢 OK", 0))
+            col3.metric("🟠 Pendências", status_counts.get(
+                "🟠 COM PENDÊNCIAS", 0))
+            col4.metric("🔴 Vencidos", status_counts.get(
+                "🔴 VENCIDO (Teste Posi3)", 0) + status_counts.get("🔴 VENCIDO (Insp. Periódica)", 0))
+            st.markdown("---")
 
-            if dashboard_df.empty:
-                st.info("Não há equipamentos SCBA para exibir no dashboard.")
-            else:
-                status_counts = dashboard_df['status_consolidado'].value_counts(
-                )
-                col1, col2, col3, col4 = st.columns(4)
-                col1.metric("✅ Total", len(dashboard_df))
-                col2.metric("🟢 OK", status_counts.get("🟢 OK", 0))
-                col3.metric("🟠 Pendências", status_counts.get(
-                    "🟠 COM PENDÊNCIAS", 0))
-                col4.metric("🔴 Vencidos", status_counts.get(
-                    "🔴 VENCIDO (Teste Posi3)", 0) + status_counts.get("🔴 VENCIDO (Insp. Periódica)", 0))
-                st.markdown("---")
+            for _, row in dashboard_df.iterrows():
+                val_teste_str = pd.to_datetime(row['data_validade']).strftime(
+                    '%d/%m/%Y') if pd.notna(row['data_validade']) else 'N/A'
+                prox_insp_str = pd.to_datetime(row['data_proxima_inspecao']).strftime(
+                    '%d/%m/%Y') if pd.notna(row['data_proxima_inspecao']) else 'N/A'
+                status = row['status_consolidado']
+                expander_title = f"{status} | **S/N:** {row['numero_serie_equipamento']} | **Val. Teste:** {val_teste_str} | **Próx. Insp.:** {prox_insp_str}"
 
-                for _, row in dashboard_df.iterrows():
-                    val_teste_str = pd.to_datetime(row['data_validade']).strftime(
-                        '%d/%m/%Y') if pd.notna(row['data_validade']) else 'N/A'
-                    prox_insp_str = pd.to_datetime(row['data_proxima_inspecao']).strftime(
-                        '%d/%m/%Y') if pd.notna(row['data_proxima_inspecao']) else 'N/A'
-                    status = row['status_consolidado']
-                    expander_title = f"{status} | **S/N:** {row['numero_serie_equipamento']} | **Val. Teste:** {val_teste_str} | **Próx. Insp.:** {prox_insp_str}"
-
-                    with st.expander(expander_title):
-                        data_insp_str = pd.to_datetime(row.get('data_inspecao')).strftime(
-                            '%d/%m/%Y') if pd.notna(row.get('data_inspecao')) else 'N/A'
-                        st.write(
-                            f"**Última Inspeção Periódica:** {data_insp_str} - **Status:** {row.get('status_geral', 'N/A')}")
+                with st.expander(expander_title):
+                    data_insp_str = pd.to_datetime(row.get('data_inspecao')).strftime(
+                        '%d/%m/%Y') if pd.notna(row.get('data_inspecao')) else 'N/A'
+                    st.write(
+                        f"**Última Inspeção Periódica:** {data_insp_str} - **Status:** {row.get('status_geral', 'N/A')}")
 
-                        if status != "🟢 OK":
-                            if st.button("✍️ Registrar Plano de Ação", key=f"action_scba_{row['numero_serie_equipamento']}", use_container_width=True):
-                                action_dialog_scba(
-                                    row['numero_serie_equipamento'], status)
+                    if status != "🟢 OK":
+                        if st.button("✍️ Registrar Plano de Ação", key=f"action_scba_{row['numero_serie_equipamento']}", use_container_width=True):
+                            action_dialog_scba(
+                                row['numero_serie_equipamento'], status)
 
-                        st.markdown(
-                            "**Detalhes da Última Inspeção Periódica:**")
-                    try:
-                        results_json = row.get('resultados_json')
-                        if results_json and pd.notna(results_json):
-                            results = json.loads(results_json)
+                    st.markdown(
+                        "**Detalhes da Última Inspeção Periódica:**")
+                try:
+                    results_json = row.get('resultados_json')
+                    if results_json and pd.notna(results_json):
+                        results = json.loads(results_json)
 
-                            with st.expander("Ver detalhes da inspeção"):
+                        with st.expander("Ver detalhes da inspeção"):
 
-                                st.markdown("""
-                                <style>
-                                .small-font {
-                                    font-size:0.9rem;
-                                    line-height: 1.2;
-                                }
-                                </style>
-                                """, unsafe_allow_html=True)
+                            st.markdown("""
+                            <style>
+                            .small-font {
+                                font-size:0.9rem;
+                                line-height: 1.2;
+                            }
+                            </style>
+                            """, unsafe_allow_html=True)
 
-                                st.markdown(
-                                    "<p class='small-font' style='font-weight: bold;'>Testes Funcionais</p>", unsafe_allow_html=True)
-                                testes = results.get("Testes Funcionais", {})
-                                if testes:
-                                    cols_testes = st.columns(len(testes))
-                                    for i, (teste, resultado) in enumerate(testes.items()):
-                                        icon = "✅" if resultado == "Aprovado" else "❌"
-                                        cols_testes[i].markdown(
-                                            f"<p class='small-font'><b>{teste}</b><br>{icon} {resultado}</p>", unsafe_allow_html=True)
+                            st.markdown(
+                                "<p class='small-font' style='font-weight: bold;'>Testes Funcionais</p>", unsafe_allow_html=True)
+                            testes = results.get("Testes Funcionais", {})
+                            if testes:
+                                cols_testes = st.columns(len(testes))
+                                for i, (teste, resultado) in enumerate(testes.items()):
+                                    icon = "✅" if resultado == "Aprovado" else "❌"
+                                    cols_testes[i].markdown(
+                                        f"<p class='small-font'><b>{teste}</b><br>{icon} {resultado}</p>", unsafe_allow_html=True)
+
+                            st.markdown(
+                                "<p class='small-font' style='font-weight: bold; margin-top: 10px;'>Checklist Visual</p>", unsafe_allow_html=True)
+                            col_cilindro, col_mascara = st.columns(2)
 
+                            with col_cilindro:
                                 st.markdown(
-                                    "<p class='small-font' style='font-weight: bold; margin-top: 10px;'>Checklist Visual</p>", unsafe_allow_html=True)
-                                col_cilindro, col_mascara = st.columns(2)
+                                    "<p class='small-font'><b>Cilindro de Ar</b></p>", unsafe_allow_html=True)
+                                cilindro_itens = results.get(
+                                    "Cilindro", {})
+                                obs_cilindro = cilindro_itens.pop(
+                                    "Observações", "")
+                                for item, status in cilindro_itens.items():
+                                    icon = "✔️" if status == "C" else (
+                                        "❌" if status == "N/C" else "➖")
+                                    st.markdown(
+                                        f"<p class='small-font'>{icon} {item}</p>", unsafe_allow_html=True)
+                                if obs_cilindro:
+                                    st.markdown(
+                                        f"<p class='small-font' style='font-style: italic;'>Obs: {obs_cilindro}</p>", unsafe_allow_html=True)
 
-                                with col_cilindro:
+                            with col_mascara:
+                                st.markdown(
+                                    "<p class='small-font'><b>Máscara Facial</b></p>", unsafe_allow_html=True)
+                                mascara_itens = results.get("Mascara", {})
+                                obs_mascara = mascara_itens.pop(
+                                    "Observações", "")
+                                for item, status in mascara_itens.items():
+                                    icon = "✔️" if status == "C" else (
+                                        "❌" if status == "N/C" else "➖")
                                     st.markdown(
-                                        "<p class='small-font'><b>Cilindro de Ar</b></p>", unsafe_allow_html=True)
-                                    cilindro_itens = results.get(
-                                        "Cilindro", {})
-                                    obs_cilindro = cilindro_itens.pop(
-                                        "Observações", "")
-                                    for item, status in cilindro_itens.items():
-                                        icon = "✔️" if status == "C" else (
-                                            "❌" if status == "N/C" else "➖")
-                                        st.markdown(
-                                            f"<p class='small-font'>{icon} {item}</p>", unsafe_allow_html=True)
-                                    if obs_cilindro:
-                                        st.markdown(
-                                            f"<p class='small-font' style='font-style: italic;'>Obs: {obs_cilindro}</p>", unsafe_allow_html=True)
-
-                                with col_mascara:
+                                        f"<p class='small-font'>{icon} {item}</p>", unsafe_allow_html=True)
+                                if obs_mascara:
                                     st.markdown(
-                                        "<p class='small-font'><b>Máscara Facial</b></p>", unsafe_allow_html=True)
-                                    mascara_itens = results.get("Mascara", {})
-                                    obs_mascara = mascara_itens.pop(
-                                        "Observações", "")
-                                    for item, status in mascara_itens.items():
-                                        icon = "✔️" if status == "C" else (
-                                            "❌" if status == "N/C" else "➖")
-                                        st.markdown(
-                                            f"<p class='small-font'>{icon} {item}</p>", unsafe_allow_html=True)
-                                    if obs_mascara:
-                                        st.markdown(
-                                            f"<p class='small-font' style='font-style: italic;'>Obs: {obs_mascara}</p>", unsafe_allow_html=True)
+                                        f"<p class='small-font' style='font-style: italic;'>Obs: {obs_mascara}</p>", unsafe_allow_html=True)
 
-                        else:
-                            st.info(
-                                "Nenhum detalhe de inspeção periódica encontrado.")
-                    except (json.JSONDecodeError, TypeError, AttributeError):
+                    else:
                         st.info(
                             "Nenhum detalhe de inspeção periódica encontrado.")
+                except (json.JSONDecodeError, TypeError, AttributeError):
+                    st.info(
+                        "Nenhum detalhe de inspeção periódica encontrado.")
 
-    with tab_eyewash:
-        st.header("Dashboard de Chuveiros e Lava-Olhos")
 
-        df_eyewash_history = load_sheet_data("inspecoes_chuveiros_lava_olhos")
+@st.fragment
+def show_eyewash_dashboard():
+    """Aba de chuveiros e lava-olhos."""
+    st.header("Dashboard de Chuveiros e Lava-Olhos")
 
-        if df_eyewash_history.empty:
-            st.warning("Nenhuma inspeção de chuveiro/lava-olhos registrada.")
-        else:
-            dashboard_df = get_eyewash_status_df(df_eyewash_history)
+    df_eyewash_history = load_latest_records(
+        "inspecoes_chuveiros_lava_olhos", "id_equipamento", "data_inspecao")
 
-            status_counts = dashboard_df['status_dashboard'].value_counts()
-            col1, col2, col3, col4 = st.columns(4)
-            col1.metric("✅ Total de Equipamentos", len(dashboard_df))
-            col2.metric("🟢 OK", status_counts.get("🟢 OK", 0))
-            col3.metric("🟠 Com Pendências",
-                        status_counts.get("🟠 COM PENDÊNCIAS", 0))
-            col4.metric("🔴 Vencido", status_counts.get("🔴 VENCIDO", 0))
-            st.markdown("---")
+    if df_eyewash_history.empty:
+        st.warning("Nenhuma inspeção de chuveiro/lava-olhos registrada.")
+    else:
+        dashboard_df = get_eyewash_status_df(df_eyewash_history)
 
-            st.subheader("Lista de Equipamentos e Status")
-            for _, row in dashboard_df.iterrows():
-                status = row['status_dashboard']
-                prox_inspecao = pd.to_datetime(row['data_proxima_inspecao']).strftime(
-                    '%d/%m/%Y') if pd.notna(row['data_proxima_inspecao']) else "N/A"
-                expander_title = f"{status} | **ID:** {row['id_equipamento']} | **Próx. Inspeção:** {prox_inspecao}"
+        status_counts = dashboard_df['status_dashboard'].value_counts()
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("✅ Total de Equipamentos", len(dashboard_df))
+        col2.metric("🟢 OK", status_counts.get("🟢 OK", 0))
+        col3.metric("🟠 Com Pendências",
+                    status_counts.get("🟠 COM PENDÊNCIAS", 0))
+        col4.metric("🔴 Vencido", status_counts.get("🔴 VENCIDO", 0))
+        st.markdown("---")
 
-                with st.expander(expander_title):
-                    ultima_inspecao = pd.to_datetime(row['data_inspecao']).strftime(
-                        '%d/%m/%Y') if pd.notna(row['data_inspecao']) else "N/A"
-                    st.write(
-                        f"**Última inspeção:** {ultima_inspecao} por **{row['inspetor']}**")
-                    st.write(
-                        f"**Plano de Ação Sugerido:** {row.get('plano_de_acao', 'N/A')}")
+        st.subheader("Lista de Equipamentos e Status")
+        for _, row in dashboard_df.iterrows():
+            status = row['status_dashboard']
+            prox_inspecao = pd.to_datetime(row['data_proxima_inspecao']).strftime(
+                '%d/%m/%Y') if pd.notna(row['data_proxima_inspecao']) else "N/A"
+            expander_title = f"{status} | **ID:** {row['id_equipamento']} | **Próx. Inspeção:** {prox_inspecao}"
+
+            with st.expander(expander_title):
+                ultima_inspecao = pd.to_datetime(row['data_inspecao']).strftime(
+                    '%d/%m/%Y') if pd.notna(row['data_inspecao']) else "N/A"
+                st.write(
+                    f"**Última inspeção:** {ultima_inspecao} por **{row['inspetor']}**")
+                st.write(
+                    f"**Plano de Ação Sugerido:** {row.get('plano_de_acao', 'N/A')}")
+
+                if status == "🟠 COM PENDÊNCIAS":
+                    if st.button("✍️ Registrar Ação Corretiva", key=f"action_eyewash_{row['id_equipamento']}"):
+                        action_dialog_eyewash(row.to_dict())
 
-                    if status == "🟠 COM PENDÊNCIAS":
-                        if st.button("✍️ Registrar Ação Corretiva", key=f"action_eyewash_{row['id_equipamento']}"):
-                            action_dialog_eyewash(row.to_dict())
+                st.markdown("---")
+                st.write("**Detalhes da Última Inspeção:**")
+                try:
+                    results_json = row.get('resultados_json')
+                    if results_json and pd.notna(results_json):
+                        results = json.loads(results_json)
+                        non_conformities = {q: status for q, status in results.items() if str(
+                            status).upper() == "NÃO CONFORME"}
+
+                        if non_conformities:
+                            st.write("Itens não conformes encontrados:")
+                            st.table(pd.DataFrame.from_dict(
+                                non_conformities, orient='index', columns=['Status']))
+                        else:
+                            st.success(
+                                "Todos os itens estavam conformes na última inspeção.")
+                    else:
+                        st.info("Nenhum detalhe de inspeção disponível.")
 
-                    st.markdown("---")
-                    st.write("**Detalhes da Última Inspeção:**")
-                    try:
-                        results_json = row.get('resultados_json')
-                        if results_json and pd.notna(results_json):
-                            results = json.loads(results_json)
-                            non_conformities = {q: status for q, status in results.items() if str(
-                                status).upper() == "NÃO CONFORME"}
+                    photo_link = row.get('link_foto_nao_conformidade')
+                    display_storage_image(
+                        photo_link, caption="Foto da Não Conformidade", width=300)
 
-                            if non_conformities:
-                                st.write("Itens não conformes encontrados:")
-                                st.table(pd.DataFrame.from_dict(
-                                    non_conformities, orient='index', columns=['Status']))
-                            else:
-                                st.success(
-                                    "Todos os itens estavam conformes na última inspeção.")
-                        else:
-                            st.info("Nenhum detalhe de inspeção disponível.")
+                except (json.JSONDecodeError, TypeError):
+                    st.error(
+                        "Não foi possível carregar os detalhes da inspeção (formato de dados inválido).")
 
-                        photo_link = row.get('link_foto_nao_conformidade')
-                        display_storage_image(
-                            photo_link, caption="Foto da Não Conformidade", width=300)
 
-                    except (json.JSONDecodeError, TypeError):
-                        st.error(
-                            "Não foi possível carregar os detalhes da inspeção (formato de dados inválido).")
+@st.fragment
+def show_foam_chamber_dashboard():
+    """Aba de câmaras de espuma."""
+    st.header("Dashboard de Câmaras de Espuma")
 
-    with tab_foam:
-        st.header("Dashboard de Câmaras de Espuma")
+    data = load_tables(["inventario_camaras_espuma"],
+                       latest=[("inspecoes_camaras_espuma", "id_camara", "data_inspecao")])
 
-        df_foam_inventory = load_sheet_data("inventario_camaras_espuma")
-        df_foam_history = load_sheet_data("inspecoes_camaras_espuma")
+    df_foam_inventory = data["inventario_camaras_espuma"]
+    df_foam_history = data["inspecoes_camaras_espuma"]
 
-        if df_foam_history.empty:
-            st.warning("Nenhuma inspeção de câmara de espuma registrada.")
+    if df_foam_history.empty:
+        st.warning("Nenhuma inspeção de câmara de espuma registrada.")
+    else:
+        dashboard_df = get_foam_chamber_status_df(df_foam_history)
+
+        if not df_foam_inventory.empty:
+            dashboard_df = pd.merge(
+                dashboard_df,
+                df_foam_inventory[['id_camara', 'localizacao', 'modelo']],
+                on='id_camara',
+                how='left'
+            )
         else:
-            dashboard_df = get_foam_chamber_status_df(df_foam_history)
+            dashboard_df['localizacao'] = 'Localização não definida'
+            dashboard_df['modelo'] = 'N/A'
 
-            if not df_foam_inventory.empty:
-                dashboard_df = pd.merge(
-                    dashboard_df,
-                    df_foam_inventory[['id_camara', 'localizacao', 'modelo']],
-                    on='id_camara',
-                    how='left'
-                )
-            else:
-                dashboard_df['localizacao'] = 'Localização não definida'
-                dashboard_df['modelo'] = 'N/A'
+        dashboard_df['localizacao'] = dashboard_df['localizacao'].fillna(
+            'Localização não definida')
 
-            dashboard_df['localizacao'] = dashboard_df['localizacao'].fillna(
-                'Localização não definida')
+        status_counts = dashboard_df['status_dashboard'].value_counts()
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("✅ Total de Câmaras", len(dashboard_df))
+        col2.metric("🟢 OK", status_counts.get("🟢 OK", 0))
+        col3.metric("🟠 Com Pendências",
+                    status_counts.get("🟠 COM PENDÊNCIAS", 0))
+        col4.metric("🔴 Vencido", status_counts.get("🔴 VENCIDO", 0))
+        st.markdown("---")
 
-            status_counts = dashboard_df['status_dashboard'].value_counts()
-            col1, col2, col3, col4 = st.columns(4)
-            col1.metric("✅ Total de Câmaras", len(dashboard_df))
-            col2.metric("🟢 OK", status_counts.get("🟢 OK", 0))
-            col3.metric("🟠 Com Pendências",
-                        status_counts.get("🟠 COM PENDÊNCIAS", 0))
-            col4.metric("🔴 Vencido", status_counts.get("🔴 VENCIDO", 0))
-            st.markdown("---")
+        st.subheader("Status dos Equipamentos por Localização")
 
-            st.subheader("Status dos Equipamentos por Localização")
+        grouped_by_location = dashboard_df.groupby('localizacao')
 
-            grouped_by_location = dashboard_df.groupby('localizacao')
+        for location, group_df in grouped_by_location:
+            location_status_counts = group_df['status_dashboard'].value_counts(
+            )
+            ok_count = location_status_counts.get("🟢 OK", 0)
+            pending_count = location_status_counts.get(
+                "🟠 COM PENDÊNCIAS", 0)
+            expired_count = location_status_counts.get("🔴 VENCIDO", 0)
 
-            for location, group_df in grouped_by_location:
-                location_status_counts = group_df['status_dashboard'].value_counts(
-                )
-                ok_count = location_status_counts.get("🟢 OK", 0)
-                pending_count = location_status_counts.get(
-                    "🟠 COM PENDÊNCIAS", 0)
-                expired_count = location_status_counts.get("🔴 VENCIDO", 0)
+            expander_title = f"📍 **Local:** {location}  |  (🟢{ok_count} OK, 🟠{pending_count} Pendente, 🔴{expired_count} Vencido)"
 
-                expander_title = f"📍 **Local:** {location}  |  (🟢{ok_count} OK, 🟠{pending_count} Pendente, 🔴{expired_count} Vencido)"
+            with st.expander(expander_title):
+                for _, row in group_df.iterrows():
+                    status = row['status_dashboard']
+                    modelo = row.get('modelo', 'N/A')
+                    ultima_inspecao_str = pd.to_datetime(row['data_inspecao']).strftime(
+                        '%d/%m/%Y') if pd.notna(row['data_inspecao']) else "N/A"
+                    prox_inspecao_str = pd.to_datetime(row['data_proxima_inspecao']).strftime(
+                        '%d/%m/%Y') if pd.notna(row['data_proxima_inspecao']) else "N/A"
 
-                with st.expander(expander_title):
-                    for _, row in group_df.iterrows():
-                        status = row['status_dashboard']
-                        modelo = row.get('modelo', 'N/A')
-                        ultima_inspecao_str = pd.to_datetime(row['data_inspecao']).strftime(
-                            '%d/%m/%Y') if pd.notna(row['data_inspecao']) else "N/A"
-                        prox_inspecao_str = pd.to_datetime(row['data_proxima_inspecao']).strftime(
-                            '%d/%m/%Y') if pd.notna(row['data_proxima_inspecao']) else "N/A"
-
-                        with st.container(border=True):
-                            st.markdown(
-                                f"##### {status} | **ID:** {row['id_camara']} | **Modelo:** {modelo}")
-
-                            cols = st.columns(3)
-                            cols[0].metric("Última Inspeção",
-                                           ultima_inspecao_str)
-                            cols[1].metric("Próxima Inspeção",
-                                           prox_inspecao_str)
-                            cols[2].metric("Tipo da Última Insp.",
-                                           row.get('tipo_inspecao', 'N/A'))
-
-                            st.write(
-                                f"**Plano de Ação Sugerido:** {row['plano_de_acao']}")
-
-                            if status == "🟠 COM PENDÊNCIAS":
-                                if st.button("✍️ Registrar Ação Corretiva", key=f"action_foam_{row['id_camara']}", use_container_width=True):
-                                    action_dialog_foam_chamber(row.to_dict())
-
-                            with st.expander("Ver detalhes da última inspeção"):
-                                try:
-                                    results = json.loads(
-                                        row['resultados_json'])
-                                    non_conformities = {q: status_item for q, status_item in results.items(
-                                    ) if status_item == "Não Conforme"}
-
-                                    if non_conformities:
-                                        st.write(
-                                            "**Itens não conformes encontrados:**")
-                                        st.table(pd.DataFrame.from_dict(
-                                            non_conformities, orient='index', columns=['Status']))
-                                    else:
-                                        st.success(
-                                            "Todos os itens estavam conformes na última inspeção.")
-
-                                    st.markdown("---")
-                                    photo_link = row.get(
-                                        'link_foto_nao_conformidade')
-                                    display_storage_image(
-                                        photo_link, caption="Foto", width=300)
-
-                                except (json.JSONDecodeError, TypeError) as e:
-                                    st.error(
-                                        f"Não foi possível carregar os detalhes da inspeção: {e}")
-
-    with tab_multigas:
-        st.header("Dashboard de Detectores Multigás")
-        df_inventory = load_sheet_data("inventario_multigas")
-        df_inspections = load_sheet_data("inspecoes_multigas")
-
-        if df_inventory.empty:
-            st.warning("Nenhum detector multigás cadastrado.")
-        else:
-            dashboard_df = get_multigas_status_df(df_inventory, df_inspections)
+                    with st.container(border=True):
+                        st.markdown(
+                            f"##### {status} | **ID:** {row['id_camara']} | **Modelo:** {modelo}")
 
-            total_equip = len(dashboard_df)
-            calib_ok = (dashboard_df['status_calibracao'] == '🟢 OK').sum()
-            bump_ok = (dashboard_df['status_bump_test'] == '🟢 OK').sum()
+                        cols = st.columns(3)
+                        cols[0].metric("Última Inspeção",
+                                       ultima_inspecao_str)
+                        cols[1].metric("Próxima Inspeção",
+                                       prox_inspecao_str)
+                        cols[2].metric("Tipo da Última Insp.",
+                                       row.get('tipo_inspecao', 'N/A'))
 
-            col1, col2, col3 = st.columns(3)
-            col1.metric("✅ Total de Detectores", total_equip)
-            col2.metric("🗓️ Calibração Anual OK",
-                        f"{calib_ok} / {total_equip}")
-            col3.metric("💨 Bump Test OK", f"{bump_ok} / {total_equip}")
-            st.markdown("---")
+                        st.write(
+                            f"**Plano de Ação Sugerido:** {row['plano_de_acao']}")
 
-            st.subheader("Lista de Detectores e Status")
-            for _, row in dashboard_df.iterrows():
+                        if status == "🟠 COM PENDÊNCIAS":
+                            if st.button("✍️ Registrar Ação Corretiva", key=f"action_foam_{row['id_camara']}", use_container_width=True):
+                                action_dialog_foam_chamber(row.to_dict())
 
-                status_calibracao = row['status_calibracao']
-                status_bump = row['status_bump_test']
+                        with st.expander("Ver detalhes da última inspeção"):
+                            try:
+                                results = json.loads(
+                                    row['resultados_json'])
+                                non_conformities = {q: status_item for q, status_item in results.items(
+                                ) if status_item == "Não Conforme"}
 
-                geral_icon = "🟢"
-                if "🔴" in status_calibracao or "🟠" in status_bump:
-                    geral_icon = "🔴" if "🔴" in status_calibracao else "🟠"
-                elif "🔵" in status_calibracao or "🔵" in status_bump:
-                    geral_icon = "🔵"
+                                if non_conformities:
+                                    st.write(
+                                        "**Itens não conformes encontrados:**")
+                                    st.table(pd.DataFrame.from_dict(
+                                        non_conformities, orient='index', columns=['Status']))
+                                else:
+                                    st.success(
+                                        "Todos os itens estavam conformes na última inspeção.")
 
-                prox_calibracao_str = pd.to_datetime(row['proxima_calibracao']).strftime(
-                    '%d/%m/%Y') if pd.notna(row['proxima_calibracao']) else "N/A"
+                                st.markdown("---")
+                                photo_link = row.get(
+                                    'link_foto_nao_conformidade')
+                                display_storage_image(
+                                    photo_link, caption="Foto", width=300)
 
-                expander_title = f"{geral_icon} **ID:** {row['id_equipamento']} | **S/N:** {row['numero_serie']}"
+                            except (json.JSONDecodeError, TypeError) as e:
+                                st.error(
+                                    f"Não foi possível carregar os detalhes da inspeção: {e}")
 
-                with st.expander(expander_title):
-                    st.write(
-                        f"**Marca/Modelo:** {row.get('marca', 'N/A')} / {row.get('modelo', 'N/A')}")
 
-                    cols = st.columns(2)
-                    with cols[0]:
-                        st.subheader("Status da Calibração Anual")
-                        st.markdown(f"**Status:** {status_calibracao}")
-                        st.markdown(
-                            f"**Próxima Calibração:** {prox_calibracao_str}")
-                        if status_calibracao != '🟢 OK':
-                            st.warning(
-                                f"**Ação:** Realizar calibração anual do equipamento.")
+@st.fragment
+def show_multigas_dashboard():
+    """Aba de detectores multigás."""
+    st.header("Dashboard de Detectores Multigás")
 
-                    with cols[1]:
-                        st.subheader("Status do Último Bump Test")
-                        ultimo_bump_str = pd.to_datetime(row['data_ultimo_bump_test']).strftime(
-                            '%d/%m/%Y') if pd.notna(row['data_ultimo_bump_test']) else "N/A"
-                        st.markdown(f"**Status:** {status_bump}")
-                        st.markdown(
-                            f"**Data do Último Teste:** {ultimo_bump_str}")
-                        if status_bump == '🟠 REPROVADO':
-                            st.error(
-                                f"**Ação:** Equipamento reprovado. Enviar para manutenção/calibração.")
-                        elif status_bump == '🔵 PENDENTE':
-                            st.info(
-                                f"**Ação:** Realizar novo teste de resposta.")
+    data = load_tables(["inventario_multigas",
+                        ("inspecoes_multigas", MULTIGAS_INSPECTIONS_DASHBOARD_COLUMNS)])
 
-                    if geral_icon != "🟢":
-                        if st.button("✍️ Registrar Ação Corretiva", key=f"action_multigas_{row['id_equipamento']}"):
-                            action_dialog_multigas(row.to_dict())
+    df_inventory = data["inventario_multigas"]
+    df_inspections = data["inspecoes_multigas"]
 
-                    if pd.notna(row.get('link_certificado')):
-                        st.markdown(
-                            f"**[🔗 Ver Último Certificado de Calibração]({row.get('link_certificado')})**")
+    if df_inventory.empty:
+        st.warning("Nenhum detector multigás cadastrado.")
+    else:
+        dashboard_df = get_multigas_status_df(df_inventory, df_inspections)
 
-    with tab_alarms:
-        st.header("Dashboard de Sistemas de Alarme")
+        total_equip = len(dashboard_df)
+        calib_ok = (dashboard_df['status_calibracao'] == '🟢 OK').sum()
+        bump_ok = (dashboard_df['status_bump_test'] == '🟢 OK').sum()
 
-        try:
-            df_alarm_inspections = load_sheet_data("inspecoes_alarmes")
-            df_alarm_inventory = load_sheet_data("inventario_alarmes")
+        col1, col2, col3 = st.columns(3)
+        col1.metric("✅ Total de Detectores", total_equip)
+        col2.metric("🗓️ Calibração Anual OK",
+                    f"{calib_ok} / {total_equip}")
+        col3.metric("💨 Bump Test OK", f"{bump_ok} / {total_equip}")
+        st.markdown("---")
 
-            if df_alarm_inspections.empty and df_alarm_inventory.empty:
-                st.warning("Nenhum sistema de alarme ou inspeção cadastrada.")
-                st.info(
-                    "Cadastre sistemas de alarme na aba 'Alarmes' do menu principal.")
-            elif df_alarm_inspections.empty:
-                st.warning("Nenhuma inspeção de sistema de alarme registrada.")
-            else:
-                with st.expander("📄 Gerar Relatório de Inspeções", expanded=False):
-                    df_alarm_inspections['data_inspecao_dt'] = pd.to_datetime(
-                        df_alarm_inspections['data_inspecao'], errors='coerce')
-
-                    col_type, col_rest = st.columns([1, 3])
-                    with col_type:
-                        report_type = st.radio(
-                            "Tipo de Relatório:",
-                            ["📅 Mensal", "📆 Semestral"],
-                            key="dashboard_alarm_report_type"
-                        )
+        st.subheader("Lista de Detectores e Status")
+        for _, row in dashboard_df.iterrows():
 
-                    with col_rest:
-                        today = datetime.now()
-
-                        if report_type == "📅 Mensal":
-                            col1, col2 = st.columns(2)
-
-                            with col1:
-                                years_with_data = sorted(
-                                    df_alarm_inspections['data_inspecao_dt'].dt.year.unique(), reverse=True)
-                                if not years_with_data:
-                                    years_with_data = [today.year]
-                                selected_year = st.selectbox(
-                                    "Selecione o Ano:", years_with_data, key="dashboard_alarm_report_year")
-
-                            with col2:
-                                months = ["Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
-                                          "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"]
-                                default_month_index = today.month - 1
-                                selected_month_name = st.selectbox("Selecione o Mês:", months,
-                                                                   index=default_month_index, key="dashboard_alarm_report_month")
-
-                            selected_month_number = months.index(
-                                selected_month_name) + 1
-
-                            inspections_selected = df_alarm_inspections[
-                                (df_alarm_inspections['data_inspecao_dt'].dt.year == selected_year) &
-                                (df_alarm_inspections['data_inspecao_dt'].dt.month ==
-                                 selected_month_number)
-                            ].sort_values(by='data_inspecao_dt')
-
-                            period_description = f"{selected_month_name}/{selected_year}"
-                            period_type = "monthly"
-
-                        else:  # Semestral
-                            col1, col2 = st.columns(2)
-
-                            with col1:
-                                years_with_data = sorted(
-                                    df_alarm_inspections['data_inspecao_dt'].dt.year.unique(), reverse=True)
-                                if not years_with_data:
-                                    years_with_data = [today.year]
-                                selected_year = st.selectbox(
-                                    "Selecione o Ano:", years_with_data, key="dashboard_alarm_report_year_sem")
-
-                            with col2:
-                                selected_semester = st.selectbox(
-                                    "Selecione o Semestre:",
-                                    ["1º Semestre (Jan-Jun)",
-                                     "2º Semestre (Jul-Dez)"],
-                                    key="dashboard_alarm_report_semester"
-                                )
-
-                            if "1º" in selected_semester:
-                                semester_months = [1, 2, 3, 4, 5, 6]
-                                semester_num = 1
-                            else:
-                                semester_months = [7, 8, 9, 10, 11, 12]
-                                semester_num = 2
+            status_calibracao = row['status_calibracao']
+            status_bump = row['status_bump_test']
 
-                            inspections_selected = df_alarm_inspections[
-                                (df_alarm_inspections['data_inspecao_dt'].dt.year == selected_year) &
-                                (df_alarm_inspections['data_inspecao_dt'].dt.month.isin(
-                                    semester_months))
-                            ].sort_values(by='data_inspecao_dt')
+            geral_icon = "🟢"
+            if "🔴" in status_calibracao or "🟠" in status_bump:
+                geral_icon = "🔴" if "🔴" in status_calibracao else "🟠"
+            elif "🔵" in status_calibracao or "🔵" in status_bump:
+                geral_icon = "🔵"
 
-                            period_description = f"{semester_num}º Semestre de {selected_year}"
-                            period_type = "biannual"
+            prox_calibracao_str = pd.to_datetime(row['proxima_calibracao']).strftime(
+                '%d/%m/%Y') if pd.notna(row['proxima_calibracao']) else "N/A"
 
-                    if inspections_selected.empty:
-                        st.info(
-                            f"Nenhuma inspeção foi registrada em {period_description}.")
-                    else:
-                        st.write(
-                            f"Encontradas {len(inspections_selected)} inspeções em {period_description}.")
-
-                        if st.button("📄 Gerar e Imprimir Relatório do Dashboard", type="primary", key="dashboard_generate_alarm_report"):
-                            unit_name = st.session_state.get(
-                                'current_unit_name', 'N/A')
-                            report_html = generate_alarm_inspection_html(
-                                inspections_selected,
-                                df_alarm_inventory,
-                                unit_name,
-                                period_type=period_type
-                            )
+            expander_title = f"{geral_icon} **ID:** {row['id_equipamento']} | **S/N:** {row['numero_serie']}"
 
-                            js_code = f"""
-                                const reportHtml = {json.dumps(report_html)};
-                                const printWindow = window.open('', '_blank');
-                                if (printWindow) {{
-                                    printWindow.document.write(reportHtml);
-                                    printWindow.document.close();
-                                    printWindow.focus();
-                                    setTimeout(() => {{ 
-                                        printWindow.print(); 
-                                        printWindow.close(); 
-                                    }}, 500);
-                                }} else {{
-                                    alert('Por favor, desabilite o bloqueador de pop-ups para este site.');
-                                }}
-                            """
-
-                            streamlit_js_eval(
-                                js_expressions=js_code, key="dashboard_print_alarm_report_js")
-                            st.success("Relatório enviado para impressão!")
+            with st.expander(expander_title):
+                st.write(
+                    f"**Marca/Modelo:** {row.get('marca', 'N/A')} / {row.get('modelo', 'N/A')}")
 
-                st.markdown("---")
-
-                dashboard_df = get_alarm_status_df(df_alarm_inspections)
+                cols = st.columns(2)
+                with cols[0]:
+                    st.subheader("Status da Calibração Anual")
+                    st.markdown(f"**Status:** {status_calibracao}")
+                    st.markdown(
+                        f"**Próxima Calibração:** {prox_calibracao_str}")
+                    if status_calibracao != '🟢 OK':
+                        st.warning(
+                            f"**Ação:** Realizar calibração anual do equipamento.")
+
+                with cols[1]:
+                    st.subheader("Status do Último Bump Test")
+                    ultimo_bump_str = pd.to_datetime(row['data_ultimo_bump_test']).strftime(
+                        '%d/%m/%Y') if pd.notna(row['data_ultimo_bump_test']) else "N/A"
+                    st.markdown(f"**Status:** {status_bump}")
+                    st.markdown(
+                        f"**Data do Último Teste:** {ultimo_bump_str}")
+                    if status_bump == '🟠 REPROVADO':
+                        st.error(
+                            f"**Ação:** Equipamento reprovado. Enviar para manutenção/calibração.")
+                    elif status_bump == '🔵 PENDENTE':
+                        st.info(
+                            f"**Ação:** Realizar novo teste de resposta.")
 
-                if not df_alarm_inventory.empty:
-                    dashboard_df = pd.merge(
-                        dashboard_df,
-                        df_alarm_inventory[['id_sistema',
-                                            'localizacao', 'modelo', 'marca']],
-                        on='id_sistema',
-                        how='left'
-                    )
+                if geral_icon != "🟢":
+                    if st.button("✍️ Registrar Ação Corretiva", key=f"action_multigas_{row['id_equipamento']}"):
+                        action_dialog_multigas(row.to_dict())
 
-                status_counts = dashboard_df['status_dashboard'].value_counts()
-                col1, col2, col3, col4 = st.columns(4)
-                col1.metric("✅ Total de Sistemas", len(dashboard_df))
-                col2.metric("🟢 OK", status_counts.get("🟢 OK", 0))
-                col3.metric("🟠 Com Pendências",
-                            status_counts.get("🟠 COM PENDÊNCIAS", 0))
-                col4.metric("🔴 Vencido", status_counts.get("🔴 VENCIDO", 0))
-                st.markdown("---")
+                if pd.notna(row.get('link_certificado')):
+                    st.markdown(
+                        f"**[🔗 Ver Último Certificado de Calibração]({row.get('link_certificado')})**")
 
-                st.subheader("Lista de Sistemas e Status")
-                for _, row in dashboard_df.iterrows():
-                    status = row['status_dashboard']
-                    prox_inspecao = pd.to_datetime(row['data_proxima_inspecao']).strftime(
-                        '%d/%m/%Y') if pd.notna(row['data_proxima_inspecao']) else "N/A"
-                    localizacao = row.get('localizacao', 'Local não definido')
 
-                    expander_title = f"{status} | **ID:** {row['id_sistema']} | **Local:** {localizacao} | **Próx. Inspeção:** {prox_inspecao}"
+@st.fragment
+def show_alarms_dashboard():
+    """Aba de sistemas de alarme."""
+    st.header("Dashboard de Sistemas de Alarme")
 
-                    with st.expander(expander_title):
-                        ultima_inspecao = pd.to_datetime(row['data_inspecao']).strftime(
-                            '%d/%m/%Y') if pd.notna(row['data_inspecao']) else "N/A"
-                        st.write(
-                            f"**Última inspeção:** {ultima_inspecao} por **{row['inspetor']}**")
-                        st.write(
-                            f"**Plano de Ação Sugerido:** {row.get('plano_de_acao', 'N/A')}")
+    data = load_tables(["inspecoes_alarmes", "inventario_alarmes"])
 
-                        if status in ["🟠 COM PENDÊNCIAS", "🔴 VENCIDO"]:
-                            if st.button("✍️ Registrar Ação Corretiva", key=f"action_alarm_{row['id_sistema']}"):
-                                action_dialog_alarm(row.to_dict())
+    try:
+        df_alarm_inspections = data["inspecoes_alarmes"]
+        df_alarm_inventory = data["inventario_alarmes"]
 
-                        st.markdown("---")
-                        st.write("**Detalhes da Última Inspeção:**")
-                        try:
-                            results_json = row.get('resultados_json')
-                            if results_json and pd.notna(results_json):
-                                results = json.loads(results_json)
+        if df_alarm_inspections.empty and df_alarm_inventory.empty:
+            st.warning("Nenhum sistema de alarme ou inspeção cadastrada.")
+            st.info(
+                "Cadastre sistemas de alarme na aba 'Alarmes' do menu principal.")
+        elif df_alarm_inspections.empty:
+            st.warning("Nenhuma inspeção de sistema de alarme registrada.")
+        else:
+            with st.expander("📄 Gerar Relatório de Inspeções", expanded=False):
+                df_alarm_inspections['data_inspecao_dt'] = pd.to_datetime(
+                    df_alarm_inspections['data_inspecao'], errors='coerce')
+
+                col_type, col_rest = st.columns([1, 3])
+                with col_type:
+                    report_type = st.radio(
+                        "Tipo de Relatório:",
+                        ["📅 Mensal", "📆 Semestral"],
+                        key="dashboard_alarm_report_type"
+                    )
 
-                                non_conformities = {
-                                    q: status for q, status in results.items() if status == "Não Conforme"}
+                with col_rest:
+                    today = datetime.now()
+
+                    if report_type == "📅 Mensal":
+                        col1, col2 = st.columns(2)
+
+                        with col1:
+                            years_with_data = sorted(
+                                df_alarm_inspections['data_inspecao_dt'].dt.year.unique(), reverse=True)
+                            if not years_with_data:
+                                years_with_data = [today.year]
+                            selected_year = st.selectbox(
+                                "Selecione o Ano:", years_with_data, key="dashboard_alarm_report_year")
+
+                        with col2:
+                            months = ["Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
+                                      "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"]
+                            default_month_index = today.month - 1
+                            selected_month_name = st.selectbox("Selecione o Mês:", months,
+                                                               index=default_month_index, key="dashboard_alarm_report_month")
+
+                        selected_month_number = months.index(
+                            selected_month_name) + 1
+
+                        inspections_selected = df_alarm_inspections[
+                            (df_alarm_inspections['data_inspecao_dt'].dt.year == selected_year) &
+                            (df_alarm_inspections['data_inspecao_dt'].dt.month ==
+                             selected_month_number)
+                        ].sort_values(by='data_inspecao_dt')
+
+                        period_description = f"{selected_month_name}/{selected_year}"
+                        period_type = "monthly"
+
+                    else:  # Semestral
+                        col1, col2 = st.columns(2)
+
+                        with col1:
+                            years_with_data = sorted(
+                                df_alarm_inspections['data_inspecao_dt'].dt.year.unique(), reverse=True)
+                            if not years_with_data:
+                                years_with_data = [today.year]
+                            selected_year = st.selectbox(
+                                "Selecione o Ano:", years_with_data, key="dashboard_alarm_report_year_sem")
+
+                        with col2:
+                            selected_semester = st.selectbox(
+                                "Selecione o Semestre:",
+                                ["1º Semestre (Jan-Jun)",
+                                 "2º Semestre (Jul-Dez)"],
+                                key="dashboard_alarm_report_semester"
+                            )
 
-                                if non_conformities:
-                                    st.write(
-                                        "Itens não conformes encontrados:")
-                                    st.table(pd.DataFrame.from_dict(
-                                        non_conformities, orient='index', columns=['Status']))
-                                else:
-                                    st.success(
-                                        "Todos os itens estavam conformes na última inspeção.")
-                            else:
-                                st.info(
-                                    "Nenhum detalhe de inspeção disponível.")
+                        if "1º" in selected_semester:
+                            semester_months = [1, 2, 3, 4, 5, 6]
+                            semester_num = 1
+                        else:
+                            semester_months = [7, 8, 9, 10, 11, 12]
+                            semester_num = 2
 
-                            photo_link = row.get('link_foto_nao_conformidade')
-                            display_storage_image(
-                                photo_link, caption="Foto da Não Conformidade", width=300)
+                        inspections_selected = df_alarm_inspections[
+                            (df_alarm_inspections['data_inspecao_dt'].dt.year == selected_year) &
+                            (df_alarm_inspections['data_inspecao_dt'].dt.month.isin(
+                                semester_months))
+                        ].sort_values(by='data_inspecao_dt')
 
-                        except (json.JSONDecodeError, TypeError):
-                            st.error(
-                                "Não foi possível carregar os detalhes da inspeção (formato de dados inválido).")
+                        period_description = f"{semester_num}º Semestre de {selected_year}"
+                        period_type = "biannual"
 
-        except Exception as e:
-            st.error(f"Erro ao carregar os dados dos sistemas de alarme: {e}")
-            import traceback
-            st.error(f"Detalhes do erro: {traceback.format_exc()}")
+                if inspections_selected.empty:
+                    st.info(
+                        f"Nenhuma inspeção foi registrada em {period_description}.")
+                else:
+                    st.write(
+                        f"Encontradas {len(inspections_selected)} inspeções em {period_description}.")
+
+                    if st.button("📄 Gerar e Imprimir Relatório do Dashboard", type="primary", key="dashboard_generate_alarm_report"):
+                        unit_name = st.session_state.get(
+                            'current_unit_name', 'N/A')
+                        report_html = generate_alarm_inspection_html(
+                            inspections_selected,
+                            df_alarm_inventory,
+                            unit_name,
+                            period_type=period_type
+                        )
 
-    with tab_canhoes:
-        st.header("Dashboard de Canhões Monitores")
+                        js_code = f"""
+                            const reportHtml = {json.dumps(report_html)};
+                            const printWindow = window.open('', '_blank');
+                            if (printWindow) {{
+                                printWindow.document.write(reportHtml);
+                                printWindow.document.close();
+                                printWindow.focus();
+                                setTimeout(() => {{ 
+                                    printWindow.print(); 
+                                    printWindow.close(); 
+                                }}, 500);
+                            }} else {{
+                                alert('Por favor, desabilite o bloqueador de pop-ups para este site.');
+                            }}
+                        """
+
+                        streamlit_js_eval(
+                            js_expressions=js_code, key="dashboard_print_alarm_report_js")
+                        st.success("Relatório enviado para impressão!")
 
-        df_inventory = load_sheet_data("inventario_canhoes_monitores")
-        df_inspections = load_sheet_data("inspecoes_canhoes_monitores")
+            st.markdown("---")
 
-        if df_inspections.empty:
-            st.warning("Nenhuma inspeção de canhão monitor registrada.")
-        else:
-            dashboard_df = get_canhao_monitor_status_df(df_inspections)
+            dashboard_df = get_alarm_status_df(df_alarm_inspections)
 
-            if not df_inventory.empty:
+            if not df_alarm_inventory.empty:
                 dashboard_df = pd.merge(
                     dashboard_df,
-                    df_inventory[['id_equipamento', 'localizacao', 'modelo']],
-                    on='id_equipamento',
+                    df_alarm_inventory[['id_sistema',
+                                        'localizacao', 'modelo', 'marca']],
+                    on='id_sistema',
                     how='left'
                 )
-            else:
-                dashboard_df['localizacao'] = 'N/A'
-                dashboard_df['modelo'] = 'N/A'
 
             status_counts = dashboard_df['status_dashboard'].value_counts()
             col1, col2, col3, col4 = st.columns(4)
-            col1.metric("✅ Total de Canhões", len(dashboard_df))
+            col1.metric("✅ Total de Sistemas", len(dashboard_df))
             col2.metric("🟢 OK", status_counts.get("🟢 OK", 0))
             col3.metric("🟠 Com Pendências",
                         status_counts.get("🟠 COM PENDÊNCIAS", 0))
             col4.metric("🔴 Vencido", status_counts.get("🔴 VENCIDO", 0))
             st.markdown("---")
 
-            st.subheader("Lista de Equipamentos e Status")
+            st.subheader("Lista de Sistemas e Status")
             for _, row in dashboard_df.iterrows():
                 status = row['status_dashboard']
                 prox_inspecao = pd.to_datetime(row['data_proxima_inspecao']).strftime(
                     '%d/%m/%Y') if pd.notna(row['data_proxima_inspecao']) else "N/A"
                 localizacao = row.get('localizacao', 'Local não definido')
 
-                expander_title = f"{status} | **ID:** {row['id_equipamento']} | **Local:** {localizacao} | **Próx. Inspeção:** {prox_inspecao}"
+                expander_title = f"{status} | **ID:** {row['id_sistema']} | **Local:** {localizacao} | **Próx. Inspeção:** {prox_inspecao}"
 
                 with st.expander(expander_title):
                     ultima_inspecao = pd.to_datetime(row['data_inspecao']).strftime(
                         '%d/%m/%Y') if pd.notna(row['data_inspecao']) else "N/A"
                     st.write(
-                        f"**Última inspeção:** {ultima_inspecao} por **{row['inspetor']}** ({row['tipo_inspecao']})")
+                        f"**Última inspeção:** {ultima_inspecao} por **{row['inspetor']}**")
                     st.write(
                         f"**Plano de Ação Sugerido:** {row.get('plano_de_acao', 'N/A')}")
 
                     if status in ["🟠 COM PENDÊNCIAS", "🔴 VENCIDO"]:
-                        if st.button("✍️ Registrar Ação Corretiva", key=f"action_canhao_{row['id_equipamento']}"):
-                            action_dialog_canhao_monitor(row.to_dict())
+                        if st.button("✍️ Registrar Ação Corretiva", key=f"action_alarm_{row['id_sistema']}"):
+                            action_dialog_alarm(row.to_dict())
 
                     st.markdown("---")
                     st.write("**Detalhes da Última Inspeção:**")
@@ -2087,18 +2005,21 @@ def show_page():
                         results_json = row.get('resultados_json')
                         if results_json and pd.notna(results_json):
                             results = json.loads(results_json)
-                            non_conformities = {q: s for q, s in results.items() if s in [
-                                "Não Conforme", "Reprovado"]}
+
+                            non_conformities = {
+                                q: status for q, status in results.items() if status == "Não Conforme"}
 
                             if non_conformities:
-                                st.write("Itens não conformes encontrados:")
+                                st.write(
+                                    "Itens não conformes encontrados:")
                                 st.table(pd.DataFrame.from_dict(
                                     non_conformities, orient='index', columns=['Status']))
                             else:
                                 st.success(
                                     "Todos os itens estavam conformes na última inspeção.")
                         else:
-                            st.info("Nenhum detalhe de inspeção disponível.")
+                            st.info(
+                                "Nenhum detalhe de inspeção disponível.")
 
                         photo_link = row.get('link_foto_nao_conformidade')
                         display_storage_image(
@@ -2106,4 +2027,130 @@ def show_page():
 
                     except (json.JSONDecodeError, TypeError):
                         st.error(
-                            "Não foi possível carregar os detalhes da inspeção.")
+                            "Não foi possível carregar os detalhes da inspeção (formato de dados inválido).")
+
+    except Exception as e:
+        st.error(f"Erro ao carregar os dados dos sistemas de alarme: {e}")
+        import traceback
+        st.error(f"Detalhes do erro: {traceback.format_exc()}")
+
+
+@st.fragment
+def show_canhoes_dashboard():
+    """Aba de canhões monitores."""
+    st.header("Dashboard de Canhões Monitores")
+
+    data = load_tables(["inventario_canhoes_monitores"],
+                       latest=[("inspecoes_canhoes_monitores", "id_equipamento", "data_inspecao")])
+
+    df_inventory = data["inventario_canhoes_monitores"]
+    df_inspections = data["inspecoes_canhoes_monitores"]
+
+    if df_inspections.empty:
+        st.warning("Nenhuma inspeção de canhão monitor registrada.")
+    else:
+        dashboard_df = get_canhao_monitor_status_df(df_inspections)
+
+        if not df_inventory.empty:
+            dashboard_df = pd.merge(
+                dashboard_df,
+                df_inventory[['id_equipamento', 'localizacao', 'modelo']],
+                on='id_equipamento',
+                how='left'
+            )
+        else:
+            dashboard_df['localizacao'] = 'N/A'
+            dashboard_df['modelo'] = 'N/A'
+
+        status_counts = dashboard_df['status_dashboard'].value_counts()
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("✅ Total de Canhões", len(dashboard_df))
+        col2.metric("🟢 OK", status_counts.get("🟢 OK", 0))
+        col3.metric("🟠 Com Pendências",
+                    status_counts.get("🟠 COM PENDÊNCIAS", 0))
+        col4.metric("🔴 Vencido", status_counts.get("🔴 VENCIDO", 0))
+        st.markdown("---")
+
+        st.subheader("Lista de Equipamentos e Status")
+        for _, row in dashboard_df.iterrows():
+            status = row['status_dashboard']
+            prox_inspecao = pd.to_datetime(row['data_proxima_inspecao']).strftime(
+                '%d/%m/%Y') if pd.notna(row['data_proxima_inspecao']) else "N/A"
+            localizacao = row.get('localizacao', 'Local não definido')
+
+            expander_title = f"{status} | **ID:** {row['id_equipamento']} | **Local:** {localizacao} | **Próx. Inspeção:** {prox_inspecao}"
+
+            with st.expander(expander_title):
+                ultima_inspecao = pd.to_datetime(row['data_inspecao']).strftime(
+                    '%d/%m/%Y') if pd.notna(row['data_inspecao']) else "N/A"
+                st.write(
+                    f"**Última inspeção:** {ultima_inspecao} por **{row['inspetor']}** ({row['tipo_inspecao']})")
+                st.write(
+                    f"**Plano de Ação Sugerido:** {row.get('plano_de_acao', 'N/A')}")
+
+                if status in ["🟠 COM PENDÊNCIAS", "🔴 VENCIDO"]:
+                    if st.button("✍️ Registrar Ação Corretiva", key=f"action_canhao_{row['id_equipamento']}"):
+                        action_dialog_canhao_monitor(row.to_dict())
+
+                st.markdown("---")
+                st.write("**Detalhes da Última Inspeção:**")
+                try:
+                    results_json = row.get('resultados_json')
+                    if results_json and pd.notna(results_json):
+                        results = json.loads(results_json)
+                        non_conformities = {q: s for q, s in results.items() if s in [
+                            "Não Conforme", "Reprovado"]}
+
+                        if non_conformities:
+                            st.write("Itens não conformes encontrados:")
+                            st.table(pd.DataFrame.from_dict(
+                                non_conformities, orient='index', columns=['Status']))
+                        else:
+                            st.success(
+                                "Todos os itens estavam conformes na última inspeção.")
+                    else:
+                        st.info("Nenhum detalhe de inspeção disponível.")
+
+                    photo_link = row.get('link_foto_nao_conformidade')
+                    display_storage_image(
+                        photo_link, caption="Foto da Não Conformidade", width=300)
+
+                except (json.JSONDecodeError, TypeError):
+                    st.error(
+                        "Não foi possível carregar os detalhes da inspeção.")
+
+
+# Seções do dashboard: apenas a seção selecionada carrega dados e calcula status
+DASHBOARD_SECTIONS = {
+    "📘 Como Usar": instru_dash,
+    "🔥 Extintores": show_extinguishers_dashboard,
+    "💧 Mangueiras": show_hoses_dashboard,
+    "🧯 Abrigos": show_shelters_dashboard,
+    "💨 C. Autônomo": show_scba_dashboard,
+    "🚿 Chuveiros/Lava-Olhos": show_eyewash_dashboard,
+    "☁️ Câmaras de Espuma": show_foam_chamber_dashboard,
+    "💨 Multigás": show_multigas_dashboard,
+    "🔔 Alarmes": show_alarms_dashboard,
+    "🌊 Canhões Monitores": show_canhoes_dashboard,
+}
+DEFAULT_DASHBOARD_SECTION = "📘 Como Usar"
+
+
+def show_page():
+
+    st.title("Situação Atual dos Equipamentos de Emergência")
+
+    if st.button("Limpar Cache e Recarregar Dados"):
+        clear_data_cache()
+        st.rerun()
+
+    selected_section = st.segmented_control(
+        "Equipamento",
+        options=list(DASHBOARD_SECTIONS),
+        default=DEFAULT_DASHBOARD_SECTION,
+        key="dashboard_section",
+        label_visibility="collapsed"
+    )
+
+    # segmented_control retorna None quando a opção ativa é desmarcada
+    DASHBOARD_SECTIONS[selected_section or DEFAULT_DASHBOARD_SECTION]()
@@ -26,7 +26,7 @@ from config.table_names import (
     LOG_CANHAO_MONITOR_SHEET_NAME
 )
 from auth.auth_utils import check_user_access
-from operations.history import load_sheet_data
+from operations.history import load_sheet_data, clear_data_cache
 import streamlit as st
 import pandas as pd
 import sys
@@ -285,7 +285,7 @@ def show_page():
         "Consulte o histórico de registros e ações para todos os equipamentos do sistema.")
 
     if st.button("Limpar Cache e Recarregar Dados"):
-        st.cache_data.clear()
+        clear_data_cache()
         st.rerun()
 
     tab_registros, tab_logs, tab_disposals = st.tabs([
@@ -205,7 +205,6 @@ def show_page():
                                             #st.balloons()
                                             pass
 
-                                        st.cache_data.clear()
                                         st.rerun()
                                     else:
                                         st.error(
@@ -276,7 +275,6 @@ def show_page():
                                     st.info(
                                         f"Observações registradas: {additional_info}")
 
-                                st.cache_data.clear()
 
     with tab_quick_register:
         st.header("Cadastro Rápido de Sistema")
@@ -328,4 +326,3 @@ def show_page():
                                 st.success(
                                     f"Sistema '{quick_id}' cadastrado rapidamente!")
                                 #st.balloons()
-                                st.cache_data.clear()
@@ -1,5 +1,6 @@
-from reports.foam_chamber_report import generate_foam_chamber_consolidated_report
-from operations.history import load_sheet_data
+from reports.foam_chamber_report import submit_foam_chamber_consolidated_report
+from reports.pdf_render_service import show_pdf_render_job
+from operations.history import load_sheet_data, clear_data_cache
 from operations.instrucoes import instru_foam_chamber
 from config.page_config import set_page_config
 from auth.auth_utils import (
@@ -162,7 +163,6 @@ def show_page():
                                         st.success(
                                             f"Inspeção '{inspection_type}' para a câmara '{selected_chamber_id}' salva com sucesso!")
                                         #st.balloons() if not has_issues else None
-                                        st.cache_data.clear()
                                         st.rerun()
                                     else:
                                         st.error(
@@ -221,7 +221,6 @@ def show_page():
                                 if additional_info:
                                     st.info(
                                         f"Observações registradas: {additional_info}")
-                                st.cache_data.clear()
 
     with tab_manual_register:
         st.header("Cadastro Rápido de Câmara")
@@ -279,7 +278,6 @@ def show_page():
                                 st.success(
                                     f"Câmara '{quick_id}' ({quick_size}) cadastrada rapidamente!")
                                 #st.balloons()
-                                st.cache_data.clear()
 
     with tab_report:
         st.header("📊 Relatório Consolidado de Câmaras de Espuma")
@@ -303,7 +301,7 @@ def show_page():
 
         with col2:
             if st.button("🔄 Atualizar Dados", use_container_width=True):
-                st.cache_data.clear()
+                clear_data_cache()
                 st.rerun()
 
         st.markdown("---")
@@ -339,20 +337,13 @@ def show_page():
 
             with col2:
                 if st.button("📄 Gerar Relatório PDF Consolidado", type="primary", use_container_width=True):
-                    with st.spinner("Gerando relatório em PDF... Isso pode levar alguns segundos."):
-                        pdf_file = generate_foam_chamber_consolidated_report(
-                            inspections_df, inventory_df)
-
-                        if pdf_file:
-                            st.success("✅ Relatório gerado com sucesso!")
-
-                            current_date = datetime.now().strftime('%Y%m%d_%H%M')
-                            filename = f"Relatorio_Camaras_Espuma_{current_date}.pdf"
-
-                            st.download_button(
-                                label="⬇️ Baixar Relatório PDF",
-                                data=pdf_file,
-                                file_name=filename,
-                                mime="application/pdf",
-                                use_container_width=True
-                            )
+                    # Renderização em segundo plano: a página continua respondendo
+                    job_id = submit_foam_chamber_consolidated_report(
+                        inspections_df, inventory_df)
+                    if job_id:
+                        st.session_state['foam_report_job'] = job_id
+                        st.session_state['foam_report_file_name'] = \
+                            f"Relatorio_Camaras_Espuma_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf"
+
+                show_pdf_render_job(
+                    'foam_report_job', st.session_state.get('foam_report_file_name', "Relatorio_Camaras_Espuma.pdf"))
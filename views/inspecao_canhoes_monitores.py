@@ -135,7 +135,6 @@ def show_page():
                                             f"Registro para '{selected_id}' salvo com sucesso!")
                                         if not has_issues:
                                             pass
-                                        st.cache_data.clear()
                                     else:
                                         st.error("Falha ao salvar o registro.")
 
@@ -170,4 +169,3 @@ def show_page():
                             if save_new_canhao_monitor(new_id, new_location, new_brand, new_model):
                                 st.success(
                                     f"Canhão Monitor '{new_id}' cadastrado com sucesso!")
-                                st.cache_data.clear()
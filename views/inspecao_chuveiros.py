@@ -106,7 +106,6 @@ def show_page():
                                         st.success(
                                             f"Inspeção para '{selected_equipment_id}' salva com sucesso!")
                                         #st.balloons() if not non_conformities_found else None
-                                        st.cache_data.clear()
                                         st.rerun()
                                     else:
                                         st.error(
@@ -170,7 +169,6 @@ def show_page():
                                 if additional_notes:
                                     st.info(
                                         f"Observações registradas: {additional_notes}")
-                                st.cache_data.clear()
 
     with tab_quick_register:
         st.header("Cadastro Rápido de Equipamento")
@@ -220,4 +218,3 @@ def show_page():
                                 st.success(
                                     f"Equipamento '{quick_id}' ({quick_type}) cadastrado rapidamente!")
                                 #st.balloons()
-                                st.cache_data.clear()
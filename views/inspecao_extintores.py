@@ -27,9 +27,8 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 set_page_config()
 
 
-@st.cache_data(ttl=300)
 def load_page_data():
-    """Carrega dados dos extintores do Supabase"""
+    """Carrega dados dos extintores do Supabase (cache por tenant em load_sheet_data)"""
     from operations.history import load_sheet_data
     from config.table_names import EXTINGUISHER_SHEET_NAME
     
@@ -177,7 +176,6 @@ def show_page():
                             #st.balloons()
                             st.session_state.batch_step = 'start'
                             st.session_state.processed_data = None
-                            st.cache_data.clear()
                             st.rerun()
                         else:
                             st.error(
@@ -574,7 +572,6 @@ def show_page():
                                     # Reset para próxima inspeção
                                     st.session_state.qr_step = 'start'
                                     st.session_state.location = None
-                                    st.cache_data.clear()
                                     st.rerun()
                                 else:
                                     st.error(
@@ -635,7 +632,6 @@ def show_page():
                             if save_new_extinguisher(details):
                                 st.success(
                                     f"Extintor '{numero_id}' cadastrado com sucesso!")
-                                st.cache_data.clear()
                                 st.rerun()
 
             st.markdown("---")
@@ -668,7 +664,6 @@ def show_page():
                                 if save_inspection(new_record):
                                     log_action("ATUALIZOU_EXTINTOR", f"ID: {ext_id_to_edit}, Novo Selo: {edit_selo_inmetro}")
                                     st.success(f"Extintor '{ext_id_to_edit}' atualizado com sucesso!")
-                                    st.cache_data.clear()
                                     st.rerun()
 
     # Nova aba para cadastro manual de inspeções
@@ -949,7 +944,6 @@ def show_page():
                                     st.session_state['manual_lat_captured'] = None
                                     st.session_state['manual_lon_captured'] = None
 
-                                    st.cache_data.clear()
                                     st.rerun()
                             except Exception as e:
                                 st.error(f"❌ Erro ao salvar a inspeção: {e}")
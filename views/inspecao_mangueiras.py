@@ -62,31 +62,40 @@ def show_page():
         else:
             st.session_state.setdefault('hose_step', 'start')
             st.session_state.setdefault('hose_processed_data', None)
-            st.session_state.setdefault('hose_uploaded_pdf', None)
+            st.session_state.setdefault('hose_uploaded_pdfs', [])
 
-            st.subheader("1. Faça o Upload do Certificado de Teste")
+            st.subheader("1. Faça o Upload dos Certificados de Teste")
             st.info(
-                "O sistema analisará o PDF, extrairá os dados de todas as mangueiras e preparará os registros para salvamento.")
-
-            uploaded_pdf = st.file_uploader("Escolha o certificado PDF", type=[
-                                            "pdf"], key="hose_pdf_uploader")
-            if uploaded_pdf:
-                st.session_state.hose_uploaded_pdf = uploaded_pdf
-
-            if st.session_state.hose_uploaded_pdf and st.button("🔎 Analisar Certificado com IA"):
-                with st.spinner("Analisando o documento..."):
-                    prompt = get_hose_inspection_prompt()
-                    extracted_data = pdf_qa.extract_structured_data(
-                        st.session_state.hose_uploaded_pdf, prompt)
-
-                    if extracted_data and "mangueiras" in extracted_data and isinstance(extracted_data["mangueiras"], list):
-                        st.session_state.hose_processed_data = extracted_data["mangueiras"]
-                        st.session_state.hose_step = 'confirm'
-                        st.rerun()
+                "O sistema analisará os PDFs (vários certificados são analisados em paralelo), extrairá os dados de todas as mangueiras e preparará os registros para salvamento.")
+
+            uploaded_pdfs = st.file_uploader("Escolha o(s) certificado(s) PDF", type=[
+                                             "pdf"], key="hose_pdf_uploader", accept_multiple_files=True)
+            if uploaded_pdfs:
+                st.session_state.hose_uploaded_pdfs = uploaded_pdfs
+
+            if st.session_state.hose_uploaded_pdfs and st.button("🔎 Analisar Certificados com IA"):
+                prompt = get_hose_inspection_prompt()
+                results = pdf_qa.extract_structured_data_many(
+                    st.session_state.hose_uploaded_pdfs, prompt)
+
+                processed_data = []
+                invalid_files = []
+                for pdf_file, extracted_data in zip(st.session_state.hose_uploaded_pdfs, results):
+                    if isinstance(extracted_data, dict) and isinstance(extracted_data.get("mangueiras"), list):
+                        # Cada mangueira guarda o certificado de origem, usado no link ao salvar
+                        processed_data.extend({**record, "arquivo_certificado": pdf_file.name}
+                                              for record in extracted_data["mangueiras"])
                     else:
-                        st.error(
-                            "A IA não conseguiu extrair os dados no formato esperado. Verifique o documento.")
-                        st.json(extracted_data)
+                        invalid_files.append(pdf_file.name)
+
+                if processed_data:
+                    st.session_state.hose_processed_data = processed_data
+                    st.session_state.hose_step = 'confirm'
+                if invalid_files:
+                    st.error(
+                        f"A IA não conseguiu extrair os dados no formato esperado de: {', '.join(invalid_files)}. Verifique o(s) documento(s).")
+                elif processed_data:
+                    st.rerun()
 
             if st.session_state.hose_step == 'confirm' and st.session_state.hose_processed_data:
                 st.subheader(
@@ -97,14 +106,20 @@ def show_page():
                 if st.button("💾 Confirmar e Salvar Registros", type="primary", use_container_width=True):
                     with st.spinner("Salvando registros em lote..."):
                         db_client = get_supabase_client()
-                        pdf_name = f"Certificado_Mangueiras_{date.today().isoformat()}_{st.session_state.hose_uploaded_pdf.name}"
-                        pdf_link = upload_evidence_photo(
-                            st.session_state.hose_uploaded_pdf, pdf_name, "certificados")
-
-                        if not pdf_link:
-                            st.error(
-                                "Falha ao fazer o upload do certificado. Os dados não foram salvos.")
-                            st.stop()
+                        source_files = {record.get('arquivo_certificado')
+                                        for record in st.session_state.hose_processed_data}
+                        pdf_links = {}
+                        for pdf_file in st.session_state.hose_uploaded_pdfs:
+                            if pdf_file.name not in source_files or pdf_file.name in pdf_links:
+                                continue
+                            pdf_name = f"Certificado_Mangueiras_{date.today().isoformat()}_{pdf_file.name}"
+                            pdf_links[pdf_file.name] = upload_evidence_photo(
+                                pdf_file, pdf_name, "certificados")
+
+                            if not pdf_links[pdf_file.name]:
+                                st.error(
+                                    f"Falha ao fazer o upload do certificado {pdf_file.name}. Os dados não foram salvos.")
+                                st.stop()
 
                         hose_records = []
 
@@ -135,7 +150,7 @@ def show_page():
                                 'data_inspecao': inspection_date_str,
                                 'data_proximo_teste': next_test_date_str,
                                 'resultado': record.get('resultado'),
-                                'link_certificado_pdf': pdf_link,
+                                'link_certificado_pdf': pdf_links.get(record.get('arquivo_certificado')),
                                 'registrado_por': get_user_display_name(),
                                 'empresa_executante': record.get('empresa_executante'),
                                 'resp_tecnico_certificado': record.get('inspetor_responsavel')
@@ -151,8 +166,7 @@ def show_page():
 
                             st.session_state.hose_step = 'start'
                             st.session_state.hose_processed_data = None
-                            st.session_state.hose_uploaded_pdf = None
-                            st.cache_data.clear()
+                            st.session_state.hose_uploaded_pdfs = []
                             st.rerun()
                         except Exception as e:
                             st.error(
@@ -220,7 +234,6 @@ def show_page():
                         if save_new_hose(hose_data):
                             st.success(
                                 f"Mangueira '{hose_id}' cadastrada com sucesso!")
-                            st.cache_data.clear()
                             #st.balloons()
 
     with tab_shelters:
@@ -301,7 +314,6 @@ def show_page():
                             st.session_state.shelter_step = 'start'
                             st.session_state.shelter_processed_data = None
                             st.session_state.shelter_uploaded_pdf = None
-                            st.cache_data.clear()
                             st.rerun()
 
                         except Exception as e:
@@ -384,7 +396,6 @@ def show_page():
                             if save_shelter_inventory(shelter_id, client, local, inventory_items):
                                 st.success(
                                     f"Abrigo '{shelter_id}' cadastrado com sucesso!")
-                                st.cache_data.clear()
                                 #st.balloons()
 
             st.markdown("---")
@@ -461,7 +472,6 @@ def show_page():
                                     st.success(
                                         f"Inspeção do abrigo '{selected_shelter_id}' salva com sucesso como '{overall_status}'!")
                                     #st.balloons() if not has_issues else None
-                                    st.cache_data.clear()
                                 else:
                                     st.error(
                                         "Ocorreu um erro ao salvar a inspeção.")
@@ -135,7 +135,6 @@ def show_page():
                             st.session_state.calib_data = None
                             st.session_state.calib_status = None
                             st.session_state.calib_uploaded_pdf = None
-                            st.cache_data.clear()
                             st.rerun()
 
     with tab_inspection:
@@ -341,7 +340,6 @@ def show_page():
                                 if save_multigas_inspection(inspection_data):
                                     st.success(
                                         f"Teste para o detector '{selected_id}' salvo com sucesso!")
-                                    st.cache_data.clear()
                                     keys_to_clear = [
                                         'new_lel', 'new_o2', 'new_h2s', 'new_co']
                                     for key in keys_to_clear:
@@ -402,7 +400,6 @@ def show_page():
                             st.success(
                                 f"Detector '{detector_id}' cadastrado com sucesso!")
                             #st.balloons()
-                            st.cache_data.clear()
 
     with tab_manual_register:
         st.header("Cadastro Manual Simplificado")
@@ -449,4 +446,3 @@ def show_page():
                         if save_new_multigas_detector(simple_id, simple_brand, simple_model, simple_serial, default_cylinder):
                             st.success(
                                 f"Detector '{simple_id}' cadastrado com sucesso com valores padrão de cilindro!")
-                            st.cache_data.clear()
@@ -151,7 +151,6 @@ def show_page():
                             st.session_state.scba_step = 'start'
                             st.session_state.scba_processed_data = None
                             st.session_state.scba_uploaded_pdf = None
-                            st.cache_data.clear()
                             st.rerun()
 
     with tab_manual_test:
@@ -242,7 +241,6 @@ def show_page():
                             st.success(
                                 f"Teste para o SCBA '{numero_serie}' registrado com sucesso!")
                             #st.balloons()
-                            st.cache_data.clear()
 
     with tab_quality_air:
         st.header("Registrar Laudo de Qualidade do Ar com IA")
@@ -323,7 +321,6 @@ def show_page():
                                     st.session_state.airq_step = 'start'
                                     st.session_state.airq_processed_data = None
                                     st.session_state.airq_uploaded_pdf = None
-                                    st.cache_data.clear()
                                     st.rerun()
                             else:
                                 st.error(
@@ -377,7 +374,6 @@ def show_page():
                             st.success(
                                 f"Laudo de qualidade do ar registrado com sucesso para {cilindros_count} cilindro(s)!")
                             #st.balloons()
-                            st.cache_data.clear()
 
     with tab_visual_insp:
         st.header("Realizar Inspeção Periódica de SCBA")
@@ -503,7 +499,6 @@ def show_page():
                                 ):
                                     st.success(
                                         f"Inspeção periódica para o SCBA '{selected_scba_id}' salva com sucesso!")
-                                    st.cache_data.clear()
                                     st.rerun()
                                 else:
                                     st.error(
@@ -566,4 +561,3 @@ def show_page():
                         if save_manual_scba(scba_data):
                             st.success(
                                 f"SCBA com número de série '{numero_serie}' cadastrado com sucesso!")
-                            st.cache_data.clear()
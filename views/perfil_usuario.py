@@ -4,10 +4,11 @@ from utils.webhook_handler import (
 )
 from config.page_config import set_page_config
 from utils.auditoria import log_action
-from supabase_local import get_supabase_client
+from supabase_local import get_supabase_client, get_table_cache
 from auth.auth_utils import (
     get_user_display_name, get_user_email, get_user_info,
-    get_effective_user_plan, get_effective_user_status, is_on_trial
+    get_effective_user_plan, get_effective_user_status, is_on_trial,
+    get_users_data
 )
 import streamlit as st
 import streamlit.components.v1 as components
@@ -216,7 +217,9 @@ def show_page():
         st.success(
             "🎉 **Pagamento realizado com sucesso!** Seu plano foi ativado.")
         clear_payment_success_message()
-        st.cache_data.clear()
+        # O plano foi gravado pelo webhook, fora deste cliente
+        get_table_cache().invalidate_table("usuarios")
+        get_users_data.clear()
 
     tab_profile, tab_plan_and_payment, tab_support = st.tabs([
         "📝 Meus Dados",
@@ -306,7 +309,7 @@ def show_page():
                     with st.spinner("💾 Salvando alterações..."):
                         if update_user_profile(user_email, updated_data):
                             st.success("✅ Perfil atualizado com sucesso!")
-                            st.cache_data.clear()
+                            get_users_data.clear()
                             st.rerun()
                         else:
                             st.error(
@@ -7,7 +7,11 @@ from .dashboard import (
     get_foam_chamber_status_df,
     get_multigas_status_df,
     get_alarm_status_df,
-    get_canhao_monitor_status_df
+    get_canhao_monitor_status_df,
+    EXTINGUISHER_STATUS_COLUMNS,
+    LOCAIS_DASHBOARD_COLUMNS,
+    HOSE_DISPOSAL_DASHBOARD_COLUMNS,
+    MULTIGAS_INSPECTIONS_DASHBOARD_COLUMNS
 )
 from config.table_names import (
     EXTINGUISHER_SHEET_NAME, LOCATIONS_SHEET_NAME, HOSE_SHEET_NAME, HOSE_DISPOSAL_LOG_SHEET_NAME,
@@ -20,7 +24,7 @@ from config.table_names import (
 )
 from auth.auth_utils import check_user_access
 from config.page_config import set_page_config
-from operations.history import load_sheet_data
+from operations.history import load_tables, clear_data_cache
 import streamlit as st
 import pandas as pd
 import sys
@@ -43,9 +47,33 @@ def show_page():
     st.info("Esta é uma visão geral do status atual de todos os equipamentos. Para detalhes completos ou registros, contate um 'editor' ou 'administrador'.")
 
     if st.button("Limpar Cache e Recarregar Dados"):
-        st.cache_data.clear()
+        clear_data_cache()
         st.rerun()
 
+    # Pré-carrega todas as tabelas das abas em uma única rodada de leituras paralelas
+    data = load_tables(
+        [
+            (EXTINGUISHER_SHEET_NAME, EXTINGUISHER_STATUS_COLUMNS),
+            (LOCATIONS_SHEET_NAME, LOCAIS_DASHBOARD_COLUMNS),
+            (HOSE_DISPOSAL_LOG_SHEET_NAME, HOSE_DISPOSAL_DASHBOARD_COLUMNS),
+            SHELTER_SHEET_NAME,
+            INSPECTIONS_SHELTER_SHEET_NAME,
+            SCBA_SHEET_NAME,
+            SCBA_VISUAL_INSPECTIONS_SHEET_NAME,
+            FOAM_CHAMBER_INVENTORY_SHEET_NAME,
+            MULTIGAS_INVENTORY_SHEET_NAME,
+            (MULTIGAS_INSPECTIONS_SHEET_NAME, MULTIGAS_INSPECTIONS_DASHBOARD_COLUMNS),
+            CANHAO_MONITOR_INVENTORY_SHEET_NAME,
+        ],
+        latest=[
+            (HOSE_SHEET_NAME, "id_mangueira", "data_inspecao"),
+            (EYEWASH_INSPECTIONS_SHEET_NAME, "id_equipamento", "data_inspecao"),
+            (FOAM_CHAMBER_INSPECTIONS_SHEET_NAME, "id_camara", "data_inspecao"),
+            (ALARM_INSPECTIONS_SHEET_NAME, "id_sistema", "data_inspecao"),
+            (CANHAO_MONITOR_INSPECTIONS_SHEET_NAME, "id_equipamento", "data_inspecao"),
+        ]
+    )
+
     tab_extinguishers, tab_hoses, tab_shelters, tab_scba, tab_eyewash, tab_foam, tab_multigas, tab_alarms, tab_canhoes = st.tabs([
         "🔥 Extintores", "💧 Mangueiras", "🧯 Abrigos", "💨 C. Autônomo",
         "🚿 Chuveiros/Lava-Olhos", "☁️ Câmaras de Espuma", "💨 Multigás", "🔔 Alarmes", "🌊 Canhões Monitores"
@@ -53,8 +81,8 @@ def show_page():
 
     with tab_extinguishers:
         st.header("Situação dos Extintores")
-        df_full_history = load_sheet_data(EXTINGUISHER_SHEET_NAME)
-        df_locais = load_sheet_data(LOCATIONS_SHEET_NAME)
+        df_full_history = data[EXTINGUISHER_SHEET_NAME]
+        df_locais = data[LOCATIONS_SHEET_NAME]
 
         if df_full_history.empty:
             st.warning("Nenhum registro de extintor encontrado.")
@@ -88,8 +116,8 @@ def show_page():
 
     with tab_hoses:
         st.header("Situação das Mangueiras de Incêndio")
-        df_hoses_history = load_sheet_data(HOSE_SHEET_NAME)
-        df_disposals = load_sheet_data(HOSE_DISPOSAL_LOG_SHEET_NAME)
+        df_hoses_history = data[HOSE_SHEET_NAME]
+        df_disposals = data[HOSE_DISPOSAL_LOG_SHEET_NAME]
 
         if df_hoses_history.empty:
             st.warning("Nenhum registro de mangueira encontrado.")
@@ -119,9 +147,8 @@ def show_page():
 
     with tab_shelters:
         st.header("Situação dos Abrigos de Emergência")
-        df_shelters_registered = load_sheet_data(SHELTER_SHEET_NAME)
-        df_inspections_history = load_sheet_data(
-            INSPECTIONS_SHELTER_SHEET_NAME)
+        df_shelters_registered = data[SHELTER_SHEET_NAME]
+        df_inspections_history = data[INSPECTIONS_SHELTER_SHEET_NAME]
         if df_shelters_registered.empty:
             st.warning("Nenhum abrigo cadastrado.")
         else:
@@ -151,8 +178,8 @@ def show_page():
 
     with tab_scba:
         st.header("Situação dos Conjuntos Autônomos")
-        df_scba_main = load_sheet_data(SCBA_SHEET_NAME)
-        df_scba_visual = load_sheet_data(SCBA_VISUAL_INSPECTIONS_SHEET_NAME)
+        df_scba_main = data[SCBA_SHEET_NAME]
+        df_scba_visual = data[SCBA_VISUAL_INSPECTIONS_SHEET_NAME]
         if df_scba_main.empty:
             st.warning("Nenhum teste de SCBA registrado.")
         else:
@@ -184,7 +211,7 @@ def show_page():
 
     with tab_eyewash:
         st.header("Situação dos Chuveiros e Lava-Olhos")
-        df_eyewash_history = load_sheet_data(EYEWASH_INSPECTIONS_SHEET_NAME)
+        df_eyewash_history = data[EYEWASH_INSPECTIONS_SHEET_NAME]
         if df_eyewash_history.empty:
             st.warning("Nenhuma inspeção registrada.")
         else:
@@ -213,8 +240,8 @@ def show_page():
 
     with tab_foam:
         st.header("Situação das Câmaras de Espuma")
-        df_foam_inventory = load_sheet_data(FOAM_CHAMBER_INVENTORY_SHEET_NAME)
-        df_foam_history = load_sheet_data(FOAM_CHAMBER_INSPECTIONS_SHEET_NAME)
+        df_foam_inventory = data[FOAM_CHAMBER_INVENTORY_SHEET_NAME]
+        df_foam_history = data[FOAM_CHAMBER_INSPECTIONS_SHEET_NAME]
         if df_foam_history.empty:
             st.warning("Nenhuma inspeção registrada.")
         else:
@@ -247,8 +274,8 @@ def show_page():
 
     with tab_multigas:
         st.header("Situação dos Detectores Multigás")
-        df_inventory = load_sheet_data(MULTIGAS_INVENTORY_SHEET_NAME)
-        df_inspections = load_sheet_data(MULTIGAS_INSPECTIONS_SHEET_NAME)
+        df_inventory = data[MULTIGAS_INVENTORY_SHEET_NAME]
+        df_inspections = data[MULTIGAS_INSPECTIONS_SHEET_NAME]
 
         dashboard_df = get_multigas_status_df(df_inventory, df_inspections)
 
@@ -290,7 +317,7 @@ def show_page():
                 )
     with tab_alarms:
         st.header("Situação dos Sistemas de Alarme")
-        df_alarm_inspections = load_sheet_data(ALARM_INSPECTIONS_SHEET_NAME)
+        df_alarm_inspections = data[ALARM_INSPECTIONS_SHEET_NAME]
 
         if df_alarm_inspections.empty:
             st.warning("Nenhuma inspeção de sistema de alarme registrada.")
@@ -320,8 +347,8 @@ def show_page():
 
     with tab_canhoes:
         st.header("Situação dos Canhões Monitores")
-        df_inventory = load_sheet_data(CANHAO_MONITOR_INVENTORY_SHEET_NAME)
-        df_inspections = load_sheet_data(CANHAO_MONITOR_INSPECTIONS_SHEET_NAME)
+        df_inventory = data[CANHAO_MONITOR_INVENTORY_SHEET_NAME]
+        df_inspections = data[CANHAO_MONITOR_INSPECTIONS_SHEET_NAME]
 
         if df_inspections.empty:
             st.warning("Nenhum registro de canhão monitor encontrado.")
@@ -1,8 +1,10 @@
 from config.page_config import set_page_config
 from reports.shipment_report import (
-    generate_shipment_html_and_pdf, log_shipment,
+    submit_shipment_pdf, log_shipment,
     select_extinguishers_for_maintenance, select_hoses_for_th
 )
+from reports.pdf_render_service import PDF_POLL_INTERVAL_SECONDS, show_pdf_render_job
+from reports.batch_export import REPORT_KINDS, start_export, advance_export, finish_export, discard_export
 from operations.history import load_sheet_data
 from auth.auth_utils import (
     get_user_display_name, check_user_access, can_edit
@@ -23,7 +25,6 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 set_page_config()
 
 
-@st.cache_data(ttl=300)
 def load_all_data():
     ext_data = load_sheet_data("extintores")
     df_ext = pd.DataFrame(ext_data) if not ext_data.empty else pd.DataFrame()
@@ -74,8 +75,8 @@ def show_page():
         st.error(f"Não foi possível carregar os dados. Erro: {e}")
         return
 
-    tab_manual_entry, tab_qr, tab_shipment = st.tabs(
-        ["✍️ Cadastro Rápido", "Gerador de QR Code", "Boletim de Remessa"])
+    tab_manual_entry, tab_qr, tab_shipment, tab_batch_export = st.tabs(
+        ["✍️ Cadastro Rápido", "Gerador de QR Code", "Boletim de Remessa", "📦 Exportação em Lote"])
 
     with tab_manual_entry:
         st.header("Cadastro Manual Rápido de Itens")
@@ -247,21 +248,94 @@ def show_page():
                                              "bairro": "Jardim Mutinga", "cidade": "BARUERI", "uf": "SP", "cep": "06463-400", "fone": "2140022040"}
                                 destinatario = {"razao_social": "TECNO SERVIC DO BRASIL LTDA", "cnpj": "01.396.496/0001-27", "endereco": "AV ANALICE SAKATAUSKAS 1040",
                                                 "cidade": "SAO PAULO", "uf": "SP", "fone": "1135918267", "responsavel": get_user_display_name()}
-                                pdf_bytes = generate_shipment_html_and_pdf(
+                                # PDF gerado em segundo plano; a página acompanha o job
+                                job_id = submit_shipment_pdf(
                                     df_selected, item_type, remetente, destinatario, bulletin_number)
                                 log_shipment(
                                     df_selected, item_type, bulletin_number)
+                                st.session_state['shipment_pdf_job'] = job_id
                                 st.session_state['pdf_generated_info'] = {
-                                    "data": pdf_bytes, "file_name": f"Boletim_{bulletin_number}.pdf"}
-                                st.cache_data.clear()
+                                    "file_name": f"Boletim_{bulletin_number}.pdf"}
                                 st.rerun()
 
                 if st.session_state.get('pdf_generated_info'):
                     pdf_info = st.session_state['pdf_generated_info']
                     st.success("Boletim gerado e log de envio registrado!")
-                    st.download_button(
-                        "📥 Baixar Boletim (PDF)", pdf_info['data'], pdf_info['file_name'], "application/pdf")
+                    show_pdf_render_job(
+                        'shipment_pdf_job', pdf_info['file_name'], label="📥 Baixar Boletim (PDF)")
                     if st.button("Gerar Novo Boletim"):
                         st.session_state.pop('pdf_generated_info', None)
+                        st.session_state.pop('shipment_pdf_job', None)
                         st.session_state.pop('suggested_ids', None)
                         st.rerun()
+
+    with tab_batch_export:
+        show_batch_export_tab()
+
+
+def show_batch_export_tab():
+    st.header("Exportação de Relatórios em Lote")
+    st.info("Gera os relatórios do ano selecionado de todas as unidades às quais você tem acesso, "
+            "em PDF, reunidos em um único arquivo .ZIP. Se a geração for interrompida, "
+            "basta clicar novamente: os PDFs já gerados e sem alterações nos dados são reaproveitados.")
+
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        year = st.selectbox("Ano:", range(date.today().year, date.today().year - 5, -1),
+                            key="batch_export_year")
+    with col2:
+        kinds = st.multiselect("Relatórios:", list(REPORT_KINDS), default=list(REPORT_KINDS),
+                               format_func=REPORT_KINDS.get, key="batch_export_kinds")
+
+    col_generate, col_discard = st.columns([3, 1])
+    if col_generate.button("📦 Gerar Relatórios (.ZIP)", type="primary", use_container_width=True,
+                           disabled=not kinds or 'batch_export_job' in st.session_state):
+        st.session_state.pop('batch_export_result', None)
+        with st.spinner("Carregando dados..."):
+            export = start_export(year, kinds)
+        if export is None:
+            st.warning(f"Nenhum registro encontrado em {year} para os relatórios selecionados.")
+        else:
+            st.session_state['batch_export_job'] = export
+
+    if col_discard.button("🗑️ Recomeçar", use_container_width=True, disabled=not kinds,
+                          help="Descarta os PDFs já gerados desta exportação"):
+        st.session_state.pop('batch_export_job', None)
+        discard_export(year, kinds)
+        st.session_state.pop('batch_export_result', None)
+        st.success("Exportação descartada.")
+
+    if 'batch_export_job' in st.session_state:
+        _poll_batch_export()
+
+    result = st.session_state.get('batch_export_result')
+    if result and os.path.exists(result["zip_path"]):
+        if result["failures"]:
+            st.warning(f"{len(result['failures'])} relatório(s) não puderam ser gerados e ficaram fora do ZIP. "
+                       "Clique em gerar novamente para tentar de novo.")
+            with st.expander("Ver falhas"):
+                for name, error in result["failures"]:
+                    st.write(f"**{name}**: {error}")
+        else:
+            st.success("✅ Relatórios gerados com sucesso!")
+        with open(result["zip_path"], "rb") as zip_file:
+            st.download_button("📥 Baixar Relatórios (.ZIP)", zip_file, f"relatorios_{result['year']}.zip",
+                               "application/zip", use_container_width=True)
+
+
+@st.fragment(run_every=PDF_POLL_INTERVAL_SECONDS)
+def _poll_batch_export():
+    """Avança a exportação em lote a cada intervalo; só este trecho da página é atualizado."""
+    export = st.session_state.get('batch_export_job')
+    if export is None:
+        return
+
+    if advance_export(export):
+        st.session_state['batch_export_result'] = {
+            "zip_path": finish_export(export), "year": export["year"], "failures": export["failures"]}
+        st.session_state.pop('batch_export_job', None)
+        # Recarrega a página para exibir o resultado fora do fragmento
+        st.rerun()
+
+    total = len(export["names"])
+    st.progress(export["completed"] / total, text=f"Gerando PDFs... {export['completed']}/{total}")